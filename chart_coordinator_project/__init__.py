@@ -10,7 +10,13 @@ __description__ = "LLM驱动的智能图表生成系统，支持多Agent协作
 
 # ADK Web UI 支持文件
 # 此文件让 adk web 命令能够识别和加载您的Agent
-from . import agent
+# agent 在首次访问时才导入：导入它会创建全部代理和渲染工具并探测依赖，
+# 渲染工具的工作进程只需要 tools 子包，导入本包时不应触发这些副作用
+def __getattr__(name):
+    if name == "agent":
+        import importlib
+        return importlib.import_module(".agent", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     "agent",
@@ -0,0 +1,81 @@
+# Copyright 2025 Google LLC
+# D3.js HTML外壳模板 - 预压缩版本
+
+"""
+D3.js渲染工具使用的预压缩HTML外壳
+
+去除了缩进、注释和冗长的调试日志，每次渲染输出的字节数显著减少。
+占位符使用 ${name} 语法：${title}、${font_family}、${width}、
+${height}、${processed_code}。JS部分刻意不使用模板字符串，避免与占位符冲突。
+扩展库清单在模块加载时序列化为紧凑JSON并嵌入外壳。
+"""
+
+import json
+
+# D3扩展库清单：check为加载成功后应出现的全局对象路径，由页面内的通用加载循环解析
+_D3_LIBRARIES = [
+    {"name": "D3.js核心库", "required": True, "check": "d3.version", "sources": [
+        "/static/js/d3.v7.min.js",
+        "https://d3js.org/d3.v7.min.js",
+        "https://cdn.jsdelivr.net/npm/d3@7/dist/d3.min.js",
+        "https://cdnjs.cloudflare.com/ajax/libs/d3/7.8.5/d3.min.js",
+    ]},
+    {"name": "D3-Sankey", "check": "d3.sankey", "sources": [
+        "/static/js/d3-sankey.min.js",
+        "https://cdn.jsdelivr.net/npm/d3-sankey@0.12.3/dist/d3-sankey.min.js",
+    ]},
+    {"name": "D3-Hierarchy", "check": "d3.hierarchy", "sources": [
+        "/static/js/d3-hierarchy.min.js",
+        "https://cdn.jsdelivr.net/npm/d3-hierarchy@3/dist/d3-hierarchy.min.js",
+    ]},
+    {"name": "D3-Force", "check": "d3.forceSimulation", "sources": [
+        "/static/js/d3-force.min.js",
+        "https://cdn.jsdelivr.net/npm/d3-force@3/dist/d3-force.min.js",
+    ]},
+    {"name": "D3-Geo", "check": "d3.geoPath", "sources": [
+        "/static/js/d3-geo.min.js",
+        "https://cdn.jsdelivr.net/npm/d3-geo@3/dist/d3-geo.min.js",
+    ]},
+    {"name": "D3-Scale-Chromatic", "check": "d3.schemeCategory10", "sources": [
+        "/static/js/d3-scale-chromatic.v1.min.js",
+        "https://d3js.org/d3-scale-chromatic.v1.min.js",
+    ]},
+    {"name": "TopoJSON", "check": "topojson", "sources": [
+        "/static/js/topojson.v3.min.js",
+        "https://d3js.org/topojson.v3.min.js",
+    ]},
+    {"name": "D3-Cloud", "check": "d3.layout.cloud", "sources": [
+        "/static/js/d3-cloud.min.js",
+        "https://cdn.jsdelivr.net/gh/jasondavies/d3-cloud/build/d3.layout.cloud.js",
+    ]},
+    {"name": "D3-Hexbin", "check": "d3.hexbin", "sources": [
+        "/static/js/d3-hexbin.min.js",
+        "https://cdn.jsdelivr.net/npm/d3-hexbin@0.2.2/build/d3-hexbin.min.js",
+    ]},
+]
+
+# 模块加载时序列化一次的紧凑JSON
+_D3_LIBS = json.dumps(_D3_LIBRARIES, ensure_ascii=False, separators=(',', ':'))
+
+_HTML_SHELL_MIN = r"""<!DOCTYPE html><html lang="zh-CN"><head><meta charset="utf-8"><meta name="viewport" content="width=device-width,initial-scale=1"><title>${title}</title><script>
+const D3_LIBRARIES=__D3_LIBS__;
+function hasGlobal(path){return path.split('.').reduce((o,k)=>o&&o[k],window)}
+async function loadD3LibrariesWithFallback(){for(const lib of D3_LIBRARIES){let loaded=false;for(const url of lib.sources){try{const s=document.createElement('script');s.src=url;s.crossOrigin='anonymous';document.head.appendChild(s);await new Promise((ok,fail)=>{s.onload=ok;s.onerror=fail;setTimeout(fail,url.startsWith('/static/')?2000:8000)});await new Promise(r=>setTimeout(r,100));if(hasGlobal(lib.check)){loaded=true;break}}catch(e){}}
+if(!loaded){if(lib.required){console.error('D3 required library failed: '+lib.name);return false}console.warn('D3 optional library failed: '+lib.name)}}return true}
+function showD3Message(msg){document.getElementById('d3-container').innerHTML='<div style="text-align:center;padding:50px;color:#666;">'+msg+'</div>'}
+document.addEventListener('DOMContentLoaded',async function(){try{if(await loadD3LibrariesWithFallback()){window.dispatchEvent(new Event('d3Ready'))}else{showD3Message('D3.js库加载失败，请检查网络连接')}}catch(e){console.error('D3 loader error:',e);showD3Message('D3.js初始化异常')}});
+</script><style>body{margin:0;padding:0;font-family:${font_family};background-color:#fff;display:flex;justify-content:center;align-items:center;width:100vw;height:100vh;overflow:hidden}#d3-container{width:${width}px;height:${height}px}.tooltip{position:absolute;padding:8px 12px;background:rgba(0,0,0,.8);color:#fff;border-radius:4px;pointer-events:none;font-size:12px;z-index:1000;opacity:0;transition:opacity .2s}.axis{font-size:12px;font-family:${font_family}}.axis path,.axis line{fill:none;stroke:#333;shape-rendering:crispEdges}.grid line{stroke:lightgrey;stroke-opacity:.7;shape-rendering:crispEdges}text{font-family:${font_family}!important}</style></head><body><div id="d3-container"></div><div class="tooltip" id="tooltip"></div><script>
+async function initializeD3Visualization(){if(typeof d3==='undefined'){showD3Message('D3.js库加载失败');return}
+const container=d3.select("#d3-container"),width=${width},height=${height},margin={top:20,right:20,bottom:30,left:50},tooltip=d3.select("#tooltip");container.selectAll("*").remove();
+function showTooltip(event,text){tooltip.style("opacity",1).html(text).style("left",(event.pageX+10)+"px").style("top",(event.pageY-10)+"px")}
+function hideTooltip(){tooltip.style("opacity",0)}
+const colorScale=d3.scaleOrdinal(d3.schemeCategory10);
+const sampleData={nodes:d3.range(20).map(d=>({id:d,group:Math.floor(d/5)})),links:d3.range(15).map(()=>({source:Math.floor(Math.random()*20),target:Math.floor(Math.random()*20)}))};
+try{const executeUserCode=async()=>{
+${processed_code}
+};await executeUserCode()}catch(error){console.error('D3 user code error:',error);
+const svg=container.append("svg").attr("width",width).attr("height",height);svg.append("rect").attr("width",width).attr("height",height).attr("fill","#f8f9fa");
+svg.append("text").attr("x",width/2).attr("y",height/2-20).attr("text-anchor","middle").attr("font-size","16px").attr("fill","#dc3545").text("代码执行错误");
+svg.append("text").attr("x",width/2).attr("y",height/2).attr("text-anchor","middle").attr("font-size","12px").attr("fill","#6c757d").text("错误: "+error.message)}}
+window.addEventListener('d3Ready',initializeD3Visualization);window.addEventListener('error',function(e){console.error('D3 page error:',e.error)});
+</script></body></html>""".replace("__D3_LIBS__", _D3_LIBS)
@@ -0,0 +1,55 @@
+# Copyright 2025 Google LLC
+# 渲染工具依赖检查结果的磁盘缓存
+
+"""
+渲染工具依赖检查结果的磁盘缓存
+
+依赖检查往往需要派生 node/mmdc 进程或导入大型库，启动时开销明显。
+各工具以 工具名 为条目、以能反映环境变化的字符串为键（可执行文件路径及修改时间、
+包版本等），把检查结果写入同一个JSON文件；键一致且未过期时直接复用。
+设置环境变量 CHART_DEP_CACHE=0 时忽略已有缓存，每次重新检查。
+"""
+
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+_DEP_CACHE_FILE = Path.home() / ".cache" / "adk_chart_master" / "dep_check.json"
+_DEP_CACHE_TTL = 24 * 3600
+_DEP_CACHE_ENABLED = os.getenv('CHART_DEP_CACHE', '1') != '0'
+
+
+def _load_dep_cache(tool: str, key: str) -> Optional[Dict[str, Any]]:
+    """读取未过期且键匹配的依赖检查结果，缓存不可用时返回None"""
+    if not _DEP_CACHE_ENABLED:
+        return None
+    try:
+        entry = json.loads(_DEP_CACHE_FILE.read_text(encoding='utf-8')).get(tool)
+    except (OSError, ValueError, AttributeError):
+        return None
+    if not entry or entry.get("key") != key or time.time() - entry.get("time", 0) > _DEP_CACHE_TTL:
+        return None
+    return entry.get("result")
+
+
+def _save_dep_cache(tool: str, key: str, result: Dict[str, Any]):
+    """写回依赖检查结果（先写临时文件再替换，避免并发启动读到半个文件）"""
+    try:
+        try:
+            cache = json.loads(_DEP_CACHE_FILE.read_text(encoding='utf-8'))
+            if not isinstance(cache, dict):
+                cache = {}
+        except (OSError, ValueError):
+            cache = {}
+        cache[tool] = {"key": key, "time": time.time(), "result": result}
+        _DEP_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = _DEP_CACHE_FILE.with_name(f"{_DEP_CACHE_FILE.name}.{os.getpid()}.tmp")
+        tmp_file.write_text(json.dumps(cache), encoding='utf-8')
+        os.replace(tmp_file, _DEP_CACHE_FILE)
+    except OSError as e:
+        logger.debug(f"写入依赖检查缓存失败: {e}")
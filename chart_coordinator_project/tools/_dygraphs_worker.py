@@ -0,0 +1,51 @@
+# Copyright 2025 Google LLC
+# Dygraphs常驻Python工作进程
+
+"""
+Dygraphs渲染工具的常驻工作进程
+
+由 DygraphsRenderTool 在 DYGRAPHS_EXEC_MODE=worker 时启动，只启动一次。
+通过 stdin/stdout 按行交换JSON：
+    请求: {"code": ..., "variables": {...}}
+    响应: {"ok": true, "html": ...} 或 {"ok": false, "err": "..."}
+html 为用户代码执行后 final_html 变量的值，未定义时为null。
+pandas/numpy 在进程启动时导入一次，之后每次渲染只需执行用户代码。
+"""
+
+import io
+import json
+import sys
+import traceback
+from contextlib import redirect_stdout
+
+try:
+    import pandas as pd
+    import numpy as np
+    _PRELOADED = {"pd": pd, "np": np}
+except ImportError:
+    _PRELOADED = {}
+
+
+def _handle(request: dict) -> dict:
+    namespace = {"__name__": "__main__", **_PRELOADED, **request.get("variables", {})}
+    try:
+        # 用户代码的print输出不能混入协议通道
+        with redirect_stdout(io.StringIO()):
+            exec(compile(request["code"], "<dygraphs_code>", "exec"), namespace)
+        html = namespace.get("final_html")
+        return {"ok": True, "html": html if isinstance(html, str) else None}
+    except (Exception, SystemExit):
+        return {"ok": False, "err": traceback.format_exc()}
+
+
+def main():
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        response = _handle(json.loads(line))
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env node
+// Copyright 2025 Google LLC
+// ECharts常驻Node.js渲染进程
+//
+// 由 EChartsRenderTool 在首次PNG渲染时启动，只启动一次。
+// echarts/jsdom/canvas 在进程启动时加载一次，图表实例跨请求复用，之后每次渲染只需执行配置。
+// 通过 stdin 按行接收JSON请求：
+//     {"config": ..., "width": ..., "height": ..., "format": ..., "theme": ..., "background": ...}
+// 通过 stdout 返回一行JSON头，成功时紧跟 length 字节的图片数据：
+//     {"ok": true, "length": N}\n<N字节>  或  {"ok": false, "err": "..."}\n
+
+const readline = require('readline');
+const echarts = require('echarts');
+const { JSDOM } = require('jsdom');
+
+// 检查是否有canvas支持
+let createCanvas = null;
+try {
+    createCanvas = require('canvas').createCanvas;
+} catch (e) {
+    createCanvas = null;
+}
+
+// stdout是协议通道，ECharts或配置中的console输出统一转到stderr
+const out = process.stdout;
+console.log = console.info = console.warn = console.error;
+
+// 全局DOM环境只创建一次
+const dom = new JSDOM('<!DOCTYPE html><html><body></body></html>');
+global.window = dom.window;
+global.document = dom.window.document;
+global.navigator = dom.window.navigator;
+
+// 图表实例按 渲染器|主题 缓存，连同其DOM容器或Canvas跨请求复用，每次渲染只需clear+resize
+const charts = new Map();
+
+function buildOption(config) {
+    // 配置可能是JS对象字面量（含函数或echarts.graphic调用），按表达式求值
+    const source = config.trim().replace(/;+\s*$/, '');
+    return new Function('echarts', 'return (' + source + '\n);')(echarts);
+}
+
+function getChart(job, useCanvas) {
+    const key = (useCanvas ? 'canvas' : 'svg') + '|' + job.theme;
+    let chart = charts.get(key);
+    if (chart) {
+        chart.clear();
+        chart.resize({ width: job.width, height: job.height });
+        return { chart, key };
+    }
+    if (useCanvas) {
+        // 使用Canvas渲染PNG
+        const canvas = createCanvas(job.width, job.height);
+        echarts.setCanvasCreator(() => canvas);
+        chart = echarts.init(canvas, job.theme, { renderer: 'canvas', width: job.width, height: job.height });
+    } else {
+        // 使用SVG渲染（无需Canvas）
+        const container = document.createElement('div');
+        document.body.appendChild(container);
+        chart = echarts.init(container, job.theme, { renderer: 'svg', width: job.width, height: job.height });
+    }
+    charts.set(key, chart);
+    return { chart, key };
+}
+
+function render(job) {
+    const useCanvas = Boolean(createCanvas) && job.format === 'png';
+    const { chart, key } = getChart(job, useCanvas);
+    try {
+        const option = buildOption(job.config);
+
+        // 设置背景色
+        if (option.backgroundColor === undefined) {
+            option.backgroundColor = job.background;
+        }
+
+        // 服务端只取最终画面：关闭动画，setOption后图表已同步绘制完成
+        if (option.animation === undefined) {
+            option.animation = false;
+        }
+
+        // notMerge：不保留上一次渲染的配置
+        chart.setOption(option, true);
+
+        if (!useCanvas) {
+            return Buffer.from(chart.renderToSVGString(), 'utf8');
+        }
+        // 在Canvas模式下，chart.getDom()返回canvas元素
+        const canvas = chart.getDom();
+        if (canvas && typeof canvas.toBuffer === 'function') {
+            return canvas.toBuffer('image/png');
+        }
+        throw new Error('Canvas渲染失败，请尝试SVG格式');
+    } catch (error) {
+        // 出错的实例状态不可信，丢弃后下次重新创建
+        charts.delete(key);
+        chart.dispose();
+        throw error;
+    }
+}
+
+function reply(header, body) {
+    out.write(JSON.stringify(header) + '\n');
+    if (body) {
+        out.write(body);
+    }
+}
+
+async function main() {
+    const rl = readline.createInterface({ input: process.stdin, crlfDelay: Infinity });
+    for await (const line of rl) {
+        if (!line.trim()) {
+            continue;
+        }
+        try {
+            const buffer = render(JSON.parse(line));
+            reply({ ok: true, length: buffer.length }, buffer);
+        } catch (error) {
+            reply({ ok: false, err: String((error && error.stack) || error) });
+        }
+    }
+}
+
+main();
@@ -0,0 +1,175 @@
+# Copyright 2025 Google LLC
+# 渲染工具共用的线程池、常驻工作进程池及执行结果转换
+
+"""
+渲染工具共用的线程池、常驻工作进程池及执行结果转换
+
+为什么各工具另建线程池：_render_sync 本身运行在基类的 executor（只有2个线程）中，
+带超时地执行用户代码或读取常驻进程的响应时，如果把任务提交回同一个 executor 再等待结果，
+两个并发渲染就会占满它的线程而互相等待。因此每个工具用 _exec_thread_pool 创建自己的线程池，
+一个工具卡住的线程也不会拖住其他工具。
+
+线程无法从外部终止：进程内exec的用户代码超时后仍在后台运行并占着线程（matplotlib类工具还占着
+pyplot锁）。需要能终止超时代码时使用 _WorkerProcessPool：固定数量的工作进程各自只执行一个任务，
+超时或意外退出时只终止执行该任务的那个进程，下次使用时重新创建。
+"""
+
+import contextlib
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import traceback
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 工作进程执行若干次任务后替换为新进程，限制pyplot缓存等随渲染次数增长的内存占用
+_WORKER_MAX_TASKS = 50
+
+# 每个工具的常驻工作进程数：每个进程都导入了完整的绘图库，数量固定且较小
+_WORKER_POOL_SIZE = min(4, os.cpu_count() or 1)
+
+# pyplot的当前图表和rcParams是进程级全局状态，同一进程内的matplotlib/mplfinance渲染必须串行执行
+_PYPLOT_LOCK = threading.Lock()
+
+
+def _exec_thread_pool(name: str, max_workers: int = 2) -> ThreadPoolExecutor:
+    """创建工具专用的线程池（原因见模块说明）"""
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+
+
+@contextlib.contextmanager
+def _trap_exit():
+    """
+    把用户代码抛出的 SystemExit 等非Exception异常转换为RuntimeError
+
+    否则 sys.exit() 会经 future.result() 原样抛出，越过各层的 except Exception 结束事件循环
+    """
+    try:
+        yield
+    except Exception:
+        raise
+    except BaseException as e:
+        raise RuntimeError(f"用户代码中止了执行: {e!r}") from e
+
+
+@contextlib.contextmanager
+def _pyplot_locked(timeout: float):
+    """取得pyplot锁；锁被超时后仍在运行的进程内渲染占着时报错，不无限等待"""
+    if not _PYPLOT_LOCK.acquire(timeout=timeout):
+        raise RuntimeError("pyplot正被另一个未结束的进程内渲染占用，请稍后重试或改用worker执行方式")
+    try:
+        yield
+    finally:
+        _PYPLOT_LOCK.release()
+
+
+def _wait_result(future: Future, timeout: float, timeout_error: str,
+                 on_failure: Optional[Callable[[], None]] = None,
+                 empty_error: Optional[str] = None) -> Dict[str, Any]:
+    """
+    等待执行任务完成并转换为渲染结果，成功时 data 为任务的返回值
+
+    Args:
+        future: 线程池或进程池中的任务
+        timeout: 等待秒数
+        timeout_error: 超时时的错误信息
+        on_failure: 超时或工作进程意外退出时的处理（如终止进程池）
+        empty_error: 返回值为空时的错误信息，为None时不检查
+    """
+    try:
+        value = future.result(timeout=timeout)
+    except FutureTimeoutError:
+        if on_failure is not None:
+            on_failure()
+        return {"success": False, "error": timeout_error}
+    except BrokenProcessPool:
+        # 工作进程意外退出（如用户代码调用了os._exit）
+        if on_failure is not None:
+            on_failure()
+        return {"success": False, "error": "Python代码执行失败: 工作进程意外退出"}
+    except Exception:
+        return {"success": False, "error": f"Python代码执行失败:\n{traceback.format_exc()}"}
+
+    if empty_error is not None and not value:
+        return {"success": False, "error": empty_error}
+    return {"success": True, "data": value}
+
+
+class _WorkerProcessPool:
+    """
+    常驻工作进程池：固定数量的槽位，每个槽位是只有一个工作进程的进程池，首次使用时创建
+    
+    一个槽位同时只执行一个任务，所以任务超时或工作进程意外退出时能确定是哪个进程，
+    只终止这个槽位，其他槽位上正在执行的渲染不受影响；被终止的槽位下次使用时重新创建。
+    
+    工作进程以spawn方式启动：fork出的子进程会继承父进程中模块级线程池等已不存在的线程和其他线程持有的锁。
+    spawn的子进程会重新导入启动脚本（作为 __mp_main__）和任务函数所在的模块，两者都必须没有导入时副作用
+    """
+    
+    def __init__(self, name: str, initializer: Optional[Callable[[], None]] = None,
+                 size: int = _WORKER_POOL_SIZE):
+        self._name = name
+        self._initializer = initializer
+        self._slots: List[Optional[ProcessPoolExecutor]] = [None] * size
+        self._lock = threading.Lock()
+        # 空闲槽位的编号，执行任务时取出，结束后放回
+        self._idle: "queue.Queue[int]" = queue.Queue()
+        for index in range(size):
+            self._idle.put(index)
+    
+    def _get_slot(self, index: int) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._slots[index] is None:
+                logger.info(f"🚀 启动{self._name}常驻工作进程（{index + 1}/{len(self._slots)}）...")
+                self._slots[index] = ProcessPoolExecutor(
+                    max_workers=1,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=self._initializer,
+                    max_tasks_per_child=_WORKER_MAX_TASKS
+                )
+            return self._slots[index]
+    
+    def run(self, fn: Callable[..., Any], *args, timeout: float, timeout_error: str,
+            empty_error: Optional[str] = None) -> Dict[str, Any]:
+        """在空闲的工作进程中执行 fn(*args) 并等待结果，返回值含义同 _wait_result"""
+        try:
+            index = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            return {"success": False, "error": f"{self._name}工作进程全部繁忙，请稍后重试"}
+        try:
+            try:
+                future = self._get_slot(index).submit(fn, *args)
+            except (BrokenProcessPool, RuntimeError) as e:
+                # 工作进程已损坏，或恰好被 stop() 关闭
+                self._stop_slot(index)
+                return {"success": False, "error": f"Python代码执行失败: 工作进程不可用 {e}"}
+            return _wait_result(future, timeout, timeout_error,
+                                on_failure=lambda: self._stop_slot(index), empty_error=empty_error)
+        finally:
+            self._idle.put(index)
+    
+    def _stop_slot(self, index: int):
+        """终止一个槽位的工作进程"""
+        with self._lock:
+            pool, self._slots[index] = self._slots[index], None
+        if pool is not None:
+            _terminate_pool(pool)
+    
+    def stop(self):
+        """关闭全部槽位并终止仍在运行的工作进程"""
+        for index in range(len(self._slots)):
+            self._stop_slot(index)
+
+
+def _terminate_pool(pool: ProcessPoolExecutor):
+    """关闭进程池并终止其中的进程：ProcessPoolExecutor没有终止单个任务的接口，超时的任务只能连同工作进程一起结束"""
+    processes = list((getattr(pool, '_processes', None) or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
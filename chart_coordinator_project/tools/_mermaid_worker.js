@@ -0,0 +1,105 @@
+#!/usr/bin/env node
+// Copyright 2025 Google LLC
+// Mermaid常驻Node.js渲染进程
+//
+// 由 MermaidRenderTool 在首次渲染时启动，只启动一次。
+// mermaid-cli 与 Puppeteer 在进程启动时加载，Chromium浏览器只启动一次并跨请求复用，
+// 之后每次渲染只需新开一个页面。
+// 用法: node _mermaid_worker.js [mermaid-cli包目录]
+//     未指定包目录时按常规模块解析查找 @mermaid-js/mermaid-cli 和 puppeteer
+// 通过 stdin 按行接收JSON请求：
+//     {"code": ..., "format": ..., "width": ..., "height": ..., "theme": ..., "background": ...}
+// 通过 stdout 返回一行JSON头，成功时紧跟 length 字节的图片数据：
+//     {"ok": true, "length": N}\n<N字节>  或  {"ok": false, "err": "..."}\n
+// 加载依赖或启动浏览器失败时，对每个请求返回 {"ok": false, "fatal": true, "err": "..."}
+// 可以连续写入多个请求：它们并发渲染，响应仍按请求顺序返回
+
+const fs = require('fs');
+const path = require('path');
+const readline = require('readline');
+const { createRequire } = require('module');
+const { pathToFileURL } = require('url');
+
+// stdout是协议通道，其他console输出统一转到stderr
+const out = process.stdout;
+console.log = console.info = console.warn = console.error;
+
+async function importFromDir(dir) {
+    // mermaid-cli是纯ESM包，按其package.json的exports找到入口后通过文件URL导入
+    const pkg = JSON.parse(fs.readFileSync(path.join(dir, 'package.json'), 'utf8'));
+    let entry = (pkg.exports && (pkg.exports['.'] || pkg.exports)) || pkg.main || 'index.js';
+    if (typeof entry === 'object') {
+        entry = entry.import || entry.default;
+    }
+    const cli = await import(pathToFileURL(path.join(dir, entry)).href);
+    // puppeteer是mermaid-cli的依赖，从包目录出发解析
+    const puppeteer = createRequire(path.join(dir, 'package.json'))('puppeteer');
+    return { cli, puppeteer };
+}
+
+async function loadModules(dir) {
+    if (dir) {
+        return importFromDir(dir);
+    }
+    const cli = await import('@mermaid-js/mermaid-cli');
+    const puppeteer = (await import('puppeteer')).default;
+    return { cli, puppeteer };
+}
+
+async function start() {
+    const { cli, puppeteer } = await loadModules(process.argv[2]);
+    const browser = await puppeteer.launch({ headless: true });
+    // 浏览器崩溃后本进程不再可用，退出后由Python端在下次渲染时重新启动
+    browser.on('disconnected', () => process.exit(1));
+    return { renderMermaid: cli.renderMermaid, browser };
+}
+
+async function render(ctx, job) {
+    const { data } = await ctx.renderMermaid(ctx.browser, job.code, job.format, {
+        viewport: { width: job.width, height: job.height },
+        backgroundColor: job.background,
+        mermaidConfig: { theme: job.theme }
+    });
+    return Buffer.from(data);
+}
+
+function reply(header, body) {
+    out.write(JSON.stringify(header) + '\n');
+    if (body) {
+        out.write(body);
+    }
+}
+
+async function main() {
+    let ctx = null;
+    let fatal = null;
+    try {
+        ctx = await start();
+    } catch (error) {
+        fatal = String((error && error.stack) || error);
+    }
+
+    // 请求到达即开始渲染（同一浏览器中各开一个页面），响应按请求顺序依次写回
+    let replies = Promise.resolve();
+    const rl = readline.createInterface({ input: process.stdin, crlfDelay: Infinity });
+    for await (const line of rl) {
+        if (!line.trim()) {
+            continue;
+        }
+        if (fatal) {
+            replies = replies.then(() => reply({ ok: false, fatal: true, err: fatal }));
+            continue;
+        }
+        const job = render(ctx, JSON.parse(line)).then(
+            (buffer) => [{ ok: true, length: buffer.length }, buffer],
+            (error) => [{ ok: false, err: String((error && error.stack) || error) }]
+        );
+        replies = replies.then(() => job).then(([header, body]) => reply(header, body));
+    }
+    await replies;
+    if (ctx) {
+        await ctx.browser.close();
+    }
+}
+
+main();
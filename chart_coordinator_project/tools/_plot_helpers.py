@@ -0,0 +1,265 @@
+# Copyright 2025 Google LLC
+# Matplotlib渲染工具注入用户代码的数值辅助函数
+
+"""
+Matplotlib渲染工具注入用户代码的数值辅助函数
+
+大数据量图表的耗时往往在绘图前的数据整理上，而不是绘图本身。
+渲染时以 cc_hist2d、cc_bin_mean、cc_downsample 的名字注入用户代码的全局变量：
+    cc_hist2d(x, y, bins=100, range=None)  -> (H, xedges, yedges)，与 np.histogram2d 相同
+    cc_bin_mean(x, y, bins=50)             -> (centers, means)，按x分箱求y的均值，空箱为nan
+    cc_downsample(x, y, n_out=2000)        -> (x, y)，Largest-Triangle-Three-Buckets降采样折线
+安装了numba时核心循环用 @njit(cache=True) 编译，编译结果缓存在 __pycache__ 中，
+之后的渲染不再有JIT开销；未安装时使用等价的numpy实现。
+
+另外提供保存前的折线降采样 downsample_figure_lines：按各坐标轴最终的显示范围裁剪超长折线，
+剩余点数仍过多时用LTTB降采样。Agg绘制耗时随顶点数线性增长，而输出图片只有几百到一千多像素宽。
+本模块只依赖numpy（numba可选），子进程执行时按文件路径加载。
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+
+def _as_float_arrays(x, y):
+    """转换为等长的一维float64数组（日期时间按其整数时间戳处理）"""
+    x, y = np.asarray(x), np.asarray(y)
+    if x.dtype.kind == 'M':
+        x = x.view(np.int64)
+    x = np.ascontiguousarray(x, dtype=np.float64).ravel()
+    y = np.ascontiguousarray(y, dtype=np.float64).ravel()
+    if x.shape != y.shape:
+        raise ValueError(f"x和y长度不一致: {x.size} != {y.size}")
+    return x, y
+
+
+def _hist2d_counts_py(x, y, x0, x1, y0, y1, nx, ny):
+    """按均匀分箱统计二维计数，落在范围外的点忽略（右边界计入最后一箱）"""
+    ix = np.floor((x - x0) / (x1 - x0) * nx).astype(np.int64)
+    iy = np.floor((y - y0) / (y1 - y0) * ny).astype(np.int64)
+    ix[x == x1] = nx - 1
+    iy[y == y1] = ny - 1
+    inside = (ix >= 0) & (ix < nx) & (iy >= 0) & (iy < ny)
+    return np.bincount(ix[inside] * ny + iy[inside], minlength=nx * ny).reshape(nx, ny).astype(np.float64)
+
+
+def _bin_sums_py(x, y, x0, x1, nbins):
+    """按x均匀分箱累加y及计数，nan和范围外的点忽略"""
+    idx = np.floor((x - x0) / (x1 - x0) * nbins).astype(np.int64)
+    idx[x == x1] = nbins - 1
+    inside = (idx >= 0) & (idx < nbins) & ~np.isnan(y)
+    sums = np.bincount(idx[inside], weights=y[inside], minlength=nbins)
+    counts = np.bincount(idx[inside], minlength=nbins).astype(np.float64)
+    return sums, counts
+
+
+def _lttb_indices_py(x, y, n_out):
+    """LTTB：每个桶内选出与前一选中点、下一桶均值点构成三角形面积最大的点，返回选中点的下标"""
+    n = x.size
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0] = 0
+    indices[n_out - 1] = n - 1
+    every = (n - 2) / (n_out - 2)
+    a = 0
+    for i in range(n_out - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = x[end:next_end].mean() if next_end > end else x[n - 1]
+        avg_y = y[end:next_end].mean() if next_end > end else y[n - 1]
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+    return indices
+
+
+if _NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _hist2d_counts(x, y, x0, x1, y0, y1, nx, ny):
+        counts = np.zeros((nx, ny), dtype=np.float64)
+        sx = nx / (x1 - x0)
+        sy = ny / (y1 - y0)
+        for k in range(x.size):
+            # 写成取反的区间判断，nan也会被跳过
+            if not (x0 <= x[k] <= x1 and y0 <= y[k] <= y1):
+                continue
+            i = min(int((x[k] - x0) * sx), nx - 1)
+            j = min(int((y[k] - y0) * sy), ny - 1)
+            counts[i, j] += 1.0
+        return counts
+
+    @njit(cache=True)
+    def _bin_sums(x, y, x0, x1, nbins):
+        sums = np.zeros(nbins, dtype=np.float64)
+        counts = np.zeros(nbins, dtype=np.float64)
+        scale = nbins / (x1 - x0)
+        for k in range(x.size):
+            if not (x0 <= x[k] <= x1) or np.isnan(y[k]):
+                continue
+            i = min(int((x[k] - x0) * scale), nbins - 1)
+            sums[i] += y[k]
+            counts[i] += 1.0
+        return sums, counts
+
+    @njit(cache=True)
+    def _lttb_indices(x, y, n_out):
+        n = x.size
+        indices = np.empty(n_out, dtype=np.int64)
+        indices[0] = 0
+        indices[n_out - 1] = n - 1
+        every = (n - 2) / (n_out - 2)
+        a = 0
+        for i in range(n_out - 2):
+            start = int(i * every) + 1
+            end = int((i + 1) * every) + 1
+            next_end = min(int((i + 2) * every) + 1, n)
+            if next_end > end:
+                avg_x = x[end:next_end].mean()
+                avg_y = y[end:next_end].mean()
+            else:
+                avg_x = x[n - 1]
+                avg_y = y[n - 1]
+            best = start
+            best_area = -1.0
+            for k in range(start, end):
+                area = abs((x[a] - avg_x) * (y[k] - y[a]) - (x[a] - x[k]) * (avg_y - y[a]))
+                if area > best_area:
+                    best_area = area
+                    best = k
+            a = best
+            indices[i + 1] = a
+        return indices
+else:
+    _hist2d_counts = _hist2d_counts_py
+    _bin_sums = _bin_sums_py
+    _lttb_indices = _lttb_indices_py
+
+
+def _finite_range(values):
+    """有限值的范围，范围为空时向两侧扩展0.5，与numpy分箱的处理一致"""
+    finite = values[np.isfinite(values)]
+    if finite.size == 0:
+        return 0.0, 1.0
+    low, high = float(finite.min()), float(finite.max())
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+    return low, high
+
+
+def cc_hist2d(x, y, bins=100, range=None):
+    """二维直方图，参数和返回值与 np.histogram2d 相同（bins为整数或 (nx, ny)）"""
+    x, y = _as_float_arrays(x, y)
+    if not isinstance(bins, (int, np.integer)) and not (
+            len(bins) == 2 and all(isinstance(b, (int, np.integer)) for b in bins)):
+        # 非均匀分箱交给numpy处理
+        return np.histogram2d(x, y, bins=bins, range=range)
+    nx, ny = (int(bins), int(bins)) if isinstance(bins, (int, np.integer)) else (int(bins[0]), int(bins[1]))
+    (x0, x1), (y0, y1) = range if range is not None else (_finite_range(x), _finite_range(y))
+    counts = _hist2d_counts(x, y, float(x0), float(x1), float(y0), float(y1), nx, ny)
+    return counts, np.linspace(x0, x1, nx + 1), np.linspace(y0, y1, ny + 1)
+
+
+def cc_bin_mean(x, y, bins=50):
+    """按x均匀分成bins箱，返回各箱中心和y的均值（空箱为nan）"""
+    x, y = _as_float_arrays(x, y)
+    x0, x1 = _finite_range(x)
+    sums, counts = _bin_sums(x, y, x0, x1, int(bins))
+    edges = np.linspace(x0, x1, int(bins) + 1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = sums / counts
+    return (edges[:-1] + edges[1:]) / 2, means
+
+
+def cc_downsample(x, y, n_out=2000):
+    """
+    用LTTB把折线降采样到n_out个点，保留峰谷等视觉特征
+
+    x需要单调递增且不含nan；点数不超过n_out时原样返回
+    """
+    x_arr, y_arr = _as_float_arrays(x, y)
+    n_out = int(n_out)
+    if n_out < 3 or x_arr.size <= n_out:
+        return x, y
+    indices = _lttb_indices(x_arr, y_arr, n_out)
+    return np.asarray(x)[indices], np.asarray(y)[indices]
+
+
+# 低于该点数的折线不降采样
+_DOWNSAMPLE_MIN_POINTS = 5000
+
+
+def _is_none_style(style):
+    """线型或标记是否表示不绘制（None、''、' '、'None'、'none'）"""
+    return style is None or (isinstance(style, str) and style.strip().lower() in ('', 'none'))
+
+
+def _is_plain_line(line):
+    """
+    是否为只画线、不画标记的普通折线
+    
+    降采样只保留折线形状：只画标记的散点会少画绝大部分点，带标记的折线标记会变稀疏，
+    阶梯线的形状也会改变，这些都不降采样
+    """
+    return (not _is_none_style(line.get_linestyle()) and _is_none_style(line.get_marker())
+            and line.get_drawstyle() == 'default')
+
+
+def _visible_line(xy, xlim, n_out):
+    """
+    裁掉x显示范围之外的点（两侧各保留一个点，使折线延伸到边界），剩余点数超过n_out时降采样
+    
+    只处理x单调递增、x和y都是有限数值的折线，不需要处理时返回None
+    """
+    if len(xy) <= max(n_out, _DOWNSAMPLE_MIN_POINTS):
+        return None
+    x, y = xy[:, 0], xy[:, 1]
+    # nan表示断开的折线，非单调的x不是时间序列，这两种情况都保持原样
+    if not (np.isfinite(xy).all() and (np.diff(x) >= 0).all()):
+        return None
+    x0, x1 = sorted(xlim)
+    start = max(int(np.searchsorted(x, x0, 'left')) - 1, 0)
+    stop = min(int(np.searchsorted(x, x1, 'right')) + 1, len(x))
+    x, y = _as_float_arrays(x[start:stop], y[start:stop])
+    if x.size > n_out:
+        indices = _lttb_indices(x, y, n_out)
+        x, y = x[indices], y[indices]
+    return x, y
+
+
+def downsample_figure_lines(fig, n_out):
+    """
+    保存图片前按各坐标轴最终的显示范围降采样图表中的超长折线
+    
+    只处理直角坐标、线性刻度、数据坐标下的普通折线。先读取显示范围（按完整数据自动缩放），
+    处理后再固定下来，因此坐标范围和用户设置的xlim/ylim都与不降采样时一致
+    """
+    for ax in fig.axes:
+        if ax.name != 'rectilinear' or ax.get_xscale() != 'linear' or ax.get_yscale() != 'linear':
+            continue
+        lines = [line for line in ax.get_lines()
+                 if line.get_transform() is ax.transData and _is_plain_line(line)]
+        if not lines:
+            continue
+        xlim, ylim = ax.get_xlim(), ax.get_ylim()
+        changed = False
+        for line in lines:
+            visible = _visible_line(line.get_xydata(), xlim, n_out)
+            if visible is not None:
+                line.set_data(*visible)
+                changed = True
+        if changed:
+            ax.set_xlim(xlim)
+            ax.set_ylim(ylim)
+
+
+# 注入用户代码全局变量的名字
+HELPERS = {
+    "cc_hist2d": cc_hist2d,
+    "cc_bin_mean": cc_bin_mean,
+    "cc_downsample": cc_downsample,
+}
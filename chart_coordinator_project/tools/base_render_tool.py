@@ -22,7 +22,10 @@
 import logging
 import time
 import asyncio
+import functools
+import threading
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from typing import Dict, Any, Optional, Union, List
 from concurrent.futures import ThreadPoolExecutor
 
@@ -52,6 +55,10 @@ class BaseRenderTool(BaseTool, ABC):
     - _check_dependencies(): 依赖检查 (可选，但建议实现)
     """
     
+    # 渲染结果LRU缓存的上限（智能体重试或重复输出相同图表时直接返回），子类可按输出大小调整
+    _render_cache_max: int = 128
+    _render_cache_max_bytes: int = 128 * 1024 * 1024
+    
     def __init__(self, 
                  name: str,
                  description: str,
@@ -74,6 +81,11 @@ class BaseRenderTool(BaseTool, ABC):
         self.default_format = default_format or self._get_default_format()
         self.executor = ThreadPoolExecutor(max_workers=2)  # 用于CPU密集型任务
         
+        # 渲染结果LRU缓存：键由子类根据代码和渲染参数计算
+        self._render_cache: "OrderedDict[bytes, bytes]" = OrderedDict()
+        self._render_cache_lock = threading.Lock()
+        self._render_cache_bytes = 0
+        
         # 运行依赖检查
         self._check_dependencies()
     
@@ -121,6 +133,41 @@ class BaseRenderTool(BaseTool, ABC):
         """
         pass
     
+    def _render_options(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        从工具参数中取出传给 _render_sync 的额外渲染选项（如dpi），默认没有
+        
+        返回的选项会作为关键字参数依次传给 _render_async 和 _render_sync
+        """
+        return {}
+    
+    def _cache_get(self, cache_key: bytes) -> Optional[bytes]:
+        """读取渲染结果缓存，未命中时返回None"""
+        with self._render_cache_lock:
+            data = self._render_cache.get(cache_key)
+            if data is not None:
+                self._render_cache.move_to_end(cache_key)
+                logger.info(f"♻️ 命中{self.name}渲染缓存")
+            return data
+    
+    def _cache_put(self, cache_key: bytes, result: Dict[str, Any]):
+        """成功的渲染结果写入缓存，超出条目数或总字节数上限时淘汰最久未使用的结果"""
+        if not result.get("success"):
+            return
+        data = result["data"]
+        if len(data) > self._render_cache_max_bytes:
+            return
+        with self._render_cache_lock:
+            previous = self._render_cache.pop(cache_key, None)
+            if previous is not None:
+                self._render_cache_bytes -= len(previous)
+            self._render_cache[cache_key] = data
+            self._render_cache_bytes += len(data)
+            while (len(self._render_cache) > self._render_cache_max
+                   or self._render_cache_bytes > self._render_cache_max_bytes):
+                _, evicted = self._render_cache.popitem(last=False)
+                self._render_cache_bytes -= len(evicted)
+    
     def _get_supported_formats(self) -> List[str]:
         """
         获取支持的输出格式 - 建议子类重写
@@ -286,7 +333,8 @@ class BaseRenderTool(BaseTool, ABC):
                 code=code,
                 output_format=output_format,
                 width=width,
-                height=height
+                height=height,
+                **self._render_options(args)
             )
             
             if not render_result["success"]:
@@ -331,7 +379,8 @@ class BaseRenderTool(BaseTool, ABC):
                            code: str, 
                            output_format: str, 
                            width: int, 
-                           height: int) -> Dict[str, Any]:
+                           height: int,
+                           **options) -> Dict[str, Any]:
         """
         异步渲染方法，将CPU密集型任务转移到线程池
         
@@ -345,6 +394,7 @@ class BaseRenderTool(BaseTool, ABC):
             output_format: 输出格式
             width: 宽度
             height: 高度
+            **options: _render_options 返回的额外渲染选项
             
         Returns:
             渲染结果字典
@@ -358,11 +408,7 @@ class BaseRenderTool(BaseTool, ABC):
             result = await asyncio.wait_for(
                 loop.run_in_executor(
                 self.executor,
-                self._render_sync,
-                code,
-                output_format,
-                width,
-                height
+                functools.partial(self._render_sync, code, output_format, width, height, **options)
                 ),
                 timeout=120.0  # 2分钟超时
             )
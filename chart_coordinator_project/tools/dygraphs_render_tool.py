@@ -1,19 +1,314 @@
 # Copyright 2025 Google LLC
 # Dygraphs渲染工具 - 时间序列专家
 
+import asyncio
+import functools
+import io
+import json
 import logging
+import os
 import tempfile
 import subprocess
 import sys
 import platform
+import re
+import string
+import threading
+import traceback
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from pathlib import Path
-from typing import Dict, Any, Optional
+from types import ModuleType
+from typing import Dict, Any, List, Optional
 
 from google.genai import types
 from .base_render_tool import BaseRenderTool
+from ._executors import _exec_thread_pool, _trap_exit
 
 logger = logging.getLogger(__name__)
 
+# Python代码执行方式：
+#   worker（默认）- 交给常驻的工作进程执行（隔离用户代码，同时省去每次启动解释器的开销；
+#                   超时时终止工作进程，下次渲染重新启动）
+#   inprocess     - 在当前解释器内exec；超时的代码无法终止，会一直占着执行线程，只适合可信代码
+#   subprocess    - 每次渲染启动新的解释器
+_EXEC_MODE = os.getenv('DYGRAPHS_EXEC_MODE', 'worker')
+_EXEC_TIMEOUT = 60
+_WORKER_PATH = Path(__file__).with_name("_dygraphs_worker.py")
+
+# 随项目分发的Dygraphs库（与 https://dygraphs.com/dygraph-combined.js 相同的1.1.1版本）
+_DYGRAPH_JS_PATH = Path(__file__).parent.parent / "static" / "js" / "dygraph-combined.js"
+_DYGRAPH_CDN_TAG = '<script src="https://dygraphs.com/dygraph-combined.js"></script>'
+
+# 生成的页面引用Dygraphs库：本地优先（应用挂载的 /static），加载失败时同步回退到CDN，
+# 页面中紧随其后的脚本可以直接使用Dygraph
+_DYGRAPH_PAGE_TAG = (
+    '<script src="/static/js/dygraph-combined.js"></script>\n'
+    '    <script>window.Dygraph || document.write(\'<script src="https://dygraphs.com/dygraph-combined.js"><\\/script>\')</script>'
+)
+
+# Python代码特征，只扫描开头部分（真实Python代码的import等特征总出现在前部）
+_PY_RE = re.compile(r'import |def |pandas|numpy|print\(|pd\.')
+_PY_SCAN_LIMIT = 4096
+
+# HTML模板中需要交给Python处理的 {data.to_csv(...)} 占位符
+_DATA_CSV_RE = re.compile(r'\{data\.to_csv\([^}]*\)\}')
+
+# 完整HTML页面的识别与注入点，忽略大小写且允许标签带属性，避免对整段代码做lower()拷贝
+_HTML_TAG = re.compile(r'<html\b', re.I)
+_HEAD_RE = re.compile(r'<head\b[^>]*>', re.I)
+_STYLE_RE = re.compile(r'<style\b[^>]*>', re.I)
+_META_CHARSET_RE = re.compile(r'<meta\s+charset\s*=', re.I)
+
+# PNG截图前等待的就绪标记，注入到页面末尾
+_READY_SCRIPT = "<script>requestAnimationFrame(function(){window.__dygraphReady=true;});</script>"
+
+# 进程内执行用户代码的线程池，用于实现超时控制
+_EXEC_POOL = _exec_thread_pool("dygraphs-exec")
+
+# 读取常驻工作进程响应的线程池，与执行线程分开：超时未结束的进程内代码不会占住读取响应的线程
+_IO_POOL = _exec_thread_pool("dygraphs-io")
+
+# 处理含 {data.xxx} 占位符的HTML模板，TEMPLATE 由执行环境注入，结果留在 final_html 中
+_TEMPLATE_PROCESSOR = r"""
+import pandas as pd
+import numpy as np
+from datetime import datetime, timedelta
+
+# 生成示例数据（如果用户代码中没有定义data）
+dates = pd.date_range(start='2023-01-01', end='2023-12-31', freq='D')
+visits = np.random.randint(1000, 5000, size=len(dates))
+data = pd.DataFrame({'Date': dates, 'Visits': visits})
+
+# 转换为Dygraphs所需的格式
+data['Date'] = data['Date'].astype(str)
+
+# 替换模板中的Python表达式
+import re
+def replace_data_expressions(match):
+    expr = match.group(0)[1:-1]  # 移除花括号
+    try:
+        return str(eval(expr))
+    except:
+        return data.to_csv(index=False, header=False)
+
+pattern = r'\{data\.[^}]*\}'
+final_html = re.sub(pattern, replace_data_expressions, TEMPLATE)
+"""
+
+
+# 渲染用到的HTML/代码模板，模块加载时构建一次；使用 ${name} 占位符，CSS/JS中的花括号无需转义
+_TEMPLATES = {
+    # 注入到用户页面已有样式中的中文字体规则
+    'font_rules': string.Template("""
+        body, div, span, h1, h2, h3, h4, h5, h6 {
+            font-family: ${font_family} !important;
+        }
+        .dygraph-legend, .dygraph-axis-label, .dygraph-title {
+            font-family: ${font_family} !important;
+        }
+"""),
+    # JS片段外壳的头部，字体和Dygraphs脚本在初始化时代入
+    'wrap_head': string.Template("""
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>Dygraphs Chart</title>
+    ${dygraph_script}
+    <style>
+        body { 
+            font-family: ${font_family}; 
+            margin: 20px; 
+            background-color: #fafafa;
+        }
+        #graphdiv { 
+            font-family: ${font_family};
+        }
+        .dygraph-legend {
+            font-family: ${font_family} !important;
+        }
+        .dygraph-axis-label {
+            font-family: ${font_family} !important;
+        }
+        .dygraph-title {
+            font-family: ${font_family} !important;
+        }
+    </style>
+</head>
+<body>
+"""),
+    # JS片段外壳的主体，尺寸写在容器的内联样式上
+    'wrap_js': string.Template("""    <div id="graphdiv" style="width: ${width}px; height: ${height}px;"></div>
+    <script>
+        ${code}
+    </script>
+    <script>requestAnimationFrame(function() { window.__dygraphReady = true; });</script>
+</body>
+</html>
+"""),
+    # 追加在用户Python代码之后的保存逻辑，最终页面留在 final_html 中（生成的是Python源码，转义序列按原样保留）
+    'default_save': string.Template(r"""
+# 检查用户代码中是否已经定义了html_template变量
+if 'html_template' in locals():
+    # 用户已经定义了完整的HTML模板，直接使用
+    final_html = html_template
+else:
+    # 用户没有定义HTML模板，使用默认模板
+    # 假设用户定义了data变量（DataFrame或CSV字符串）
+    if 'data' in locals():
+        if hasattr(data, 'to_csv'):
+            # DataFrame格式（固定换行符，Windows下默认会输出\r\n）
+            csv_data = data.to_csv(index=False, lineterminator='\n')
+        elif getattr(data, 'ndim', None) == 2:
+            # numpy二维数组：一次savetxt整体写出
+            import io as _io
+            import numpy as _np
+            _buf = _io.StringIO()
+            _np.savetxt(_buf, data, delimiter=',', fmt='%s')
+            csv_data = _buf.getvalue()
+        else:
+            # 字符串格式
+            csv_data = str(data)
+    else:
+        csv_data = "Date,Value\n2023-01-01,100\n2023-01-02,120"
+    
+    final_html = '''<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>Dygraphs Time Series Chart</title>
+    __DYGRAPH_SCRIPT__
+    <style>
+        body { 
+            font-family: ${font_family}; 
+            margin: 20px; 
+            background-color: #fafafa;
+        }
+        #graphdiv { 
+            width: ${width}px; 
+            height: ${height}px; 
+            font-family: ${font_family};
+        }
+        h2 {
+            color: #333;
+            font-family: ${font_family};
+        }
+        .dygraph-legend {
+            font-family: ${font_family} !important;
+        }
+        .dygraph-axis-label {
+            font-family: ${font_family} !important;
+        }
+        .dygraph-title {
+            font-family: ${font_family} !important;
+        }
+    </style>
+</head>
+<body>
+    <h2>时间序列图表</h2>
+    <div id="graphdiv"></div>
+    <script>
+        const csvData = __CSV_DATA__;
+        new Dygraph(
+            document.getElementById("graphdiv"),
+            csvData,
+            {
+                xlabel: 'Time',
+                ylabel: 'Value',
+                title: 'Time Series Chart',
+                legend: 'always',
+                showRangeSelector: true,
+                rangeSelectorHeight: 30,
+                rangeSelectorPlotStrokeColor: '#808FAB',
+                rangeSelectorPlotFillColor: '#A7B1C4',
+                axisLabelFontSize: 12,
+                titleHeight: 28,
+                drawCallback: function() {
+                    requestAnimationFrame(function() { window.__dygraphReady = true; });
+                }
+            }
+        );
+    </script>
+</body>
+</html>'''
+    # CSV以JSON字符串字面量嵌入，避免反引号、模板插值或 </script> 破坏脚本
+    import json as _json
+    csv_literal = _json.dumps(csv_data, ensure_ascii=False).replace('</', '<\\/')
+    final_html = final_html.replace('__DYGRAPH_SCRIPT__', DYGRAPH_SCRIPT).replace('__CSV_DATA__', csv_literal)
+"""),
+}
+
+
+@functools.cache
+def _compute_font_stack() -> tuple:
+    """按平台计算中文字体优先级，返回 (字体列表, CSS font-family字符串)；平台在运行期不变，每个进程只计算一次"""
+    logger.info("🎨 配置Dygraphs中文字体支持...")
+    
+    # 获取系统类型
+    system = platform.system().lower()
+    
+    # 定义跨平台字体优先级
+    if system == "windows":
+        chinese_fonts = ["Microsoft YaHei", "SimHei", "SimSun", "KaiTi", "sans-serif"]
+    elif system == "darwin":  # macOS
+        chinese_fonts = ["Arial Unicode MS", "Hiragino Sans GB", "PingFang SC", "sans-serif"]
+    else:  # Linux及其他
+        chinese_fonts = ["WenQuanYi Micro Hei", "Noto Sans CJK SC", "DejaVu Sans", "sans-serif"]
+    
+    # 构建字体族字符串
+    font_family = ", ".join([f'"{font}"' for font in chinese_fonts])
+    
+    logger.info(f"✅ 中文字体配置完成: {font_family}")
+    return chinese_fonts, font_family
+
+
+@functools.cache
+def _probe_deps() -> tuple:
+    """检查可选的Python依赖，返回 (pandas可用, PNG输出可用)；每个进程只检查一次"""
+    # 检查Python数据处理依赖（可选）
+    try:
+        import pandas
+        logger.info(f"✅ pandas (数据处理支持): {pandas.__version__}")
+        pandas_ok = True
+    except ImportError:
+        logger.info("ℹ️ pandas未安装，仅支持JavaScript代码")
+        pandas_ok = False
+    
+    # 检查PNG输出依赖（可选）
+    try:
+        import selenium
+        logger.info(f"✅ selenium (PNG输出支持): {selenium.__version__}")
+        png_ok = True
+    except ImportError:
+        logger.info("ℹ️ selenium未安装，仅支持HTML输出")
+        png_ok = False
+    
+    logger.info("✅ Dygraphs渲染工具检查完成")
+    return pandas_ok, png_ok
+
+
+@functools.cache
+def _read_dygraph_js() -> Optional[str]:
+    """读取随项目分发的Dygraphs库，不存在时返回None；每个进程只读取一次"""
+    try:
+        js = _DYGRAPH_JS_PATH.read_text(encoding='utf-8')
+        logger.info(f"✅ 已加载本地Dygraphs库: {_DYGRAPH_JS_PATH.name}")
+        return js
+    except OSError:
+        logger.warning("⚠️ 未找到本地Dygraphs库，使用CDN加载")
+        return None
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_user_code(source: str):
+    """编译预处理后的Python代码，相同代码重复渲染时跳过编译"""
+    return compile(source, "<dygraphs_code>", "exec")
+
+
+def _encode_html(html) -> Optional[bytes]:
+    """把执行结果中的 final_html 转为UTF-8字节，未生成时返回None"""
+    return html.encode('utf-8') if isinstance(html, str) else None
+
 
 class DygraphsRenderTool(BaseRenderTool):
     """📊 Dygraphs时间序列图表渲染工具"""
@@ -25,28 +320,33 @@ class DygraphsRenderTool(BaseRenderTool):
             supported_formats=["html", "png"],
             default_format="html"
         )
-        self._check_dependencies()
+        self._load_dygraph_assets()
         self._setup_chinese_fonts()
+        
+        # 常驻工作进程（worker模式下首次渲染时启动）
+        self._worker = None
+        self._worker_lock = threading.Lock()
+        
+        # 复用的headless Chrome（首次PNG渲染时启动）
+        self._driver = None
+        self._driver_lock = threading.Lock()
+
+    
+    def _load_dygraph_assets(self):
+        """页面按本地优先、CDN备用的方式引用Dygraphs库；只有PNG截图时才内联本地库（见 _inline_dygraph）"""
+        self._dygraph_tag = _DYGRAPH_PAGE_TAG
     
     def _setup_chinese_fonts(self):
         """🔧 设置智能中文字体支持"""
-        logger.info("🎨 配置Dygraphs中文字体支持...")
-        
-        # 获取系统类型
-        system = platform.system().lower()
-        
-        # 定义跨平台字体优先级
-        if system == "windows":
-            self.chinese_fonts = ["Microsoft YaHei", "SimHei", "SimSun", "KaiTi", "sans-serif"]
-        elif system == "darwin":  # macOS
-            self.chinese_fonts = ["Arial Unicode MS", "Hiragino Sans GB", "PingFang SC", "sans-serif"]
-        else:  # Linux及其他
-            self.chinese_fonts = ["WenQuanYi Micro Hei", "Noto Sans CJK SC", "DejaVu Sans", "sans-serif"]
+        self.chinese_fonts, self.font_family = _compute_font_stack()
         
-        # 构建字体族字符串
-        self.font_family = ", ".join([f'"{font}"' for font in self.chinese_fonts])
-        
-        logger.info(f"✅ 中文字体配置完成: {self.font_family}")
+        # 预先生成各处注入的静态HTML片段，渲染时直接拼接
+        font_rules = _TEMPLATES['font_rules'].substitute(font_family=self.font_family)
+        self._style_insert = font_rules
+        self._style_block = f"\n    <style>{font_rules}    </style>\n"
+        self._wrap_prefix = _TEMPLATES['wrap_head'].substitute(
+            font_family=self.font_family, dygraph_script=self._dygraph_tag
+        )
     
     def _get_declaration(self) -> Optional[types.FunctionDeclaration]:
         """🔧 定义Dygraphs渲染工具的精确函数声明"""
@@ -89,26 +389,7 @@ class DygraphsRenderTool(BaseRenderTool):
     def _check_dependencies(self):
         """🔧 Dygraphs依赖检查"""
         self._dygraphs_available = True  # Dygraphs是JavaScript库，不需要Python依赖
-        
-        # 检查Python数据处理依赖（可选）
-        try:
-            import pandas
-            logger.info(f"✅ pandas (数据处理支持): {pandas.__version__}")
-            self._pandas_support = True
-        except ImportError:
-            logger.info("ℹ️ pandas未安装，仅支持JavaScript代码")
-            self._pandas_support = False
-        
-        # 检查PNG输出依赖（可选）
-        try:
-            import selenium
-            logger.info(f"✅ selenium (PNG输出支持): {selenium.__version__}")
-            self._png_support = True
-        except ImportError:
-            logger.info("ℹ️ selenium未安装，仅支持HTML输出")
-            self._png_support = False
-        
-        logger.info("✅ Dygraphs渲染工具检查完成")
+        self._pandas_support, self._png_support = _probe_deps()
     
     def _render_sync(self, code: str, output_format: str, width: int, height: int) -> Dict[str, Any]:
         """同步渲染Dygraphs时间序列图表"""
@@ -120,245 +401,237 @@ class DygraphsRenderTool(BaseRenderTool):
                 "suggestion": "请安装: pip install selenium chromedriver-autoinstaller 或使用HTML格式"
             }
         
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            
-            try:
-                # 判断是Python代码还是HTML代码
-                if self._is_python_code(code):
-                    # 处理Python代码
-                    code_file = temp_path / "dygraphs_code.py"
-                    output_file = temp_path / f"output.{output_format}"
-                    
-                    processed_code = self._preprocess_python_code(code, output_file, output_format, width, height)
-                    code_file.write_text(processed_code, encoding='utf-8')
-                    
-                    logger.info(f"🚀 执行Python代码生成Dygraphs图表...")
-                    
-                    result = subprocess.run(
-                        [sys.executable, str(code_file)],
-                        capture_output=True,
-                        text=True,
-                        timeout=60,
-                        cwd=temp_dir,
-                        encoding='utf-8',
-                        errors='replace'
-                    )
-                    
-                    if result.returncode != 0:
-                        return {
-                            "success": False,
-                            "error": f"Python代码执行失败:\n{result.stderr}"
-                        }
-                else:
-                    # 处理HTML代码
-                    output_file = temp_path / f"output.{output_format}"
-                    html_content = self._process_html_code(code, width, height)
-                    
-                    # 检查是否是需要Python处理的模板
-                    if html_content.startswith("PYTHON_TEMPLATE:"):
-                        # 移除标记前缀
-                        template_code = html_content[16:]
-                        
-                        # 创建Python代码来处理模板
-                        python_code = f"""
-import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
-
-# 生成示例数据（如果用户代码中没有定义data）
-dates = pd.date_range(start='2023-01-01', end='2023-12-31', freq='D')
-visits = np.random.randint(1000, 5000, size=len(dates))
-data = pd.DataFrame({{'Date': dates, 'Visits': visits}})
-
-# 转换为Dygraphs所需的格式
-data['Date'] = data['Date'].astype(str)
-
-# 处理模板
-template = '''{template_code}'''
-
-# 替换模板中的Python表达式
-import re
-def replace_data_expressions(match):
-    expr = match.group(0)[1:-1]  # 移除花括号
-    try:
-        return str(eval(expr))
-    except:
-        return data.to_csv(index=False, header=False)
-
-pattern = r'\\{{data\\.[^}}]*\\}}'
-final_html = re.sub(pattern, replace_data_expressions, template)
-
-# 保存HTML文件
-with open(r"{output_file}", 'w', encoding='utf-8') as f:
-    f.write(final_html)
-"""
-                        
-                        # 执行Python代码
-                        code_file = temp_path / "template_processor.py"
-                        code_file.write_text(python_code, encoding='utf-8')
-                        
-                        result = subprocess.run(
-                            [sys.executable, str(code_file)],
-                            capture_output=True,
-                            text=True,
-                            timeout=60,
-                            cwd=temp_dir,
-                            encoding='utf-8',
-                            errors='replace'
-                        )
-                        
-                        if result.returncode != 0:
-                            return {
-                                "success": False,
-                                "error": f"模板处理失败:\\n{result.stderr}"
-                            }
-                    else:
-                        # 普通HTML处理
-                        if output_format == "html":
-                            output_file.write_text(html_content, encoding='utf-8')
-                        else:  # PNG
-                            temp_html = temp_path / "temp.html"
-                            temp_html.write_text(html_content, encoding='utf-8')
-                            self._html_to_png(temp_html, output_file, width, height)
-                
-                if not output_file.exists():
-                    return {
-                        "success": False,
-                        "error": "未生成输出文件"
-                    }
+        # 判断是Python代码还是HTML代码
+        is_python = self._is_python_code(code)
+        html_content = None if is_python else self._process_html_code(code, width, height)
+        
+        # 普通HTML输出不需要临时目录和文件读写，直接在内存中返回
+        if output_format == "html" and html_content is not None and not html_content.startswith("PYTHON_TEMPLATE:"):
+            chart_bytes = html_content.encode('utf-8')
+            logger.info(f"✅ Dygraphs图表渲染成功，大小: {len(chart_bytes)} bytes")
+            return {
+                "success": True,
+                "data": chart_bytes
+            }
+        
+        try:
+            if is_python:
+                # 处理Python代码
+                processed_code = self._preprocess_python_code(code, width, height)
                 
-                if output_format == "html":
-                    content = output_file.read_text(encoding='utf-8')
-                    chart_bytes = content.encode('utf-8')
-                else:
-                    chart_bytes = output_file.read_bytes()
+                logger.info(f"🚀 执行Python代码生成Dygraphs图表...")
                 
+                run_result = self._run_python(
+                    processed_code,
+                    {"DYGRAPH_SCRIPT": self._dygraph_tag},
+                    "Python代码执行失败"
+                )
+            elif html_content.startswith("PYTHON_TEMPLATE:"):
+                # 需要Python处理的模板，移除标记前缀后执行模板处理代码
+                run_result = self._run_python(
+                    _TEMPLATE_PROCESSOR,
+                    {"TEMPLATE": html_content[16:]},
+                    "模板处理失败"
+                )
+            else:
+                # 普通HTML（HTML输出已在上方直接返回）
+                run_result = {"success": True, "data": html_content.encode('utf-8')}
+            
+            if not run_result["success"]:
+                return run_result
+            
+            # 生成的HTML直接从内存取得，无需落盘再读回
+            chart_bytes = run_result["data"]
+            if not chart_bytes:
+                return {
+                    "success": False,
+                    "error": "未生成HTML内容"
+                }
+            
+            if output_format == "png":
+                chart_bytes = self._render_png(chart_bytes, width, height)
                 if len(chart_bytes) == 0:
                     return {
                         "success": False,
                         "error": "生成的文件为空"
                     }
-                
-                logger.info(f"✅ Dygraphs图表渲染成功，大小: {len(chart_bytes)} bytes")
-                
+            
+            logger.info(f"✅ Dygraphs图表渲染成功，大小: {len(chart_bytes)} bytes")
+            
+            return {
+                "success": True,
+                "data": chart_bytes
+            }
+            
+        except subprocess.TimeoutExpired:
+            return {
+                "success": False,
+                "error": "图表渲染超时（60秒）"
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"渲染过程发生错误: {str(e)}"
+            }
+    
+    def _render_png(self, html_bytes: bytes, width: int, height: int) -> bytes:
+        """截图生成PNG，只有这一步需要临时目录（Chrome需要通过file://加载页面）"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            temp_html = temp_path / "temp.html"
+            output_file = temp_path / "output.png"
+            html = self._inline_dygraph(html_bytes.decode('utf-8'))
+            temp_html.write_text(self._inject_ready_signal(html), encoding='utf-8')
+            self._html_to_png(temp_html, output_file, width, height)
+            return output_file.read_bytes() if output_file.exists() else b""
+    
+    def _run_python(self, source: str, variables: Dict[str, Any], error_prefix: str) -> Dict[str, Any]:
+        """执行预处理后的Python代码，variables 作为全局变量注入；成功时 data 为 final_html 的UTF-8字节"""
+        if _EXEC_MODE == "inprocess":
+            return self._exec_user_code(source, variables, error_prefix)
+        if _EXEC_MODE == "worker":
+            return self._exec_in_worker(source, variables, error_prefix)
+        
+        # 子进程模式：把注入变量写成赋值语句，并补充常用导入
+        # 用户的print输出改写到stderr，stdout只承载最终HTML
+        header = ["import sys as _sys", "_html_out = _sys.stdout.buffer", "_sys.stdout = _sys.stderr"]
+        if 'import pandas' not in source and 'import pd' not in source:
+            header.append("import pandas as pd")
+        if 'import numpy' not in source:
+            header.append("import numpy as np")
+        header.extend(f"{name} = {value!r}" for name, value in variables.items())
+        footer = "\n_html_out.write(final_html.encode('utf-8'))\n"
+        
+        # 代码经stdin传入，HTML经stdout取回，不再需要临时文件
+        result = subprocess.run(
+            [sys.executable, '-'],
+            input=('\n'.join(header) + '\n' + source + footer).encode('utf-8'),
+            capture_output=True,
+            timeout=_EXEC_TIMEOUT,
+            cwd=tempfile.gettempdir()
+        )
+        
+        if result.returncode != 0:
+            return {
+                "success": False,
+                "error": f"{error_prefix}:\n{result.stderr.decode('utf-8', errors='replace')}"
+            }
+        return {"success": True, "data": result.stdout}
+    
+    def _exec_user_code(self, source: str, variables: Dict[str, Any], error_prefix: str) -> Dict[str, Any]:
+        """在当前解释器中执行代码，省去启动Python进程和重复导入pandas/numpy的开销"""
+        namespace = ModuleType("__main__").__dict__
+        if self._pandas_support:
+            import pandas as pd
+            import numpy as np
+            namespace.update(pd=pd, np=np)
+        namespace.update(variables)
+        
+        # 用户代码的print输出写入丢弃的缓冲区，避免污染服务日志
+        # （不替换全局sys.stdout：多个渲染并发时redirect_stdout的恢复顺序会错乱）
+        namespace["print"] = functools.partial(print, file=io.StringIO())
+        
+        def run():
+            # 用户代码的sys.exit()等转换为普通异常，作为渲染错误返回
+            with _trap_exit():
+                exec(_compile_user_code(source), namespace)
+        
+        future = _EXEC_POOL.submit(run)
+        try:
+            future.result(timeout=_EXEC_TIMEOUT)
+        except FutureTimeoutError:
+            return {
+                "success": False,
+                "error": f"图表渲染超时（{_EXEC_TIMEOUT}秒）"
+            }
+        except Exception:
+            return {
+                "success": False,
+                "error": f"{error_prefix}:\n{traceback.format_exc()}"
+            }
+        return {"success": True, "data": _encode_html(namespace.get("final_html"))}
+    
+    def _ensure_worker(self) -> subprocess.Popen:
+        """获取常驻工作进程，不存在或已退出时重新启动"""
+        if self._worker is None or self._worker.poll() is not None:
+            logger.info("🚀 启动Dygraphs常驻Python工作进程...")
+            self._worker = subprocess.Popen(
+                [sys.executable, '-u', str(_WORKER_PATH)],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                text=True,
+                encoding='utf-8',
+                cwd=tempfile.gettempdir()
+            )
+        return self._worker
+    
+    def _stop_worker(self):
+        """终止常驻工作进程，下次渲染时会重新启动"""
+        worker, self._worker = self._worker, None
+        if worker is None or worker.poll() is not None:
+            return
+        worker.terminate()
+        try:
+            worker.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            worker.kill()
+    
+    def _exec_in_worker(self, source: str, variables: Dict[str, Any], error_prefix: str) -> Dict[str, Any]:
+        """通过常驻工作进程执行代码，请求/响应均为一行JSON，生成的HTML随响应返回"""
+        request = json.dumps({"code": source, "variables": variables})
+        
+        with self._worker_lock:
+            worker = self._ensure_worker()
+            try:
+                worker.stdin.write(request + "\n")
+                worker.stdin.flush()
+            except OSError as e:
+                self._stop_worker()
                 return {
-                    "success": True,
-                    "data": chart_bytes
+                    "success": False,
+                    "error": f"{error_prefix}: 工作进程通信失败 {e}"
                 }
-                
-            except subprocess.TimeoutExpired:
+            
+            # 在线程中读取响应以实现跨平台超时（Windows上select不支持管道）
+            future = _IO_POOL.submit(worker.stdout.readline)
+            try:
+                line = future.result(timeout=_EXEC_TIMEOUT)
+            except FutureTimeoutError:
+                # 超时后终止工作进程，readline随之返回
+                self._stop_worker()
                 return {
                     "success": False,
-                    "error": "图表渲染超时（60秒）"
+                    "error": f"图表渲染超时（{_EXEC_TIMEOUT}秒）"
                 }
-            except Exception as e:
+            
+            if not line:
+                self._stop_worker()
                 return {
                     "success": False,
-                    "error": f"渲染过程发生错误: {str(e)}"
+                    "error": f"{error_prefix}: 工作进程意外退出"
                 }
+        
+        response = json.loads(line)
+        if not response.get("ok"):
+            return {
+                "success": False,
+                "error": f"{error_prefix}:\n{response.get('err', '')}"
+            }
+        return {"success": True, "data": _encode_html(response.get("html"))}
     
     def _is_python_code(self, code: str) -> bool:
         """判断是否为Python代码"""
-        python_indicators = ['import ', 'def ', 'pandas', 'numpy', 'print(', 'pd.']
-        return any(indicator in code for indicator in python_indicators)
+        return _PY_RE.search(code, 0, _PY_SCAN_LIMIT) is not None
     
-    def _preprocess_python_code(self, code: str, output_file: Path, output_format: str, width: int, height: int) -> str:
-        """预处理Python代码"""
-        
-        # 添加必要的导入
-        imports = []
-        if 'import pandas' not in code and 'import pd' not in code:
-            imports.append("import pandas as pd")
-        if 'import numpy' not in code:
-            imports.append("import numpy as np")
-        
-        imports_str = '\n'.join(imports) + '\n' if imports else ''
+    def _preprocess_python_code(self, code: str, width: int, height: int) -> str:
+        """预处理Python代码（pd/np 由执行环境提供，DYGRAPH_SCRIPT 由执行环境注入，生成的页面留在 final_html 中）"""
         
         # 创建带中文字体支持的HTML模板和保存逻辑
-        save_logic = f"""
-# 检查用户代码中是否已经定义了html_template变量
-if 'html_template' in locals():
-    # 用户已经定义了完整的HTML模板，直接使用
-    final_html = html_template
-else:
-    # 用户没有定义HTML模板，使用默认模板
-    # 假设用户定义了data变量（DataFrame或CSV字符串）
-    if 'data' in locals():
-        if hasattr(data, 'to_csv'):
-            # DataFrame格式
-            csv_data = data.to_csv(index=False)
-        else:
-            # 字符串格式
-            csv_data = str(data)
-    else:
-        csv_data = "Date,Value\\n2023-01-01,100\\n2023-01-02,120"
-    
-    final_html = f'''<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <title>Dygraphs Time Series Chart</title>
-    <script src="https://dygraphs.com/dygraph-combined.js"></script>
-    <style>
-        body {{ 
-            font-family: {self.font_family}; 
-            margin: 20px; 
-            background-color: #fafafa;
-        }}
-        #graphdiv {{ 
-            width: {width}px; 
-            height: {height}px; 
-            font-family: {self.font_family};
-        }}
-        h2 {{
-            color: #333;
-            font-family: {self.font_family};
-        }}
-        .dygraph-legend {{
-            font-family: {self.font_family} !important;
-        }}
-        .dygraph-axis-label {{
-            font-family: {self.font_family} !important;
-        }}
-        .dygraph-title {{
-            font-family: {self.font_family} !important;
-        }}
-    </style>
-</head>
-<body>
-    <h2>时间序列图表</h2>
-    <div id="graphdiv"></div>
-    <script>
-        const csvData = `{{csv_data}}`;
-        new Dygraph(
-            document.getElementById("graphdiv"),
-            csvData,
-            {{
-                xlabel: 'Time',
-                ylabel: 'Value',
-                title: 'Time Series Chart',
-                legend: 'always',
-                showRangeSelector: true,
-                rangeSelectorHeight: 30,
-                rangeSelectorPlotStrokeColor: '#808FAB',
-                rangeSelectorPlotFillColor: '#A7B1C4',
-                axisLabelFontSize: 12,
-                titleHeight: 28
-            }}
-        );
-    </script>
-</body>
-</html>'''
-
-# 保存HTML文件
-with open(r"{output_file}", 'w', encoding='utf-8') as f:
-    f.write(final_html)
-"""
+        save_logic = _TEMPLATES['default_save'].substitute(
+            font_family=self.font_family, width=width, height=height
+        )
         
         processed_code = f"""
-{imports_str}
-
 # 用户代码
 {code}
 
@@ -370,44 +643,26 @@ with open(r"{output_file}", 'w', encoding='utf-8') as f:
     def _process_html_code(self, code: str, width: int, height: int) -> str:
         """处理HTML代码（支持中文字体）"""
         
-        if '<html>' in code.lower():
+        if _HTML_TAG.search(code):
             # 完整的HTML，注入中文字体支持
-            if '<style>' in code:
+            if _STYLE_RE.search(code):
                 # 在现有样式中添加中文字体
-                style_insert = f"""
-        body, div, span, h1, h2, h3, h4, h5, h6 {{
-            font-family: {self.font_family} !important;
-        }}
-        .dygraph-legend, .dygraph-axis-label, .dygraph-title {{
-            font-family: {self.font_family} !important;
-        }}
-"""
-                code = code.replace('<style>', f'<style>{style_insert}')
+                code = _STYLE_RE.sub(lambda m: m.group(0) + self._style_insert, code, count=1)
             else:
                 # 添加新的样式块
-                style_block = f"""
-    <style>
-        body, div, span, h1, h2, h3, h4, h5, h6 {{
-            font-family: {self.font_family} !important;
-        }}
-        .dygraph-legend, .dygraph-axis-label, .dygraph-title {{
-            font-family: {self.font_family} !important;
-        }}
-    </style>
-"""
-                code = code.replace('<head>', f'<head>{style_block}')
+                code = _HEAD_RE.sub(lambda m: m.group(0) + self._style_block, code, count=1)
+            
+            # 用户页面引用的CDN版Dygraphs改为本地优先加载
+            if _DYGRAPH_CDN_TAG in code:
+                code = code.replace(_DYGRAPH_CDN_TAG, self._dygraph_tag)
             
             # 确保有正确的字符编码
-            if '<meta charset=' not in code.lower():
-                code = code.replace('<head>', '<head>\n    <meta charset="UTF-8">')
+            if not _META_CHARSET_RE.search(code):
+                code = _HEAD_RE.sub(lambda m: m.group(0) + '\n    <meta charset="UTF-8">', code, count=1)
             
             # 修复JavaScript中的Python格式化语法问题
-            # 查找并替换 {data.to_csv(...)} 这样的Python表达式
-            import re
-            
-            # 匹配 {data.to_csv(...)} 模式
-            pattern = r'\{data\.to_csv\([^}]*\)\}'
-            if re.search(pattern, code):
+            # 查找 {data.to_csv(...)} 这样的Python表达式
+            if _DATA_CSV_RE.search(code):
                 # 如果发现这种模式，说明这是一个需要在Python中处理的模板
                 # 我们需要提取数据并替换这些占位符
                 # 这种情况下，我们返回一个标记，让Python代码处理器知道需要特殊处理
@@ -415,61 +670,125 @@ with open(r"{output_file}", 'w', encoding='utf-8') as f:
             
             return code
         else:
-            # 只是JavaScript片段，需要包装并添加中文字体支持
-            return f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <title>Dygraphs Chart</title>
-    <script src="https://dygraphs.com/dygraph-combined.js"></script>
-    <style>
-        body {{ 
-            font-family: {self.font_family}; 
-            margin: 20px; 
-            background-color: #fafafa;
-        }}
-        #graphdiv {{ 
-            width: {width}px; 
-            height: {height}px; 
-            font-family: {self.font_family};
-        }}
-        .dygraph-legend {{
-            font-family: {self.font_family} !important;
-        }}
-        .dygraph-axis-label {{
-            font-family: {self.font_family} !important;
-        }}
-        .dygraph-title {{
-            font-family: {self.font_family} !important;
-        }}
-    </style>
-</head>
-<body>
-    <div id="graphdiv"></div>
-    <script>
-        {code}
-    </script>
-</body>
-</html>
-"""
+            # 只是JavaScript片段，套用预先生成的外壳
+            return self._wrap_prefix + _TEMPLATES['wrap_js'].substitute(width=width, height=height, code=code)
+    
+    def _inline_dygraph(self, html: str) -> str:
+        """
+        截图用的页面改为内联本地Dygraphs库
+        
+        页面通过file://打开，没有服务器提供 /static 路径；内联后截图无需联网加载CDN
+        """
+        if _DYGRAPH_PAGE_TAG not in html:
+            return html
+        js = _read_dygraph_js()
+        if js is None:
+            return html
+        return html.replace(_DYGRAPH_PAGE_TAG, f"<script>{js}</script>")
+    
+    def _inject_ready_signal(self, html: str) -> str:
+        """在页面末尾注入就绪标记，PNG截图时据此判断图表已绘制"""
+        if '__dygraphReady' in html:
+            return html
+        body_end = html.rfind('</body>')
+        if body_end == -1:
+            return html + _READY_SCRIPT
+        return html[:body_end] + _READY_SCRIPT + html[body_end:]
+    
+    def _get_driver(self, width: int, height: int):
+        """获取复用的headless Chrome实例，调用方需持有 self._driver_lock"""
+        if self._driver is None:
+            from selenium import webdriver
+            from selenium.webdriver.chrome.options import Options
+            
+            chrome_options = Options()
+            chrome_options.add_argument("--headless")
+            chrome_options.add_argument("--no-sandbox")
+            chrome_options.add_argument("--disable-gpu")
+            chrome_options.add_argument("--disable-dev-shm-usage")
+            chrome_options.add_argument(f"--window-size={width},{height}")
+            
+            logger.info("🚀 启动Dygraphs复用的headless Chrome...")
+            self._driver = webdriver.Chrome(options=chrome_options)
+        else:
+            self._driver.set_window_size(width, height)
+        return self._driver
+    
+    def _quit_driver(self):
+        """关闭复用的Chrome实例"""
+        driver, self._driver = self._driver, None
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception:
+                pass
     
     def _html_to_png(self, html_file: Path, output_file: Path, width: int, height: int):
         """将HTML转换为PNG"""
-        from selenium import webdriver
-        from selenium.webdriver.chrome.options import Options
+        from selenium.common.exceptions import TimeoutException, WebDriverException
+        from selenium.webdriver.support.ui import WebDriverWait
         
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument(f"--window-size={width},{height}")
+        with self._driver_lock:
+            driver = self._get_driver(width, height)
+            try:
+                driver.get(f"file://{html_file}")
+                try:
+                    WebDriverWait(driver, 10, poll_frequency=0.05).until(
+                        lambda d: d.execute_script("return !!window.__dygraphReady")
+                    )
+                except TimeoutException:
+                    logger.warning("⚠️ 等待Dygraphs图表就绪超时，直接截图")
+                driver.save_screenshot(str(output_file))
+            except WebDriverException:
+                # 浏览器异常时丢弃实例，下次调用重新启动
+                self._quit_driver()
+                raise
+    
+    async def render_batch(self, specs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        渲染多个相互独立的图表
         
-        driver = webdriver.Chrome(options=chrome_options)
-        try:
-            driver.get(f"file://{html_file}")
-            driver.set_window_size(width, height)
-            import time
-            time.sleep(2)  # 等待图表加载
-            driver.save_screenshot(str(output_file))
-        finally:
-            driver.quit() 
\ No newline at end of file
+        各图表交给基类线程池执行，Python代码仍按当前执行方式（默认由常驻工作进程）带超时执行，
+        不另外启动进程
+        
+        Args:
+            specs: 渲染参数列表，每项包含 code，可选 output_format/width/height
+            
+        Returns:
+            与specs顺序一致的渲染结果列表
+        """
+        if not specs:
+            return []
+        
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *(loop.run_in_executor(self.executor, self._render_spec, spec) for spec in specs),
+            return_exceptions=True
+        )
+        
+        return [
+            {"success": False, "error": f"批量渲染失败: {result}"} if isinstance(result, BaseException) else result
+            for result in results
+        ]
+    
+    def _render_spec(self, spec: Dict[str, Any]) -> Dict[str, Any]:
+        """按批量渲染参数渲染单个图表"""
+        return self._render_sync(
+            spec["code"],
+            spec.get("output_format", "html"),
+            spec.get("width", 800),
+            spec.get("height", 400)
+        )
+    
+    def close(self):
+        """释放常驻工作进程和复用的Chrome实例"""
+        if getattr(self, '_worker', None) is not None:
+            self._stop_worker()
+        if getattr(self, '_driver', None) is not None:
+            self._quit_driver()
+    
+    def __del__(self):
+        """析构函数，关闭常驻工作进程、Chrome实例和线程池"""
+        self.close()
+        super().__del__()
+
@@ -1,20 +1,203 @@
 # Copyright 2025 Google LLC
 # echarts渲染工具 - 完整实现
 
+import asyncio
+import functools
 import logging
 import os
+import re
+import shutil
+import string
 import tempfile
 import subprocess
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from pathlib import Path
 from typing import Dict, Any, Optional
 
 from google.genai import types
 from .base_render_tool import BaseRenderTool
+# Node.js/npm依赖检查结果的磁盘缓存，避免每次启动都派生多个node进程
+from ._dep_cache import _load_dep_cache, _save_dep_cache
+from ._executors import _exec_thread_pool
 
 logger = logging.getLogger(__name__)
 
- 
+# 配置校验优先使用orjson（C实现，解析大配置更快），未安装时回退到标准库
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# HTML输出的页面骨架，模块加载时构建一次，渲染时单次替换 ${title}/${width}/${height}/${config}
+_HTML_TEMPLATE = string.Template("""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>${title} - ECharts 图表</title>
+    <!-- 引入 ECharts 文件：本地优先，CDN备用，不阻塞页面解析 -->
+    <script>
+        const echartsSources = [
+            '/static/js/echarts.min.js',  // 本地资源（首选）
+            'https://cdn.jsdelivr.net/npm/echarts@5.6.0/dist/echarts.min.js'
+        ];
+        
+        // 加载Promise只创建一次；页面中已有echarts时直接复用
+        let echartsLoad = null;
+        
+        function loadEChartsWithFallback() {
+            if (typeof echarts !== 'undefined') {
+                return Promise.resolve(true);
+            }
+            if (!echartsLoad) {
+                echartsLoad = (async () => {
+                    for (const url of echartsSources) {
+                        try {
+                            const script = document.createElement('script');
+                            script.src = url;
+                            document.head.appendChild(script);
+                            await new Promise((resolve, reject) => {
+                                script.onload = resolve;
+                                script.onerror = reject;
+                                setTimeout(reject, url.startsWith('/static/') ? 2000 : 8000);
+                            });
+                            if (typeof echarts !== 'undefined') {
+                                return true;
+                            }
+                        } catch (e) {
+                            console.warn('ECharts加载失败: ' + url);
+                        }
+                    }
+                    return false;
+                })();
+            }
+            return echartsLoad;
+        }
+    </script>
+    <style>
+        body {
+            margin: 0;
+            padding: 20px;
+            font-family: Arial, sans-serif;
+            background-color: #f5f5f5;
+        }
+        .chart-container {
+            width: ${width}px;
+            height: ${height}px;
+            margin: 20px auto;
+            background-color: white;
+            border-radius: 8px;
+            box-shadow: 0 2px 8px rgba(0,0,0,0.1);
+            border: 1px solid #e1e1e1;
+        }
+        .chart-info {
+            text-align: center;
+            margin-bottom: 20px;
+            color: #666;
+        }
+    </style>
+</head>
+<body>
+    <div class="chart-info">
+        <h2>${title}</h2>
+        <p>使用 ECharts 生成的交互式图表</p>
+    </div>
+    
+    <!-- ECharts 图表容器 -->
+    <div id="chart" class="chart-container"></div>
+
+    <script type="text/javascript">
+        document.addEventListener('DOMContentLoaded', async function() {
+            if (!await loadEChartsWithFallback()) {
+                document.getElementById('chart').innerHTML =
+                    '<div style="text-align:center;padding:50px;color:#666;">ECharts库加载失败，请检查网络连接</div>';
+                return;
+            }
+            
+            // 基于准备好的dom，初始化echarts实例
+            var myChart = echarts.init(document.getElementById('chart'));
+
+            // 图表配置
+            var option = ${config};
+
+            // 使用刚指定的配置项和数据显示图表
+            myChart.setOption(option);
+
+            // 自适应屏幕
+            window.addEventListener('resize', function() {
+                myChart.resize();
+            });
+            
+            // 添加加载完成提示
+            console.log('ECharts图表已加载完成');
+        });
+    </script>
+</body>
+</html>""")
+
+
+# 项目根目录（node进程的工作目录，require从这里的node_modules解析），模块加载时解析为字符串
+_PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
+_NODE_MODULES_DIR = os.path.join(_PROJECT_ROOT, "node_modules")
+
+# PNG渲染依赖的npm包
+_REQUIRED_PACKAGES = {
+    'echarts': 'ECharts核心库',
+    'jsdom': 'DOM环境模拟'
+}
+_OPTIONAL_PACKAGES = {
+    'canvas': 'Node.js Canvas支持（可选，Windows需要C++环境）'
+}
+
+# PNG渲染方式：
+#   worker（默认）- 交给常驻的Node.js进程渲染（echarts/jsdom只加载一次）
+#   subprocess    - 每次渲染生成脚本并启动新的node进程
+_RENDER_MODE = os.getenv('ECHARTS_RENDER_MODE', 'worker')
+_RENDER_TIMEOUT = 60
+_NODE_WORKER_PATH = str(Path(__file__).resolve().with_name("_echarts_worker.js"))
+
+# 读取常驻进程响应的线程池，用于实现跨平台超时控制
+_IO_POOL = _exec_thread_pool("echarts-io")
+
+
+def _dep_cache_key() -> Optional[str]:
+    """依赖检查缓存键：node可执行文件及其修改时间、项目node_modules修改时间、NODE_PATH"""
+    node = shutil.which("node")
+    if node is None:
+        return None
+    try:
+        node_mtime = os.path.getmtime(node)
+        modules_mtime = os.path.getmtime(_NODE_MODULES_DIR) if os.path.exists(_NODE_MODULES_DIR) else 0
+    except OSError:
+        return None
+    return f"{node}|{node_mtime}|{modules_mtime}|{os.getenv('NODE_PATH', '')}"
+
+
+# Markdown代码块的开头（可带语言标识）和结尾标记
+_FENCE_RE = re.compile(r"\A```(?:javascript|json|js)?[ \t]*\n?|\n?[ \t]*```\Z")
+
+
+@functools.lru_cache(maxsize=256)
+def _preprocess_config_impl(config: str) -> str:
+    """预处理ECharts配置（按原始配置缓存结果，重复提交的配置跳过剥离和JSON解析）"""
+    # 移除代码块标记（开头的```语言标识和结尾的```一次替换完成）
+    config = _FENCE_RE.sub("", config.strip()).strip()
+    
+    # 尝试解析为JSON
+    try:
+        # 如果是JSON字符串，验证格式
+        _json_loads(config)
+        return config
+    except:
+        # 如果不是JSON，假设是JavaScript对象字面量
+        # 简单处理：确保它看起来像一个对象
+        if not config.startswith('{'):
+            config = '{' + config + '}'
+        return config
+
+
 class EChartsRenderTool(BaseRenderTool):
     """📈 Apache ECharts企业级图表渲染工具"""
     
@@ -26,6 +209,10 @@ class EChartsRenderTool(BaseRenderTool):
             default_format="html"
         )
         self._check_dependencies()
+        
+        # 常驻Node.js渲染进程，首次PNG渲染时启动
+        self._node_worker = None
+        self._node_worker_lock = threading.Lock()
     
     def _get_declaration(self) -> Optional[types.FunctionDeclaration]:
         """🔧 定义ECharts渲染工具的函数声明"""
@@ -107,30 +294,58 @@ class EChartsRenderTool(BaseRenderTool):
         """🔧 增强的ECharts依赖检查"""
         self._echarts_available = False
         self._node_available = False
+        self._canvas_available = False
         self._html_mode_available = True  # HTML模式始终可用
         
-        # 检查Node.js
-        self._check_nodejs()
+        # 24小时内且node/node_modules未变化时直接复用上次的检查结果
+        cache_key = _dep_cache_key()
+        cached = _load_dep_cache("echarts", cache_key) if cache_key else None
+        if cached is not None:
+            self._node_available = cached["node"]
+            self._echarts_available = cached["echarts"]
+            self._canvas_available = cached["canvas"]
+            logger.info(
+                f"✅ ECharts依赖检查（缓存）: Node.js={self._node_available}, "
+                f"echarts={self._echarts_available}, canvas={self._canvas_available}"
+            )
+            return
+        
+        # Node.js版本检查与npm包检查相互独立，并行执行（node不存在时包检查会直接失败）
+        with ThreadPoolExecutor(max_workers=2) as probe_pool:
+            installed_future = probe_pool.submit(self._check_npm_packages, [*_REQUIRED_PACKAGES, *_OPTIONAL_PACKAGES])
+            
+            # 检查Node.js
+            self._check_nodejs()
+            installed = installed_future.result()
         
         # 检查ECharts模块
         if self._node_available:
-            self._check_echarts_modules()
+            self._check_echarts_modules(installed)
         else:
             # 即使Node.js不可用，HTML模式仍然可用
             logger.info("✅ ECharts HTML模式可用（无需Node.js，使用CDN加载）")
+        
+        if cache_key:
+            _save_dep_cache("echarts", cache_key, {
+                "node": self._node_available,
+                "echarts": self._echarts_available,
+                "canvas": self._canvas_available
+            })
     
     def _check_nodejs(self):
         """检查Node.js环境"""
         try:
+            # 绝对路径 + close_fds=False 时，subprocess在Linux/macOS上改用posix_spawn启动子进程，
+            # 省去fork的开销（Python创建的文件描述符默认不可继承，不会泄漏给子进程）
             result = subprocess.run(
-                ["node", "--version"],
+                [shutil.which("node") or "node", "--version"],
                 capture_output=True,
-                text=True,
-                timeout=10
+                timeout=10,
+                close_fds=False
             )
             
             if result.returncode == 0:
-                version = result.stdout.strip()
+                version = result.stdout.decode('ascii', errors='replace').strip()
                 logger.info(f"✅ Node.js: {version}")
                 self._node_available = True
             else:
@@ -141,31 +356,22 @@ class EChartsRenderTool(BaseRenderTool):
             logger.warning(f"❌ Node.js检查失败: {e}")
             self._show_nodejs_installation_help()
     
-    def _check_echarts_modules(self):
-        """检查ECharts相关npm模块"""
-        required_packages = {
-            'echarts': 'ECharts核心库',
-            'jsdom': 'DOM环境模拟'
-        }
-        
-        optional_packages = {
-            'canvas': 'Node.js Canvas支持（可选，Windows需要C++环境）'
-        }
-        
+    def _check_echarts_modules(self, installed: Dict[str, bool]):
+        """根据npm包检查结果判断ECharts相关模块是否可用"""
         missing_packages = []
         self._canvas_available = False
         
         # 检查必需包
-        for package, desc in required_packages.items():
-            if self._check_npm_package(package):
+        for package, desc in _REQUIRED_PACKAGES.items():
+            if installed.get(package):
                 logger.info(f"✅ {package} ({desc}): 已安装")
             else:
                 logger.warning(f"❌ {package} ({desc}): 未安装")
                 missing_packages.append(package)
         
         # 检查可选包
-        for package, desc in optional_packages.items():
-            if self._check_npm_package(package):
+        for package, desc in _OPTIONAL_PACKAGES.items():
+            if installed.get(package):
                 logger.info(f"✅ {package} ({desc}): 已安装")
                 if package == 'canvas':
                     self._canvas_available = True
@@ -183,24 +389,27 @@ class EChartsRenderTool(BaseRenderTool):
                 logger.info("✅ ECharts渲染工具基础依赖检查通过（canvas可选包未安装，仅支持SVG输出）")
             self._echarts_available = True
     
-    def _check_npm_package(self, package_name: str) -> bool:
-        """检查npm包是否已安装"""
+    def _check_npm_packages(self, package_names: list) -> Dict[str, bool]:
+        """在一次Node.js调用中检查多个npm包是否已安装，返回 {包名: 是否可用}"""
+        script = (
+            "const r=n=>{try{require(n);return true}catch(e){return false}};"
+            f"process.stdout.write(JSON.stringify(Object.fromEntries({json.dumps(package_names)}.map(n=>[n,r(n)]))))"
+        )
         try:
-            # 获取项目根目录
-            project_root = Path(__file__).parent.parent
-            
             # 使用Node.js直接检查模块是否可用（在项目目录下运行）
             result = subprocess.run(
-                ["node", "-e", f"try {{ require('{package_name}'); process.exit(0); }} catch(e) {{ process.exit(1); }}"],
+                ["node", "-e", script],
                 capture_output=True,
-                text=True,
                 timeout=10,
-                cwd=str(project_root)  # 在项目根目录下运行
+                cwd=_PROJECT_ROOT  # 在项目根目录下运行
             )
-            return result.returncode == 0
+            if result.returncode == 0:
+                # json.loads可直接解析UTF-8字节
+                return json.loads(result.stdout)
+            logger.debug(f"检查npm包失败: {result.stderr.decode('utf-8', errors='replace')}")
         except Exception as e:
-            logger.debug(f"检查npm包 {package_name} 时出错: {e}")
-            return False
+            logger.debug(f"检查npm包 {', '.join(package_names)} 时出错: {e}")
+        return {name: False for name in package_names}
     
     def _show_nodejs_installation_help(self):
         """显示Node.js安装帮助"""
@@ -278,59 +487,25 @@ npm install {packages_str}
             theme = 'default'
             background_color = 'white'
             
-            # 在项目根目录创建脚本和输出文件
-            project_root = Path(__file__).parent.parent  # 项目根目录
-            
-            # 创建临时文件名（使用时间戳避免冲突）
-            import time
-            timestamp = str(int(time.time() * 1000))
-            script_file = project_root / f"temp_render_echarts_{timestamp}.js"
-            output_file = project_root / f"temp_output_{timestamp}.{output_format}"
+            if _RENDER_MODE == "worker":
+                return self._render_in_worker(config, output_format, width, height, theme, background_color)
             
             try:
-                # 生成Node.js渲染脚本
-                script_content = self._generate_render_script(config, output_file, output_format, width, height, theme, background_color)
-                script_file.write_text(script_content, encoding='utf-8')
+                # 生成Node.js渲染脚本，经stdin传入，图片经stdout取回，不落盘
+                script_content = self._generate_render_script(config, output_format, width, height, theme, background_color)
                 
                 logger.info(f"🚀 执行ECharts渲染...")
                 
-                # 执行Node.js脚本（在项目根目录下运行）
+                # 执行Node.js脚本（在项目根目录下运行，require从项目node_modules解析）
                 result = subprocess.run(
-                    ["node", str(script_file)],
+                    ["node", "-"],
+                    input=script_content.encode('utf-8'),
                     capture_output=True,
-                    text=True,
-                    timeout=60,
-                    cwd=str(project_root),  # 在项目根目录运行
-                    encoding='utf-8',
-                    errors='replace'
+                    timeout=_RENDER_TIMEOUT,
+                    cwd=_PROJECT_ROOT  # 在项目根目录运行
                 )
                 
-                if result.returncode != 0:
-                    return {
-                        "success": False,
-                        "error": f"Node.js脚本执行失败:\n{result.stderr}"
-                    }
-                
-                if not output_file.exists():
-                    return {
-                        "success": False,
-                        "error": "脚本执行完成但未生成图片文件"
-                    }
-                
-                image_bytes = output_file.read_bytes()
-                
-                if len(image_bytes) == 0:
-                    return {
-                        "success": False,
-                        "error": "生成的图片文件为空"
-                    }
-                
-                logger.info(f"✅ ECharts图表渲染成功，大小: {len(image_bytes)} bytes")
-                
-                return {
-                    "success": True,
-                    "data": image_bytes
-                }
+                return self._script_result(result.returncode, result.stdout, result.stderr)
                 
             except subprocess.TimeoutExpired:
                 return {
@@ -343,15 +518,6 @@ npm install {packages_str}
                     "success": False,
                     "error": f"渲染过程异常: {e}"
                 }
-            finally:
-                # 清理临时文件
-                try:
-                    if script_file.exists():
-                        script_file.unlink()
-                    if output_file.exists():
-                        output_file.unlink()
-                except:
-                    pass  # 忽略清理错误
                     
         except Exception as e:
             logger.error(f"❌ ECharts渲染初始化失败: {e}", exc_info=True)
@@ -360,8 +526,174 @@ npm install {packages_str}
                 "error": f"渲染初始化失败: {e}"
             }
     
-    def _generate_render_script(self, config: str, output_file: Path, output_format: str, width: int, height: int, theme: str, background_color: str) -> str:
-        """生成Node.js渲染脚本"""
+    def _script_result(self, returncode: int, stdout: bytes, stderr: bytes) -> Dict[str, Any]:
+        """把Node.js脚本的退出码和输出转换为渲染结果（stdout即图片数据）"""
+        if returncode != 0:
+            return {
+                "success": False,
+                "error": f"Node.js脚本执行失败:\n{stderr.decode('utf-8', errors='replace')}"
+            }
+        
+        if len(stdout) == 0:
+            return {
+                "success": False,
+                "error": "生成的图片文件为空"
+            }
+        
+        logger.info(f"✅ ECharts图表渲染成功，大小: {len(stdout)} bytes")
+        
+        return {
+            "success": True,
+            "data": stdout
+        }
+    
+    async def _render_async(self, code: str, output_format: str, width: int, height: int) -> Dict[str, Any]:
+        """
+        异步渲染ECharts图表
+        
+        子进程模式下的PNG渲染直接在事件循环中等待node进程，多个渲染并行执行，
+        不占用基类线程池（只有2个线程）；其余情况沿用基类的线程池路径
+        """
+        if output_format != 'png' or _RENDER_MODE != "subprocess" or not (self._node_available and self._echarts_available):
+            return await super()._render_async(code, output_format, width, height)
+        
+        try:
+            script_content = self._generate_render_script(code, output_format, width, height, 'default', 'white')
+            
+            logger.info(f"🚀 执行ECharts渲染...")
+            
+            proc = await asyncio.create_subprocess_exec(
+                "node", "-",
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=_PROJECT_ROOT  # 在项目根目录运行
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(
+                    proc.communicate(script_content.encode('utf-8')),
+                    timeout=_RENDER_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                return {
+                    "success": False,
+                    "error": "脚本执行超时（60秒），请检查配置复杂度"
+                }
+            
+            return self._script_result(proc.returncode, stdout, stderr)
+            
+        except Exception as e:
+            logger.error(f"❌ ECharts渲染过程中出现异常: {e}", exc_info=True)
+            return {
+                "success": False,
+                "error": f"渲染过程异常: {e}"
+            }
+    
+    def _ensure_node_worker(self) -> subprocess.Popen:
+        """获取常驻Node.js渲染进程，不存在或已退出时重新启动"""
+        if self._node_worker is None or self._node_worker.poll() is not None:
+            logger.info("🚀 启动ECharts常驻Node.js渲染进程...")
+            self._node_worker = subprocess.Popen(
+                ["node", _NODE_WORKER_PATH],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                cwd=_PROJECT_ROOT
+            )
+        return self._node_worker
+    
+    def _stop_node_worker(self):
+        """终止常驻Node.js渲染进程，下次渲染时会重新启动"""
+        worker, self._node_worker = self._node_worker, None
+        if worker is None or worker.poll() is not None:
+            return
+        worker.terminate()
+        try:
+            worker.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            worker.kill()
+    
+    @staticmethod
+    def _read_worker_response(worker: subprocess.Popen):
+        """读取一行JSON响应头及随后的图片数据，进程退出时返回 (None, b"")"""
+        line = worker.stdout.readline()
+        if not line:
+            return None, b""
+        header = json.loads(line)
+        if not header.get("ok"):
+            return header, b""
+        length = header.get("length", 0)
+        data = worker.stdout.read(length)
+        if len(data) < length:
+            return None, b""
+        return header, data
+    
+    def _render_in_worker(self, config: str, output_format: str, width: int, height: int, theme: str, background_color: str) -> Dict[str, Any]:
+        """通过常驻Node.js进程渲染，省去每次启动V8、加载echarts和jsdom的开销"""
+        request = json.dumps({
+            "config": self._preprocess_config(config),
+            "width": width,
+            "height": height,
+            "format": output_format,
+            "theme": theme,
+            "background": background_color
+        }, ensure_ascii=False)
+        
+        logger.info(f"🚀 执行ECharts渲染...")
+        
+        with self._node_worker_lock:
+            worker = self._ensure_node_worker()
+            try:
+                worker.stdin.write(request.encode('utf-8') + b"\n")
+                worker.stdin.flush()
+            except OSError as e:
+                self._stop_node_worker()
+                return {
+                    "success": False,
+                    "error": f"Node.js渲染进程通信失败: {e}"
+                }
+            
+            # 在线程中读取响应以实现跨平台超时（Windows上select不支持管道）
+            future = _IO_POOL.submit(self._read_worker_response, worker)
+            try:
+                header, image_bytes = future.result(timeout=_RENDER_TIMEOUT)
+            except FutureTimeoutError:
+                # 超时后终止渲染进程，阻塞的读取随之返回
+                self._stop_node_worker()
+                return {
+                    "success": False,
+                    "error": "脚本执行超时（60秒），请检查配置复杂度"
+                }
+            
+            if header is None:
+                self._stop_node_worker()
+                return {
+                    "success": False,
+                    "error": "Node.js渲染进程意外退出"
+                }
+        
+        if not header.get("ok"):
+            return {
+                "success": False,
+                "error": f"Node.js脚本执行失败:\n{header.get('err', '')}"
+            }
+        
+        if len(image_bytes) == 0:
+            return {
+                "success": False,
+                "error": "生成的图片文件为空"
+            }
+        
+        logger.info(f"✅ ECharts图表渲染成功，大小: {len(image_bytes)} bytes")
+        
+        return {
+            "success": True,
+            "data": image_bytes
+        }
+    
+    def _generate_render_script(self, config: str, output_format: str, width: int, height: int, theme: str, background_color: str) -> str:
+        """生成Node.js渲染脚本（图片写到stdout，日志写到stderr）"""
         
         # 预处理配置
         processed_config = self._preprocess_config(config)
@@ -370,7 +702,9 @@ npm install {packages_str}
         module_setup = """
 // 加载模块（从项目node_modules）
 const echarts = require('echarts');
-const fs = require('fs');
+
+// stdout只承载图片数据，日志统一写到stderr
+console.log = console.error;
 
 // 检查是否有canvas支持
 let createCanvas;
@@ -421,39 +755,35 @@ if (option.backgroundColor === undefined) {{
     option.backgroundColor = '{background_color}';
 }}
 
+// 服务端只取最终画面：关闭动画，setOption后图表已同步绘制完成
+if (option.animation === undefined) {{
+    option.animation = false;
+}}
+
 try {{
     // 设置配置并渲染
     chart.setOption(option);
     
-    // 等待渲染完成
-    setTimeout(() => {{
-        try {{
-            let buffer;
-            
-            if ('{output_format}' === 'svg' || !createCanvas) {{
-                // SVG输出
-                const svgStr = chart.renderToSVGString();
-                buffer = Buffer.from(svgStr, 'utf8');
-            }} else {{
-                // PNG输出（需要Canvas支持）
-                // 在Canvas模式下，chart.getDom()返回canvas元素
-                const canvas = chart.getDom();
-                if (canvas && typeof canvas.toBuffer === 'function') {{
-                    buffer = canvas.toBuffer('image/png');
-                }} else {{
-                    throw new Error('Canvas渲染失败，请尝试SVG格式');
-                }}
-            }}
-            
-            fs.writeFileSync('{output_file}', buffer);
-            console.log('ECharts图表渲染完成');
-            process.exit(0);
-        }} catch (error) {{
-            console.error('保存文件失败:', error);
-            process.exit(1);
+    let buffer;
+    if ('{output_format}' === 'svg' || !createCanvas) {{
+        // SVG输出
+        const svgStr = chart.renderToSVGString();
+        buffer = Buffer.from(svgStr, 'utf8');
+    }} else {{
+        // PNG输出（需要Canvas支持）
+        // 在Canvas模式下，chart.getDom()返回canvas元素
+        const canvas = chart.getDom();
+        if (canvas && typeof canvas.toBuffer === 'function') {{
+            buffer = canvas.toBuffer('image/png');
+        }} else {{
+            throw new Error('Canvas渲染失败，请尝试SVG格式');
         }}
-    }}, 100);
+    }}
     
+    process.stdout.write(buffer, () => {{
+        console.log('ECharts图表渲染完成');
+        process.exit(0);
+    }});
 }} catch (error) {{
     console.error('ECharts渲染失败:', error);
     process.exit(1);
@@ -464,32 +794,7 @@ try {{
     
     def _preprocess_config(self, config: str) -> str:
         """预处理ECharts配置"""
-        config = config.strip()
-        
-        # 移除代码块标记
-        if config.startswith("```javascript") or config.startswith("```js"):
-            config = config[config.index('\n')+1:]
-        elif config.startswith("```json"):
-            config = config[7:]
-        elif config.startswith("```"):
-            config = config[3:]
-        
-        if config.endswith("```"):
-            config = config[:-3]
-        
-        config = config.strip()
-        
-        # 尝试解析为JSON
-        try:
-            # 如果是JSON字符串，验证格式
-            json.loads(config)
-            return config
-        except:
-            # 如果不是JSON，假设是JavaScript对象字面量
-            # 简单处理：确保它看起来像一个对象
-            if not config.startswith('{'):
-                config = '{' + config + '}'
-            return config
+        return _preprocess_config_impl(config)
     
     def _generate_html_output(self, config: str, width: int, height: int) -> Dict[str, Any]:
         """生成HTML输出文件"""
@@ -500,65 +805,9 @@ try {{
             processed_config = self._preprocess_config(config)
             
             # 生成HTML内容
-            html_content = f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <title>{title} - ECharts 图表</title>
-    <!-- 引入 ECharts 文件 -->
-    <script src="https://cdn.jsdelivr.net/npm/echarts@5.6.0/dist/echarts.min.js"></script>
-    <style>
-        body {{
-            margin: 0;
-            padding: 20px;
-            font-family: Arial, sans-serif;
-            background-color: #f5f5f5;
-        }}
-        .chart-container {{
-            width: {width}px;
-            height: {height}px;
-            margin: 20px auto;
-            background-color: white;
-            border-radius: 8px;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-            border: 1px solid #e1e1e1;
-        }}
-        .chart-info {{
-            text-align: center;
-            margin-bottom: 20px;
-            color: #666;
-        }}
-    </style>
-</head>
-<body>
-    <div class="chart-info">
-        <h2>{title}</h2>
-        <p>使用 ECharts 生成的交互式图表</p>
-    </div>
-    
-    <!-- ECharts 图表容器 -->
-    <div id="chart" class="chart-container"></div>
-
-    <script type="text/javascript">
-        // 基于准备好的dom，初始化echarts实例
-        var myChart = echarts.init(document.getElementById('chart'));
-
-        // 图表配置
-        var option = {processed_config};
-
-        // 使用刚指定的配置项和数据显示图表
-        myChart.setOption(option);
-
-        // 自适应屏幕
-        window.addEventListener('resize', function() {{
-            myChart.resize();
-        }});
-        
-        // 添加加载完成提示
-        console.log('ECharts图表已加载完成');
-    </script>
-</body>
-</html>"""
+            html_content = _HTML_TEMPLATE.substitute(
+                title=title, width=width, height=height, config=processed_config
+            )
 
             # 直接返回HTML内容作为字节数据，让BaseRenderTool处理保存为Artifact
             logger.info(f"✅ ECharts HTML图表生成成功")
@@ -574,4 +823,14 @@ try {{
             return {
                 "success": False,
                 "error": f"生成HTML文件失败: {e}"
-            } 
\ No newline at end of file
+            } 
+    
+    def close(self):
+        """释放常驻Node.js渲染进程"""
+        if getattr(self, '_node_worker', None) is not None:
+            self._stop_node_worker()
+    
+    def __del__(self):
+        """析构函数，关闭常驻渲染进程和线程池"""
+        self.close()
+        super().__del__()
@@ -1,22 +1,166 @@
 # Copyright 2025 Google LLC
 # Folium渲染工具 - 地图可视化专家
 
+import asyncio
+import functools
+import hashlib
+import importlib.metadata
+import importlib.util
+import io
 import logging
+import os
 import tempfile
 import subprocess
 import sys
-from pathlib import Path
+import threading
+from concurrent.futures import Future
+from types import ModuleType
 from typing import Dict, Any, Optional
 
 from google.genai import types
 from .base_render_tool import BaseRenderTool
+from ._executors import _WorkerProcessPool, _exec_thread_pool, _trap_exit, _wait_result
 
 logger = logging.getLogger(__name__)
 
+# 地图代码执行方式：
+#   inprocess（默认）- 在当前解释器内exec，复用已导入的folium；超时的代码无法终止，会一直占着执行线程
+#   worker           - 交给常驻的工作进程池执行（folium只在工作进程启动时导入一次；
+#                      超时或中途退出的代码只终止执行它的工作进程，不影响服务进程）
+#   subprocess       - 每次渲染启动新的解释器（隔离不受信任的代码）
+_EXEC_MODE = os.getenv('FOLIUM_EXEC_MODE', 'inprocess')
+_EXEC_TIMEOUT = 120  # 地图渲染可能需要更长时间
+_TIMEOUT_ERROR = f"地图渲染超时（{_EXEC_TIMEOUT}秒）"
+_NO_MAP_ERROR = "未找到Folium Map对象，请确保代码中创建了folium.Map地图变量"
+
+# 子进程模式：用户的print输出改写到stderr，stdout只承载地图HTML
+_SUBPROCESS_HEADER = """
+import sys as _sys
+_html_out = _sys.stdout.buffer
+_sys.stdout = _sys.stderr
+"""
+
+_SUBPROCESS_SAVE_LOGIC = """
+# 输出地图HTML：取第一个Folium地图对象
+import folium as _folium
+target_map = next((v for v in list(globals().values()) if isinstance(v, _folium.Map)), None)
+if target_map is None:
+    raise ValueError("未找到Folium Map对象，请确保代码中创建了folium.Map地图变量")
+
+_html_out.write(target_map.get_root().render().encode('utf-8'))
+"""
+
+# PNG截图前的就绪判断：页面加载完成，所有Leaflet地图已初始化（whenReady）且没有瓦片图层仍在加载
+_MAP_READY_JS = """
+if (document.readyState !== 'complete') return false;
+if (typeof L === 'undefined') return true;
+return Object.values(window).filter(v => v instanceof L.Map).every(m => {
+    let ready = Boolean(m._loaded);
+    m.eachLayer(layer => {
+        if (typeof layer.isLoading === 'function' && layer.isLoading()) ready = false;
+    });
+    return ready;
+});
+"""
+
+# 进程内执行用户代码的线程池，用于实现超时控制
+_EXEC_POOL = _exec_thread_pool("folium-exec")
+
+# 后台导入自检的线程，与执行线程分开：超时未结束的进程内代码不会拖住自检和首次渲染
+_SELF_TEST_POOL = _exec_thread_pool("folium-selftest", max_workers=1)
+
+
+def _dist_version(name: str) -> str:
+    """从安装元数据读取包版本，不导入模块"""
+    try:
+        return importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        return '未知版本'
+
+
+def _render_cache_key(code: str, output_format: str, width: int, height: int) -> bytes:
+    """渲染结果缓存键：代码、格式和尺寸的摘要"""
+    return hashlib.blake2b(f"{output_format}|{width}|{height}|{code}".encode('utf-8'), digest_size=16).digest()
+
+
+def _subprocess_result(returncode: int, stdout: bytes, stderr: bytes) -> Dict[str, Any]:
+    """把子进程的退出码和输出转换为渲染结果，成功时 data 为地图HTML字节"""
+    if returncode != 0:
+        return {
+            "success": False,
+            "error": f"Python代码执行失败:\n{stderr.decode('utf-8', errors='replace')}"
+        }
+    
+    if not stdout:
+        return {
+            "success": False,
+            "error": "代码执行完成但未生成地图文件"
+        }
+    
+    return {"success": True, "data": stdout}
+
+
+def _timeout_error() -> Dict[str, Any]:
+    """地图渲染超时的错误结果"""
+    return {
+        "success": False,
+        "error": _TIMEOUT_ERROR,
+        "suggestion": "请简化地图复杂度或优化数据量"
+    }
+
+
+def _find_target_map(namespace: Dict[str, Any], map_type: type):
+    """在执行后的命名空间中查找第一个Folium地图对象"""
+    return next((value for value in namespace.values() if isinstance(value, map_type)), None)
+
+
+def _worker_init():
+    """工作进程初始化：启动时导入一次folium和pandas"""
+    import folium  # noqa: F401
+    if importlib.util.find_spec("pandas") is not None:
+        import pandas  # noqa: F401
+
+
+def _build_map_html(code: str) -> Optional[bytes]:
+    """
+    执行地图代码，返回第一个Folium地图对象的HTML字节，代码中没有地图对象时返回None
+    
+    进程内执行和工作进程共用
+    """
+    import folium
+    
+    namespace = ModuleType("__main__").__dict__
+    namespace["folium"] = folium
+    if importlib.util.find_spec("pandas") is not None:
+        import pandas as pd
+        namespace["pd"] = pd
+    
+    # 用户代码的print输出写入丢弃的缓冲区，避免污染服务日志
+    # （不替换全局sys.stdout：多个渲染并发时redirect_stdout的恢复顺序会错乱）
+    namespace["print"] = functools.partial(print, file=io.StringIO())
+    
+    # 用户代码的sys.exit()等转换为普通异常，作为渲染错误返回
+    with _trap_exit():
+        exec(compile(code, "<folium_code>", "exec"), namespace)
+    
+    target_map = _find_target_map(namespace, folium.Map)
+    if target_map is None:
+        return None
+    return target_map.get_root().render().encode('utf-8')
+
 
 class FoliumRenderTool(BaseRenderTool):
     """🗺️ Python Folium地图可视化渲染工具"""
     
+    # 渲染结果缓存的最大条目数（智能体重试或重复输出相同地图时直接返回）
+    _render_cache_max = 32
+    
+    # 依赖探测和自检结果在类上缓存，同一进程内多次实例化只探测一次（None表示尚未探测）
+    _folium_available: Optional[bool] = None
+    _png_support: Optional[bool] = None
+    _self_test_ok: Optional[bool] = None
+    _self_test: Optional[Future] = None
+    
     def __init__(self):
         super().__init__(
             name="render_folium",
@@ -25,6 +169,14 @@ class FoliumRenderTool(BaseRenderTool):
             default_format="html"
         )
         self._check_dependencies()
+        
+        # 复用的headless Chrome（首次PNG渲染时启动）
+        self._driver = None
+        self._driver_lock = threading.Lock()
+        self._chromedriver_path = None  # Selenium Manager不可用时由chromedriver_autoinstaller安装的驱动路径
+        
+        # 常驻工作进程池（worker模式首次渲染时启动）
+        self._workers = _WorkerProcessPool("Folium", _worker_init)
     
     def _get_declaration(self) -> Optional[types.FunctionDeclaration]:
         """🔧 定义Folium渲染工具的精确函数声明"""
@@ -81,11 +233,15 @@ class FoliumRenderTool(BaseRenderTool):
     
     def _check_dependencies(self):
         """🔧 Folium依赖检查"""
-        self._folium_available = False
+        cls = FoliumRenderTool
+        if cls._folium_available is not None:
+            return
+        
         missing_deps = []
-        available_deps = []
+        # 版本号要读取安装元数据，只在INFO日志实际输出时才读取
+        log_versions = logger.isEnabledFor(logging.INFO)
         
-        # 检查核心依赖
+        # 检查核心依赖（只定位模块、读取版本元数据，不执行导入）
         core_deps = {
             'folium': '地图可视化库',
             'pandas': '数据分析库（可选）',
@@ -93,37 +249,40 @@ class FoliumRenderTool(BaseRenderTool):
         }
         
         for dep_name, desc in core_deps.items():
-            try:
-                module = __import__(dep_name)
-                version = getattr(module, '__version__', '未知版本')
-                logger.info(f"✅ {dep_name} ({desc}): {version}")
-                available_deps.append(f"{dep_name}=={version}")
-            except ImportError:
-                logger.warning(f"❌ {dep_name} ({desc}): 未安装")
+            if importlib.util.find_spec(dep_name) is not None:
+                if log_versions:
+                    logger.info("✅ %s (%s): %s", dep_name, desc, _dist_version(dep_name))
+            else:
+                logger.warning("❌ %s (%s): 未安装", dep_name, desc)
                 if dep_name == 'folium':  # 只有folium是必需的
                     missing_deps.append(dep_name)
         
         # 检查PNG输出依赖（可选）
-        try:
-            import selenium
-            import chromedriver_autoinstaller
-            logger.info(f"✅ selenium (PNG输出支持): {selenium.__version__}")
-            self._png_support = True
-        except ImportError:
+        if importlib.util.find_spec('selenium') is not None:
+            if log_versions:
+                logger.info("✅ selenium (PNG输出支持): %s", _dist_version('selenium'))
+            cls._png_support = True
+        else:
             logger.info("ℹ️ selenium未安装，仅支持HTML输出")
-            self._png_support = False
+            cls._png_support = False
         
         if missing_deps:
-            logger.warning(f"🔧 缺少必需依赖: {', '.join(missing_deps)}")
-            logger.info(self._get_installation_guide(missing_deps))
-            self._folium_available = False
+            logger.warning("🔧 缺少必需依赖: %s", ', '.join(missing_deps))
+            if log_versions:
+                logger.info(self._get_installation_guide(missing_deps))
+            cls._folium_available = False
         else:
             logger.info("✅ Folium渲染工具核心依赖检查通过")
-            self._folium_available = True
-            self._test_folium_import()
+            cls._folium_available = True
+            # 导入folium需要数百毫秒，自检放到后台线程，构造时不阻塞；首次渲染前等待其完成
+            cls._self_test = _SELF_TEST_POOL.submit(self._test_folium_import)
     
     def _test_folium_import(self):
         """🔧 测试Folium导入"""
+        cls = FoliumRenderTool
+        if cls._self_test_ok is not None:
+            return
+        
         try:
             import folium
             
@@ -135,14 +294,107 @@ class FoliumRenderTool(BaseRenderTool):
                 logger.info("✅ Folium导入测试成功")
             else:
                 logger.warning("⚠️ Folium导入测试失败 - 生成空内容")
+            cls._self_test_ok = True
                 
         except Exception as e:
             logger.error(f"❌ Folium导入测试失败: {e}")
-            self._folium_available = False
+            cls._self_test_ok = False
+            cls._folium_available = False
     
     def _render_sync(self, code: str, output_format: str, width: int, height: int) -> Dict[str, Any]:
         """同步渲染Folium地图"""
         
+        # 自检可能把 _folium_available 置为False，先等后台自检完成
+        if self._self_test is not None:
+            self._self_test.result()
+        
+        error = self._check_render_support(output_format)
+        if error is not None:
+            return error
+        
+        cache_key = _render_cache_key(code, output_format, width, height)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return {"success": True, "data": cached}
+        
+        try:
+            logger.info(f"🚀 执行Folium地图渲染...")
+            
+            if _EXEC_MODE == "subprocess":
+                result = self._exec_in_subprocess(code)
+            elif _EXEC_MODE == "worker":
+                result = self._exec_in_worker(code)
+            else:
+                result = self._exec_user_code(code)
+            return self._finish_render(result, output_format, width, height, cache_key)
+            
+        except subprocess.TimeoutExpired:
+            return _timeout_error()
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"渲染过程发生错误: {str(e)}"
+            }
+    
+    async def _render_async(self, code: str, output_format: str, width: int, height: int) -> Dict[str, Any]:
+        """
+        异步渲染Folium地图
+        
+        子进程模式下直接在事件循环中等待Python子进程，多个地图并行执行，
+        不占用基类线程池（只有2个线程）；其余情况沿用基类的线程池路径
+        """
+        if _EXEC_MODE != "subprocess":
+            return await super()._render_async(code, output_format, width, height)
+        
+        if self._self_test is not None:
+            await asyncio.wrap_future(self._self_test)
+        
+        error = self._check_render_support(output_format)
+        if error is not None:
+            return error
+        
+        cache_key = _render_cache_key(code, output_format, width, height)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return {"success": True, "data": cached}
+        
+        try:
+            logger.info(f"🚀 执行Folium地图渲染...")
+            
+            proc = await asyncio.create_subprocess_exec(
+                sys.executable, '-',
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=tempfile.gettempdir()
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(
+                    proc.communicate(self._preprocess_code(code).encode('utf-8')),
+                    timeout=_EXEC_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                return _timeout_error()
+            
+            result = _subprocess_result(proc.returncode, stdout, stderr)
+            if output_format == "png" and result["success"]:
+                # 截图要等待浏览器，交给线程池
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(
+                    self.executor, self._finish_render, result, output_format, width, height, cache_key
+                )
+            return self._finish_render(result, output_format, width, height, cache_key)
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"渲染过程发生错误: {str(e)}"
+            }
+    
+    def _check_render_support(self, output_format: str) -> Optional[Dict[str, Any]]:
+        """检查当前环境能否渲染所需格式，不能时返回错误结果"""
         if not self._folium_available:
             missing_deps = ["folium"]
             return {
@@ -155,80 +407,85 @@ class FoliumRenderTool(BaseRenderTool):
         if output_format == "png" and not self._png_support:
             return {
                 "success": False,
-                "error": "PNG输出需要selenium和chromedriver",
-                "installation_guide": self._get_installation_guide(["selenium", "chromedriver-autoinstaller"]),
-                "suggestion": "请安装: pip install selenium chromedriver-autoinstaller 或使用HTML格式"
+                "error": "PNG输出需要selenium",
+                "installation_guide": self._get_installation_guide(["selenium"]),
+                "suggestion": "请安装: pip install selenium 或使用HTML格式"
             }
+        return None
+    
+    def _finish_render(self, result: Dict[str, Any], output_format: str, width: int, height: int, cache_key: bytes) -> Dict[str, Any]:
+        """由地图HTML生成最终输出（PNG时截图），成功的结果写入缓存"""
+        if not result["success"]:
+            return result
         
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            
-            try:
-                code_file = temp_path / "map_code.py"
-                output_file = temp_path / f"output.{output_format}"
-                
-                # 预处理代码
-                processed_code = self._preprocess_code(code, output_file, output_format, width, height)
-                code_file.write_text(processed_code, encoding='utf-8')
-                
-                logger.info(f"🚀 执行Folium地图渲染...")
-                
-                # 执行Python代码
-                result = subprocess.run(
-                    [sys.executable, str(code_file)],
-                    capture_output=True,
-                    text=True,
-                    timeout=120,  # 地图渲染可能需要更长时间
-                    cwd=temp_dir,
-                    encoding='utf-8',
-                    errors='replace'
-                )
-                
-                if result.returncode != 0:
-                    return {
-                        "success": False,
-                        "error": f"Python代码执行失败:\n{result.stderr}"
-                    }
-                
-                if not output_file.exists():
-                    return {
-                        "success": False,
-                        "error": "代码执行完成但未生成地图文件"
-                    }
-                
-                if output_format == "html":
-                    map_content = output_file.read_text(encoding='utf-8')
-                    map_bytes = map_content.encode('utf-8')
-                else:
-                    map_bytes = output_file.read_bytes()
-                
-                if len(map_bytes) == 0:
-                    return {
-                        "success": False,
-                        "error": "生成的地图文件为空"
-                    }
-                
-                logger.info(f"✅ Folium地图渲染成功，大小: {len(map_bytes)} bytes")
-                
-                return {
-                    "success": True,
-                    "data": map_bytes
-                }
-                
-            except subprocess.TimeoutExpired:
-                return {
-                    "success": False,
-                    "error": "地图渲染超时（120秒）",
-                    "suggestion": "请简化地图复杂度或优化数据量"
-                }
-            except Exception as e:
-                return {
-                    "success": False,
-                    "error": f"渲染过程发生错误: {str(e)}"
-                }
+        map_bytes = result["data"]
+        if output_format == "png":
+            map_bytes = self._render_png(map_bytes, width, height)
+        
+        if len(map_bytes) == 0:
+            return {
+                "success": False,
+                "error": "生成的地图文件为空"
+            }
+        
+        logger.info(f"✅ Folium地图渲染成功，大小: {len(map_bytes)} bytes")
+        
+        result = {
+            "success": True,
+            "data": map_bytes
+        }
+        self._cache_put(cache_key, result)
+        return result
+    
+    def _exec_user_code(self, code: str) -> Dict[str, Any]:
+        """在当前解释器中执行地图代码，省去启动Python进程和重复导入folium的开销；成功时 data 为地图HTML字节"""
+        future = _EXEC_POOL.submit(_build_map_html, code)
+        return self._map_result(_wait_result(future, _EXEC_TIMEOUT, _TIMEOUT_ERROR))
+    
+    def _exec_in_worker(self, code: str) -> Dict[str, Any]:
+        """通过常驻工作进程池执行地图代码；成功时 data 为地图HTML字节"""
+        return self._map_result(
+            self._workers.run(_build_map_html, code, timeout=_EXEC_TIMEOUT, timeout_error=_TIMEOUT_ERROR)
+        )
+    
+    @staticmethod
+    def _map_result(result: Dict[str, Any]) -> Dict[str, Any]:
+        """补充地图渲染的错误信息：超时附带建议，未找到地图对象时说明原因"""
+        if not result["success"]:
+            return _timeout_error() if result["error"] == _TIMEOUT_ERROR else result
+        if result["data"] is None:
+            return {
+                "success": False,
+                "error": _NO_MAP_ERROR
+            }
+        return result
     
-    def _preprocess_code(self, code: str, output_file: Path, output_format: str, width: int, height: int) -> str:
-        """预处理Folium代码"""
+    def _exec_in_subprocess(self, code: str) -> Dict[str, Any]:
+        """在新的Python进程中执行地图代码；成功时 data 为地图HTML字节"""
+        processed_code = self._preprocess_code(code)
+        
+        # 代码经stdin传入，HTML经stdout取回，不再需要临时文件
+        result = subprocess.run(
+            [sys.executable, '-'],
+            input=processed_code.encode('utf-8'),
+            capture_output=True,
+            timeout=_EXEC_TIMEOUT,
+            cwd=tempfile.gettempdir()
+        )
+        
+        return _subprocess_result(result.returncode, result.stdout, result.stderr)
+    
+    def _render_png(self, html_bytes: bytes, width: int, height: int) -> bytes:
+        """用复用的Chrome把地图HTML截图为PNG（Chrome需要file:// 地址，只落盘这一个HTML文件）"""
+        with tempfile.NamedTemporaryFile(suffix='.html', delete=False) as html_file:
+            html_file.write(html_bytes)
+        try:
+            return self._html_to_png(html_file.name, width, height)
+        finally:
+            os.unlink(html_file.name)
+    
+    def _preprocess_code(self, code: str) -> str:
+        """预处理Folium代码（子进程模式）"""
         
         # 确保有folium导入
         if 'import folium' not in code and 'from folium' not in code:
@@ -236,107 +493,92 @@ class FoliumRenderTool(BaseRenderTool):
         else:
             imports = ""
         
-        # 创建输出逻辑
-        if output_format == "html":
-            save_logic = f"""
-# 保存地图为HTML
-if 'map' in locals() or 'map' in globals():
-    target_map = map if 'map' in locals() else globals()['map']
-elif 'm' in locals() or 'm' in globals():
-    target_map = m if 'm' in locals() else globals()['m']
-else:
-    # 尝试找到Folium地图对象
-    import folium
-    target_map = None
-    for var_name, var_value in list(locals().items()):
-        if isinstance(var_value, folium.Map):
-            target_map = var_value
-            break
-    if target_map is None:
-        for var_name, var_value in globals().items():
-            if isinstance(var_value, folium.Map):
-                target_map = var_value
-                break
-    
-    if target_map is None:
-        raise ValueError("未找到Folium Map对象，请确保代码中创建了地图变量（建议命名为'map'或'm'）")
-
-target_map.save(r"{output_file}")
-"""
-        else:  # PNG format
-            save_logic = f"""
-# 保存地图为PNG (需要selenium)
-if 'map' in locals() or 'map' in globals():
-    target_map = map if 'map' in locals() else globals()['map']
-elif 'm' in locals() or 'm' in globals():
-    target_map = m if 'm' in locals() else globals()['m']
-else:
-    import folium
-    target_map = None
-    for var_name, var_value in list(locals().items()):
-        if isinstance(var_value, folium.Map):
-            target_map = var_value
-            break
-    if target_map is None:
-        for var_name, var_value in globals().items():
-            if isinstance(var_value, folium.Map):
-                target_map = var_value
-                break
-    
-    if target_map is None:
-        raise ValueError("未找到Folium Map对象")
-
-# 临时保存为HTML，然后转换为PNG
-import tempfile
-import os
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-import chromedriver_autoinstaller
-
-# 自动安装chromedriver
-chromedriver_autoinstaller.install()
-
-# 保存为临时HTML
-temp_html = os.path.join(os.path.dirname(r"{output_file}"), "temp_map.html")
-target_map.save(temp_html)
-
-# 配置Chrome选项
-chrome_options = Options()
-chrome_options.add_argument("--headless")
-chrome_options.add_argument("--no-sandbox")
-chrome_options.add_argument("--disable-dev-shm-usage")
-chrome_options.add_argument(f"--window-size={width},{height}")
-
-# 截图保存为PNG
-driver = webdriver.Chrome(options=chrome_options)
-try:
-    driver.get(f"file://{temp_html}")
-    driver.set_window_size(width, height)
-    import time
-    time.sleep(3)  # 等待地图加载
-    driver.save_screenshot(r"{output_file}")
-finally:
-    driver.quit()
-    os.remove(temp_html)
-"""
-        
         processed_code = f"""
+{_SUBPROCESS_HEADER}
 {imports}
 
 # 用户代码
-{self._indent_code(code)}
+{code.strip()}
 
 # 自动保存逻辑
-{save_logic}
+{_SUBPROCESS_SAVE_LOGIC}
 """
         return processed_code
     
-    def _indent_code(self, code: str) -> str:
-        """为代码添加缩进"""
-        lines = code.strip().split('\n')
-        indented_lines = [line for line in lines if line.strip()]
-        return '\n'.join(indented_lines)
-
+    def _get_driver(self, width: int, height: int):
+        """获取复用的headless Chrome实例，调用方需持有 self._driver_lock"""
+        if self._driver is None:
+            from selenium import webdriver
+            from selenium.webdriver.chrome.options import Options
+            from selenium.webdriver.chrome.service import Service
+            
+            chrome_options = Options()
+            chrome_options.add_argument("--headless=new")
+            chrome_options.add_argument("--no-sandbox")
+            chrome_options.add_argument("--disable-dev-shm-usage")
+            chrome_options.add_argument(f"--window-size={width},{height}")
+            
+            logger.info("🚀 启动Folium复用的headless Chrome...")
+            if self._chromedriver_path is not None:
+                self._driver = webdriver.Chrome(service=Service(executable_path=self._chromedriver_path), options=chrome_options)
+            else:
+                try:
+                    # Selenium 4.6+ 自带的Selenium Manager会自动解析并缓存chromedriver
+                    self._driver = webdriver.Chrome(options=chrome_options)
+                except Exception as e:
+                    if importlib.util.find_spec("chromedriver_autoinstaller") is None:
+                        raise
+                    # 回退到chromedriver_autoinstaller，只安装一次并记住路径
+                    import chromedriver_autoinstaller
+                    logger.warning(f"⚠️ Selenium Manager启动Chrome失败，改用chromedriver_autoinstaller: {e}")
+                    self._chromedriver_path = chromedriver_autoinstaller.install()
+                    self._driver = webdriver.Chrome(service=Service(executable_path=self._chromedriver_path), options=chrome_options)
+        else:
+            self._driver.set_window_size(width, height)
+        return self._driver
+    
+    def _quit_driver(self):
+        """关闭复用的Chrome实例"""
+        driver, self._driver = self._driver, None
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+    
+    def _html_to_png(self, html_file: str, width: int, height: int) -> bytes:
+        """将地图HTML截图为PNG字节"""
+        from selenium.common.exceptions import TimeoutException, WebDriverException
+        from selenium.webdriver.support.ui import WebDriverWait
+        
+        with self._driver_lock:
+            driver = self._get_driver(width, height)
+            try:
+                driver.get(f"file://{html_file}")
+                try:
+                    WebDriverWait(driver, 15, poll_frequency=0.05).until(
+                        lambda d: d.execute_script(_MAP_READY_JS)
+                    )
+                except TimeoutException:
+                    logger.warning("⚠️ 等待地图加载超时，直接截图")
+                return driver.get_screenshot_as_png()
+            except WebDriverException:
+                # 浏览器异常（如会话失效）时丢弃实例，下次调用重新启动
+                self._quit_driver()
+                raise
+    
+    def close(self):
+        """释放复用的Chrome实例和常驻工作进程池"""
+        if getattr(self, '_driver', None) is not None:
+            self._quit_driver()
+        if getattr(self, '_workers', None) is not None:
+            self._workers.stop()
+    
+    def __del__(self):
+        """析构函数，关闭Chrome实例、工作进程池和线程池"""
+        self.close()
+        super().__del__()
+    
     def _get_installation_guide(self, missing_deps):
         """获取安装指导"""
         if not missing_deps:
@@ -353,7 +595,7 @@ finally:
             base_guide += "# 地理数据支持（可选）\n"
             base_guide += "pip install geopandas\n\n"
             base_guide += "# PNG输出支持（可选）\n"
-            base_guide += "pip install selenium chromedriver-autoinstaller\n"
+            base_guide += "pip install selenium\n"
             base_guide += "```\n"
         
         return base_guide 
\ No newline at end of file
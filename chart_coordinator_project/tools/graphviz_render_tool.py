@@ -23,14 +23,18 @@ Graphviz渲染工具
 - 多种输出格式（PNG、SVG、PDF、DOT）
 """
 
+import asyncio
+import functools
+import hashlib
 import logging
 import subprocess
-import tempfile
 import os
 import shutil
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
 import re
 import platform
+import weakref
 
 try:
     import graphviz
@@ -43,6 +47,113 @@ from .base_render_tool import BaseRenderTool
 
 logger = logging.getLogger(__name__)
 
+# DOT代码预处理用的正则，模块加载时编译一次
+_GRAPH_HEADER_RE = re.compile(r'^\s*(strict\s+)?(graph|digraph)', re.IGNORECASE)
+_FONTNAME_RE = re.compile(r'fontname\s*=\s*(["\']).*?\1', re.IGNORECASE)
+_FONTNAME_KEY_RE = re.compile(r'fontname', re.IGNORECASE)
+_FONTNAME_VALUE_RE = re.compile(r'fontname\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s,;\]]+))', re.IGNORECASE)
+_EMPTY_ATTR_RE = re.compile(r'\[\s*,')
+_DOUBLE_COMMA_RE = re.compile(r',\s*,')
+_TRAIL_COMMA_RE = re.compile(r',\s*\]')
+
+# 批量渲染用的线程池：实际渲染在dot子进程中完成，线程只负责等待，多个图形可同时占满各个CPU核心
+_BATCH_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix="graphviz-batch")
+
+# Windows标准安装路径
+_WINDOWS_DOT_PATHS = (
+    r"C:\Program Files\Graphviz\bin\dot.exe",
+    r"C:\Program Files (x86)\Graphviz\bin\dot.exe",
+)
+
+
+# 适合当前操作系统的中文字体，模块加载时判断一次：
+# Windows上微软雅黑最常见且效果好，macOS上苹方是标准选择，Linux上文泉驿微米黑是常见的开源中文字体
+_SYSTEM = platform.system()
+_CJK_FONT = {"Windows": "Microsoft YaHei", "Darwin": "PingFang SC"}.get(_SYSTEM, "WenQuanYi Micro Hei")
+
+# 注入到DOT代码首个'{'之后的全局字体设置
+_FONT_ATTRIBUTES = f'''
+    // Injected by ADK to support Chinese characters
+    graph [fontname="{_CJK_FONT}"];
+    node [fontname="{_CJK_FONT}"];
+    edge [fontname="{_CJK_FONT}"];
+'''
+
+# 通过命令行为图、节点、边统一指定中文字体的dot参数
+_FONT_FLAGS = (f'-Gfontname={_CJK_FONT}', f'-Nfontname={_CJK_FONT}', f'-Efontname={_CJK_FONT}')
+
+# 匹配图级 graph/node/edge [fontname="字体"] 声明
+_GLOBAL_FONT_RE = re.compile(r'\b(graph|node|edge)\s*\[\s*fontname\s*=\s*"?' + re.escape(_CJK_FONT) + r'"?\s*\]', re.IGNORECASE)
+
+
+# 异步渲染时同时运行的dot进程数上限（按事件循环分别创建）
+_DOT_SEMAPHORES = weakref.WeakKeyDictionary()
+
+
+def _dot_semaphore() -> asyncio.Semaphore:
+    """当前事件循环的dot并发信号量"""
+    loop = asyncio.get_running_loop()
+    semaphore = _DOT_SEMAPHORES.get(loop)
+    if semaphore is None:
+        semaphore = _DOT_SEMAPHORES[loop] = asyncio.Semaphore(os.cpu_count() or 4)
+    return semaphore
+
+
+def _render_cache_key(code: str, output_format: str) -> bytes:
+    """渲染结果缓存键：预处理只依赖代码本身，按原始代码建键，命中时连预处理和校验也一并省去"""
+    return hashlib.blake2b(f"{output_format}|{code}".encode('utf-8'), digest_size=16).digest()
+
+
+def _dot_result(returncode: int, stdout: bytes, stderr: bytes) -> Dict[str, Any]:
+    """把dot进程的退出码和输出转换为渲染结果"""
+    if returncode != 0:
+        return {
+            "success": False,
+            "error": f"Graphviz渲染失败: {stderr.decode('utf-8', errors='replace')}"
+        }
+    
+    if not stdout:
+        return {
+            "success": False,
+            "error": "Graphviz未输出任何内容"
+        }
+    
+    return {
+        "success": True,
+        "data": stdout
+    }
+
+
+def _uses_only_font(code: str) -> bool:
+    """代码中的fontname是否全部为所选中文字体，且graph/node/edge三者都已在图级声明该字体"""
+    for match in _FONTNAME_VALUE_RE.finditer(code):
+        if next(value for value in match.groups() if value is not None) != _CJK_FONT:
+            return False
+    declared = {match.group(1).lower() for match in _GLOBAL_FONT_RE.finditer(code)}
+    return declared == {'graph', 'node', 'edge'}
+
+
+@functools.lru_cache(maxsize=1)
+def _find_graphviz_executable() -> Optional[str]:
+    """
+    查找Graphviz的dot可执行文件（进程内只查找一次）
+    优先检查Windows标准安装路径，然后检查PATH；其他布局引擎通过 dot -K 调用
+    """
+    # 首先检查Windows标准路径
+    for path in _WINDOWS_DOT_PATHS:
+        if os.path.exists(path):
+            logger.info(f"找到Graphviz: {path}")
+            return path
+    
+    # 然后检查PATH中的可执行文件
+    found_path = shutil.which('dot')
+    if found_path:
+        logger.info(f"在PATH中找到Graphviz: {found_path}")
+        return found_path
+    
+    logger.warning("未找到Graphviz可执行文件")
+    return None
+
  
 class GraphvizRenderTool(BaseRenderTool):
     """
@@ -65,6 +176,15 @@ class GraphvizRenderTool(BaseRenderTool):
         'circo': '圆形布局，适合循环结构'
     }
     
+    # 渲染结果缓存的最大条目数（智能体重试或重复输出相同图形时直接返回）
+    _render_cache_max = 64
+    
+    # 依赖检查结果在类上缓存，同一进程内多次实例化只检查一次（None表示尚未检查）
+    _python_lib_available: Optional[bool] = None
+    _cli_available: Optional[bool] = None
+    _graphviz_available: Optional[bool] = None
+    graphviz_executable: Optional[str] = None
+    
     def __init__(self):
         super().__init__(
             name="graphviz_render",
@@ -76,35 +196,39 @@ class GraphvizRenderTool(BaseRenderTool):
     
     def _check_dependencies(self):
         """检查Graphviz依赖是否已安装"""
+        cls = GraphvizRenderTool
+        if cls._graphviz_available is not None:
+            return
+        
         try:
             # 检查Python库
             if GRAPHVIZ_AVAILABLE:
                 import graphviz
                 logger.info(f"✅ graphviz Python库版本: {graphviz.__version__}")
-                self._python_lib_available = True
+                cls._python_lib_available = True
             else:
                 logger.warning("❌ graphviz Python库未安装")
-                self._python_lib_available = False
+                cls._python_lib_available = False
             
             # 检查命令行工具
-            self.graphviz_executable = self._find_graphviz_executable()
-            if self.graphviz_executable:
-                logger.info(f"✅ Graphviz可执行文件: {self.graphviz_executable}")
-                self._cli_available = True
+            cls.graphviz_executable = _find_graphviz_executable()
+            if cls.graphviz_executable:
+                logger.info(f"✅ Graphviz可执行文件: {cls.graphviz_executable}")
+                cls._cli_available = True
             else:
                 logger.warning("❌ Graphviz命令行工具未找到")
-                self._cli_available = False
+                cls._cli_available = False
                 
             # 至少需要其中一种方式可用
-            self._graphviz_available = self._python_lib_available or self._cli_available
-            if not self._graphviz_available:
+            cls._graphviz_available = cls._python_lib_available or cls._cli_available
+            if not cls._graphviz_available:
                 logger.error("❌ Graphviz不可用，请安装：pip install graphviz 或安装Graphviz软件包")
                 
         except Exception as e:
             logger.warning(f"❌ Graphviz依赖检查失败: {e}")
-            self._python_lib_available = False
-            self._cli_available = False
-            self._graphviz_available = False
+            cls._python_lib_available = False
+            cls._cli_available = False
+            cls._graphviz_available = False
     
     def _get_declaration(self) -> Optional[types.FunctionDeclaration]:
         """
@@ -205,8 +329,102 @@ class GraphvizRenderTool(BaseRenderTool):
                     output_format: str, 
                     width: int, 
                     height: int) -> Dict[str, Any]:
+        """同步渲染Graphviz图形，相同代码和格式的结果直接从缓存返回"""
+        cache_key = _render_cache_key(code, output_format)
+        data = self._cache_get(cache_key)
+        if data is not None:
+            return {"success": True, "data": data}
+        
+        result = self._render_graph(code, output_format, width, height)
+        self._cache_put(cache_key, result)
+        return result
+    
+    async def _render_async(self, 
+                           code: str, 
+                           output_format: str, 
+                           width: int, 
+                           height: int) -> Dict[str, Any]:
+        """
+        异步渲染Graphviz图形
+        
+        找到dot可执行文件时直接在事件循环中等待dot子进程，多个图形并行渲染（并发数不超过CPU核数），
+        不占用基类线程池（只有2个线程）；否则沿用基类的线程池路径
         """
-        同步渲染Graphviz图形
+        if not self.graphviz_executable:
+            return await super()._render_async(code, output_format, width, height)
+        
+        cache_key = _render_cache_key(code, output_format)
+        data = self._cache_get(cache_key)
+        if data is not None:
+            return {"success": True, "data": data}
+        
+        try:
+            # 两条命令都由本工具构建，字体通过 -G/-N/-E 参数指定，无需改写DOT代码
+            processed_code, error = self._prepare_dot_code(code, inject_fonts=False)
+            if error is not None:
+                return error
+            
+            # 与同步路径相同的策略：先按graphviz Python库的命令行（-K指定引擎）渲染，失败再回退到命令行工具的参数
+            result = None
+            if self._python_lib_available:
+                result = await self._run_dot_async(self._python_lib_command(processed_code, output_format), processed_code)
+                if not result["success"]:
+                    logger.warning(f"Python库渲染失败，回退到命令行: {result.get('error')}")
+            if result is None or not result["success"]:
+                result = await self._run_dot_async(self._command_line_command(output_format), processed_code)
+            
+            self._cache_put(cache_key, result)
+            return result
+            
+        except Exception as e:
+            logger.error(f"Graphviz渲染失败: {e}", exc_info=True)
+            return {
+                "success": False,
+                "error": f"Graphviz渲染异常: {e}"
+            }
+    
+    async def _run_dot_async(self, cmd: List[str], processed_code: str) -> Dict[str, Any]:
+        """异步执行dot：DOT代码经stdin传入，结果从stdout取回"""
+        async with _dot_semaphore():
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(
+                    proc.communicate(processed_code.encode('utf-8')),
+                    timeout=30
+                )
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                return {
+                    "success": False,
+                    "error": "Graphviz渲染超时（30秒）"
+                }
+        return _dot_result(proc.returncode, stdout, stderr)
+    
+    def _prepare_dot_code(self, code: str, inject_fonts: bool = True):
+        """预处理并校验DOT代码，返回 (处理后的代码, 错误结果)，校验通过时错误结果为None"""
+        processed_code = self._preprocess_dot_code(code, inject_fonts)
+        
+        validation_result = self._validate_dot_syntax(processed_code)
+        if not validation_result["valid"]:
+            return processed_code, {
+                "success": False,
+                "error": f"DOT语法错误: {validation_result['error']}"
+            }
+        return processed_code, None
+    
+    def _render_graph(self, 
+                     code: str, 
+                     output_format: str, 
+                     width: int, 
+                     height: int) -> Dict[str, Any]:
+        """
+        渲染Graphviz图形
         
         渲染策略：
         1. 优先使用graphviz Python库
@@ -215,16 +433,10 @@ class GraphvizRenderTool(BaseRenderTool):
         4. 支持多种布局引擎
         """
         try:
-            # 预处理DOT代码
-            processed_code = self._preprocess_dot_code(code)
-            
-            # 验证DOT语法
-            validation_result = self._validate_dot_syntax(processed_code)
-            if not validation_result["valid"]:
-                return {
-                    "success": False,
-                    "error": f"DOT语法错误: {validation_result['error']}"
-                }
+            # 预处理并验证DOT代码；graphviz Python库无法附加命令行参数，只有这条路径需要把字体写进代码
+            processed_code, error = self._prepare_dot_code(code, inject_fonts=self._python_lib_available)
+            if error is not None:
+                return error
             
             # 尝试使用Python库渲染
             if self._python_lib_available:
@@ -251,58 +463,44 @@ class GraphvizRenderTool(BaseRenderTool):
                 "error": f"Graphviz渲染异常: {e}"
             }
     
-    def _preprocess_dot_code(self, code: str) -> str:
+    def _preprocess_dot_code(self, code: str, inject_fonts: bool = True) -> str:
         """
         预处理DOT代码
         - 自动添加图形声明（如果缺少）
         - 清理多余的空白
-        - 强制注入全局中文字体设置以解决中文乱码问题
+        - 强制注入全局中文字体设置以解决中文乱码问题（inject_fonts为False时只移除已有字体，
+          由命令行的 -Gfontname/-Nfontname/-Efontname 参数指定字体）
         """
         code = code.strip()
 
         # 1. 自动添加图形声明（如果缺少）
-        if not re.match(r'^\s*(strict\s+)?(graph|digraph)', code, re.IGNORECASE):
+        if not _GRAPH_HEADER_RE.match(code):
             if '->' in code:
                 code = f'digraph G {{\n{code}\n}}'
             else:
                 code = f'graph G {{\n{code}\n}}'
         
         # 2. 移除所有已存在的fontname属性，避免AI模型指定不支持的字体
-        code = re.sub(r'fontname\s*=\s*".*?"', '', code, flags=re.IGNORECASE)
-        code = re.sub(r"fontname\s*=\s*'.*?'", '', code, flags=re.IGNORECASE)
-        # 清理可能留下的多余逗号或空格
-        code = re.sub(r'\[\s*,', '[', code)
-        code = re.sub(r',\s*,', ',', code)
-        code = re.sub(r',\s*\]', ']', code)
-
-        # 3. 选择适合当前操作系统的中文字体
-        system = platform.system()
-        if system == "Windows":
-            # 在Windows上，微软雅黑是最常见且效果好的中文字体
-            font_name = "Microsoft YaHei"
-        elif system == "Darwin":  # macOS
-            # 在macOS上，苹方是标准选择
-            font_name = "PingFang SC"
-        else:  # Linux
-            # 在Linux上，文泉驿微米黑是常见的开源中文字体
-            font_name = "WenQuanYi Micro Hei"
-        
-        logger.info(f"为Graphviz选择的中文字体: {font_name} (OS: {system})")
+        #    没有fontname时无需清理；已在图级统一声明了正确字体时原样返回
+        if _FONTNAME_KEY_RE.search(code):
+            if _uses_only_font(code):
+                logger.info("✅ DOT代码已声明全局中文字体，跳过字体注入。")
+                return code
+            code = _FONTNAME_RE.sub('', code)
+            # 清理可能留下的多余逗号或空格
+            code = _EMPTY_ATTR_RE.sub('[', code)
+            code = _DOUBLE_COMMA_RE.sub(',', code)
+            code = _TRAIL_COMMA_RE.sub(']', code)
 
-        # 4. 准备要注入的全局字体设置
-        font_attributes = f'''
-    // Injected by ADK to support Chinese characters
-    graph [fontname="{font_name}"];
-    node [fontname="{font_name}"];
-    edge [fontname="{font_name}"];
-'''
+        if not inject_fonts:
+            return code
 
-        # 5. 使用正则表达式找到第一个开括号'{'并注入属性
+        # 3. 找到第一个开括号'{'并注入属性
         # 这种方法比基于行的查找更可靠，能适应不同的代码格式
-        match = re.search(r'{', code)
-        if match:
-            insertion_point = match.end()
-            processed_code = code[:insertion_point] + font_attributes + code[insertion_point:]
+        brace_index = code.find('{')
+        if brace_index != -1:
+            insertion_point = brace_index + 1
+            processed_code = code[:insertion_point] + _FONT_ATTRIBUTES + code[insertion_point:]
             logger.info(f"✅ 成功为Graphviz注入全局中文字体设置。")
             return processed_code
         else:
@@ -320,7 +518,7 @@ class GraphvizRenderTool(BaseRenderTool):
             return {"valid": False, "error": "代码为空"}
         
         # 检查基本结构
-        if not (code.startswith('digraph') or code.startswith('graph') or code.startswith('strict')):
+        if not code.startswith(('digraph', 'graph', 'strict')):
             return {"valid": False, "error": "代码必须以digraph、graph或strict开头"}
         
         # 检查大括号配对
@@ -335,34 +533,6 @@ class GraphvizRenderTool(BaseRenderTool):
         
         return {"valid": True}
     
-    def _find_graphviz_executable(self) -> Optional[str]:
-        """
-        查找Graphviz可执行文件
-        优先检查Windows标准安装路径，然后检查PATH
-        """
-        # Windows标准安装路径
-        windows_paths = [
-            r"C:\Program Files\Graphviz\bin\dot.exe",
-            r"C:\Program Files (x86)\Graphviz\bin\dot.exe",
-        ]
-        
-        # 首先检查Windows标准路径
-        for path in windows_paths:
-            if os.path.exists(path):
-                logger.info(f"找到Graphviz: {path}")
-                return path
-        
-        # 然后检查PATH中的可执行文件
-        executables = ['dot', 'neato', 'fdp', 'sfdp', 'twopi', 'circo']
-        for executable in executables:
-            found_path = shutil.which(executable)
-            if found_path:
-                logger.info(f"在PATH中找到Graphviz: {found_path}")
-                return found_path
-        
-        logger.warning("未找到Graphviz可执行文件")
-        return None
-    
     def _render_with_python_lib(self, 
                                code: str, 
                                output_format: str, 
@@ -378,22 +548,13 @@ class GraphvizRenderTool(BaseRenderTool):
             else:
                 source = graphviz.Source(code, format=output_format, engine='neato')
             
-            # 渲染
-            with tempfile.TemporaryDirectory() as temp_dir:
-                output_path = source.render(
-                    filename='graph',
-                    directory=temp_dir,
-                    cleanup=True
-                )
-                
-                # 读取输出文件
-                with open(output_path, 'rb') as f:
-                    data = f.read()
-                
-                return {
-                    "success": True,
-                    "data": data
-                }
+            # 直接从引擎的stdout取回结果，不经过临时文件
+            data = source.pipe()
+            
+            return {
+                "success": True,
+                "data": data
+            }
                 
         except graphviz.CalledProcessError as e:
             return {
@@ -406,6 +567,24 @@ class GraphvizRenderTool(BaseRenderTool):
                 "error": f"Python库渲染失败: {e}"
             }
     
+    def _python_lib_command(self, code: str, output_format: str) -> List[str]:
+        """与graphviz Python库 Source.pipe 等价的命令行：有向图用dot引擎，其余用neato"""
+        engine = 'dot' if code.strip().startswith('digraph') else 'neato'
+        return [self.graphviz_executable, f'-K{engine}', f'-T{output_format}', *_FONT_FLAGS]
+    
+    def _command_line_command(self, output_format: str) -> List[str]:
+        """命令行工具渲染使用的命令"""
+        cmd = [
+            self.graphviz_executable,
+            f'-T{output_format}',
+            *_FONT_FLAGS
+        ]
+        
+        # 添加DPI设置（对位图格式）
+        if output_format in ['png', 'jpg', 'jpeg']:
+            cmd.insert(1, f'-Gdpi=96')
+        return cmd
+    
     def _render_with_command_line(self, 
                                 code: str, 
                                 output_format: str, 
@@ -415,80 +594,27 @@ class GraphvizRenderTool(BaseRenderTool):
         使用Graphviz命令行工具渲染
         """
         try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # 写入DOT文件
-                input_file = os.path.join(temp_dir, "graph.dot")
-                with open(input_file, 'w', encoding='utf-8') as f:
-                    f.write(code)
-                
-                # 确定输出文件
-                output_file = os.path.join(temp_dir, f"graph.{output_format}")
-                
-                # 决定使用哪个可执行文件
-                executable = self.graphviz_executable or 'dot'
-                
-                # 如果是完整路径，直接使用
-                if os.path.isabs(executable) or executable.endswith('.exe'):
-                    dot_cmd = executable
-                else:
-                    # 尝试在PATH中查找
-                    dot_cmd = shutil.which(executable)
-                    if not dot_cmd:
-                        # 尝试Windows完整路径
-                        windows_path = r"C:\Program Files\Graphviz\bin\dot.exe"
-                        if os.path.exists(windows_path):
-                            dot_cmd = windows_path
-                        else:
-                            return {
-                                "success": False,
-                                "error": f"找不到Graphviz可执行文件: {executable}"
-                            }
-                
-                # 构建命令
-                cmd = [
-                    dot_cmd,
-                    f'-T{output_format}',
-                    f'-o{output_file}',
-                    input_file
-                ]
-                
-                # 添加DPI设置（对位图格式）
-                if output_format in ['png', 'jpg', 'jpeg']:
-                    cmd.insert(1, f'-Gdpi=96')
-                
-                logger.info(f"执行命令: {' '.join(cmd)}")
-                
-                # 执行渲染
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=30,
-                    encoding='utf-8',
-                    errors='replace'
-                )
-                
-                if result.returncode != 0:
-                    return {
-                        "success": False,
-                        "error": f"Graphviz渲染失败: {result.stderr}"
-                    }
-                
-                # 检查输出文件
-                if not os.path.exists(output_file):
-                    return {
-                        "success": False,
-                        "error": f"输出文件未生成: {output_file}"
-                    }
-                
-                # 读取输出文件
-                with open(output_file, 'rb') as f:
-                    data = f.read()
-                
+            # 使用构造时找到的可执行文件
+            if not self.graphviz_executable:
                 return {
-                    "success": True,
-                    "data": data
+                    "success": False,
+                    "error": "找不到Graphviz可执行文件: dot"
                 }
+            
+            # 构建命令：DOT代码经stdin传入，结果从stdout取回
+            cmd = self._command_line_command(output_format)
+            
+            logger.info(f"执行命令: {' '.join(cmd)}")
+            
+            # 执行渲染
+            result = subprocess.run(
+                cmd,
+                input=code.encode('utf-8'),
+                capture_output=True,
+                timeout=30
+            )
+            
+            return _dot_result(result.returncode, result.stdout, result.stderr)
                 
         except subprocess.TimeoutExpired:
             return {
@@ -501,6 +627,37 @@ class GraphvizRenderTool(BaseRenderTool):
                 "error": f"命令行渲染失败: {e}"
             }
     
+    async def render_batch(self, specs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        并行渲染多个相互独立的图形
+        
+        Args:
+            specs: 渲染参数列表，每项包含 code，可选 output_format/width/height
+            
+        Returns:
+            与specs顺序一致的渲染结果列表
+        """
+        if not specs:
+            return []
+        
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *(loop.run_in_executor(
+                _BATCH_POOL,
+                self._render_sync,
+                spec["code"],
+                spec.get("output_format", "png"),
+                spec.get("width", 800),
+                spec.get("height", 600)
+            ) for spec in specs),
+            return_exceptions=True
+        )
+        
+        return [
+            {"success": False, "error": f"批量渲染失败: {result}"} if isinstance(result, BaseException) else result
+            for result in results
+        ]
+    
     def _get_mime_type(self, format: str) -> str:
         """
         重写父类方法，添加Graphviz特有的MIME类型
@@ -1,18 +1,232 @@
 # Copyright 2025 Google LLC
 # matplotlib渲染工具 - 完整实现
 
+import ast
+import functools
+import hashlib
+import importlib.metadata
+import io
 import logging
+import os
+import platform
+import re
 import tempfile
 import subprocess
 import sys
+import warnings
 from pathlib import Path
-from typing import Dict, Any, Optional
+from types import ModuleType
+from typing import Dict, Any, List, Optional
 
 from google.genai import types
 from .base_render_tool import BaseRenderTool
+from ._dep_cache import _load_dep_cache, _save_dep_cache
+from ._executors import _WorkerProcessPool, _exec_thread_pool, _pyplot_locked, _trap_exit, _wait_result
 
 logger = logging.getLogger(__name__)
 
+# Python代码执行方式：
+#   inprocess（默认）- 在当前解释器内exec，省去每次启动解释器和导入matplotlib/numpy/pandas的开销；
+#                      超时的代码无法终止，会一直占着执行线程和pyplot锁
+#   worker           - 交给常驻的工作进程池执行（matplotlib只在工作进程启动时导入一次，可并行渲染；
+#                      超时或中途退出的代码只终止执行它的工作进程，不影响服务进程）
+#   subprocess       - 每次渲染启动新的解释器
+_EXEC_MODE = os.getenv('MATPLOTLIB_EXEC_MODE', 'inprocess')
+_EXEC_TIMEOUT = 60
+_TIMEOUT_ERROR = f"代码执行超时（{_EXEC_TIMEOUT}秒）"
+
+# 核心依赖及说明，pandas是可选的
+_CORE_DEPS = {
+    'matplotlib': '绘图库',
+    'numpy': '数值计算库',
+    'pandas': '数据分析库（可选）'
+}
+
+# 开头的 ```python / ``` 与结尾的 ``` 代码块标记
+_FENCE_RE = re.compile(r'^```(?:python)?|```$')
+
+# 保存图片时默认使用的分辨率：图表尺寸为 宽/100 × 高/100 英寸，按100 DPI保存时输出正好是 width×height 像素，
+# 不再按150 DPI绘制2.25倍的像素；调用方显式指定dpi时按 [_MIN_DPI, _MAX_DPI] 限定后使用
+_SAVE_DPI = 100
+_MIN_DPI = 72
+_MAX_DPI = 300
+
+# 保存时是否按内容裁剪边界（bbox_inches='tight'）。裁剪需要先完整绘制一遍计算边界，
+# 再按新尺寸分配缓冲区重新绘制；默认直接按图表尺寸输出，设置 MATPLOTLIB_TIGHT_BBOX=1 恢复裁剪
+_BBOX_INCHES = 'tight' if os.getenv('MATPLOTLIB_TIGHT_BBOX', '0') == '1' else None
+
+# 设置 MATPLOTLIB_DOWNSAMPLE=1 后，保存前把超长折线（超过 max(宽度像素×2, 5000) 个点）裁剪到
+# 坐标轴的显示范围，再用LTTB降采样到 宽度像素×2 个点；默认关闭，图表按原始数据绘制
+_DOWNSAMPLE_LINES = os.getenv('MATPLOTLIB_DOWNSAMPLE', '0') == '1'
+
+# 用户代码执行前的固定准备代码：导入常用库、设置中文字体、按 _FIG_W/_FIG_H 准备图表
+# 图表按固定标签向pyplot取用，同一进程内跨渲染复用同一个Figure及其Agg像素缓冲区，
+# 用户代码可直接通过 _FIG 使用它
+# 进程内执行时只在模块加载时编译一次，子进程执行时作为脚本开头
+_PREAMBLE_SRC = """\
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import warnings
+warnings.filterwarnings('ignore')
+
+# 设置中文字体支持
+plt.rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei', 'DejaVu Sans']
+plt.rcParams['axes.unicode_minus'] = False
+
+# 设置图表大小（复用的图表清空上次的内容并恢复默认外观）
+# clear()不会重置布局引擎和子图边距，上次渲染设置的tight/constrained布局或subplots_adjust需在此恢复
+_FIG = plt.figure('matplotlib_render_tool', clear=True)
+_FIG.set_size_inches(_FIG_W, _FIG_H)
+_FIG.set_dpi(plt.rcParams['figure.dpi'])
+_FIG.set_facecolor(plt.rcParams['figure.facecolor'])
+_FIG.set_edgecolor(plt.rcParams['figure.edgecolor'])
+_FIG.set_frameon(plt.rcParams['figure.frameon'])
+_FIG.set_layout_engine(None)
+_FIG.subplotpars.update(**{k: plt.rcParams['figure.subplot.' + k]
+                           for k in ('left', 'right', 'bottom', 'top', 'wspace', 'hspace')})
+"""
+_PREAMBLE_CODE = compile(_PREAMBLE_SRC, "<matplotlib_preamble>", "exec")
+
+# 只有用户代码用到 pd 时才追加的pandas导入（冷启动导入pandas约需数百毫秒并占用数十MB内存）
+_PANDAS_IMPORT_SRC = """\
+try:
+    import pandas as pd
+except ImportError:
+    pass
+"""
+_PANDAS_IMPORT_CODE = compile(_PANDAS_IMPORT_SRC, "<matplotlib_preamble>", "exec")
+
+# 注入用户代码的数值辅助函数（cc_hist2d、cc_bin_mean、cc_downsample，见 _plot_helpers.py）
+# 子进程执行时按文件路径加载（使numba的编译缓存仍然可用）
+_PLOT_HELPERS_PATH = str(Path(__file__).resolve().with_name("_plot_helpers.py"))
+_SUBPROCESS_HELPERS_SRC = (
+    "import importlib.util as _ilu\n"
+    "_spec = _ilu.spec_from_file_location('_plot_helpers', %r)\n"
+    "_plot_helpers = _ilu.module_from_spec(_spec)\n"
+    "_spec.loader.exec_module(_plot_helpers)\n"
+    "globals().update(_plot_helpers.HELPERS)\n"
+    "del _ilu, _spec\n"
+)
+# 开启折线降采样时，在追加的保存语句之前按图片宽度降采样
+_SUBPROCESS_DOWNSAMPLE_SRC = "\n_plot_helpers.downsample_figure_lines(plt.gcf(), %d)"
+
+# 子进程脚本：stdout只承载图片数据，用户的print输出改写到stderr
+_SUBPROCESS_HEADER = "import sys as _sys\n_image_out = _sys.stdout.buffer\n_sys.stdout = _sys.stderr\n"
+# 用户代码未自行保存时追加的保存语句，图片直接写入stdout
+_SUBPROCESS_SAVE_SRC = "\nplt.savefig(_image_out, format=%r, dpi=%d, bbox_inches=%r)\nplt.close('all')\n"
+
+# 进程内执行的线程池，用于实现超时控制
+_EXEC_POOL = _exec_thread_pool("matplotlib-exec")
+
+
+def _dist_version(name: str) -> Optional[str]:
+    """从安装元数据读取包版本，不导入模块；未安装时返回None"""
+    try:
+        return importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def _dep_cache_key() -> str:
+    """依赖检查缓存键：Python解释器、操作系统及各依赖的已安装版本"""
+    versions = "|".join(f"{name}=={_dist_version(name)}" for name in _CORE_DEPS)
+    return f"{sys.executable}|{platform.system()}|{versions}"
+
+
+@functools.lru_cache(maxsize=64)
+def _parse_user_code(source: str) -> Optional[ast.Module]:
+    """解析用户代码，语法错误时返回None（由编译时报告具体错误）"""
+    try:
+        return ast.parse(source, "<matplotlib_code>")
+    except SyntaxError:
+        return None
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_user_code(source: str):
+    """编译用户代码，相同代码重复渲染时跳过编译；复用已解析的语法树"""
+    tree = _parse_user_code(source)
+    return compile(tree if tree is not None else source, "<matplotlib_code>", "exec")
+
+
+@functools.lru_cache(maxsize=64)
+def _calls_savefig(source: str) -> bool:
+    """用户代码是否调用了savefig（plt.savefig、fig.savefig 或直接导入的savefig），注释和字符串中的文字不算"""
+    tree = _parse_user_code(source)
+    if tree is None:
+        return False
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call):
+            func = node.func
+            if (func.attr if isinstance(func, ast.Attribute) else getattr(func, 'id', None)) == 'savefig':
+                return True
+    return False
+
+
+@functools.lru_cache(maxsize=64)
+def _uses_pandas(source: str) -> bool:
+    """用户代码是否引用了 pd 或 pandas 名字；无法解析时按用到处理"""
+    tree = _parse_user_code(source)
+    if tree is None:
+        return True
+    return any(isinstance(node, ast.Name) and node.id in ('pd', 'pandas') for node in ast.walk(tree))
+
+
+def _render_cache_key(code: str, output_format: str, width: int, height: int, dpi: int = _SAVE_DPI) -> bytes:
+    """渲染结果缓存键：清理后的代码及输出参数"""
+    return hashlib.blake2b(f"{output_format}|{width}x{height}|{dpi}|{code}".encode('utf-8'), digest_size=16).digest()
+
+
+def _render_figure(code: str, output_format: str, width: int, height: int, dpi: int = _SAVE_DPI) -> bytes:
+    """执行用户代码并把当前图表保存为图片字节，不经过临时文件"""
+    import matplotlib
+    import matplotlib.pyplot as plt
+    from ._plot_helpers import HELPERS, downsample_figure_lines
+    
+    namespace = ModuleType("__main__").__dict__
+    namespace.update(HELPERS, _FIG_W=width / 100, _FIG_H=height / 100)
+    
+    # 用户代码的print输出写入丢弃的缓冲区，避免污染服务日志
+    namespace["print"] = functools.partial(print, file=io.StringIO())
+    
+    # 用户代码的sys.exit()等转换为普通异常，作为渲染错误返回
+    with _trap_exit(), _pyplot_locked(_EXEC_TIMEOUT):
+        try:
+            # rcParams和警告过滤只在本次渲染内生效，不影响进程中的其他代码
+            with matplotlib.rc_context(), warnings.catch_warnings():
+                exec(_PREAMBLE_CODE, namespace)
+                if _uses_pandas(code):
+                    exec(_PANDAS_IMPORT_CODE, namespace)
+                exec(_compile_user_code(code), namespace)
+                
+                if _DOWNSAMPLE_LINES:
+                    downsample_figure_lines(plt.gcf(), width * 2)
+                buffer = io.BytesIO()
+                plt.savefig(buffer, format=output_format, dpi=dpi, bbox_inches=_BBOX_INCHES)
+                return buffer.getvalue()
+        finally:
+            # 关闭用户代码另外创建的图表；复用的图表只清空内容，保留给下次渲染
+            reused = namespace.get("_FIG")
+            for num in plt.get_fignums():
+                if reused is None or num != reused.number:
+                    plt.close(num)
+            if reused is not None:
+                reused.clear()
+
+
+def _worker_init():
+    """工作进程初始化：启动时导入一次matplotlib（Agg后端）和numpy/pandas"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot  # noqa: F401
+    import numpy  # noqa: F401
+    try:
+        import pandas  # noqa: F401
+    except ImportError:
+        pass
+
 
 class MatplotlibRenderTool(BaseRenderTool):
     """🐍 Python Matplotlib图表渲染工具"""
@@ -24,6 +238,7 @@ class MatplotlibRenderTool(BaseRenderTool):
             supported_formats=["png", "svg", "pdf"],
             default_format="png"
         )
+        self._workers = _WorkerProcessPool("Matplotlib", _worker_init)
         self._check_dependencies()
     
     def _get_declaration(self) -> Optional[types.FunctionDeclaration]:
@@ -36,7 +251,9 @@ class MatplotlibRenderTool(BaseRenderTool):
                 properties={
                     'code': types.Schema(
                         type=types.Type.STRING,
-                        description='要渲染的Python matplotlib代码。应该包含完整的绘图逻辑，包括import语句、数据准备、绘图命令'
+                        description='要渲染的Python matplotlib代码。应该包含完整的绘图逻辑，包括import语句、数据准备、绘图命令。'
+                                    '数据超过1万点时可直接调用预置函数：cc_hist2d(x, y, bins) 二维直方图、'
+                                    'cc_bin_mean(x, y, bins) 分箱均值、cc_downsample(x, y, n_out) 折线降采样'
                     ),
                     'output_format': types.Schema(
                         type=types.Type.STRING,
@@ -61,8 +278,8 @@ class MatplotlibRenderTool(BaseRenderTool):
                     ),
                     'dpi': types.Schema(
                         type=types.Type.INTEGER,
-                        description='图片分辨率（DPI）',
-                        default=150
+                        description='图片分辨率（DPI）。默认100，输出图片正好为 width×height 像素；需要高清图片时再调大（最大300）',
+                        default=100
                     )
                 },
                 required=['code'],
@@ -72,26 +289,17 @@ class MatplotlibRenderTool(BaseRenderTool):
     def _check_dependencies(self):
         """🔧 增强的matplotlib依赖检查"""
         self._matplotlib_available = False
-        missing_deps = []
-        available_deps = []
-        
-        # 检查核心依赖
-        core_deps = {
-            'matplotlib': '绘图库',
-            'numpy': '数值计算库',
-            'pandas': '数据分析库（可选）'
-        }
         
-        for dep_name, desc in core_deps.items():
-            try:
-                module = __import__(dep_name)
-                version = getattr(module, '__version__', '未知版本')
-                logger.info(f"✅ {dep_name} ({desc}): {version}")
-                available_deps.append(f"{dep_name}=={version}")
-            except ImportError:
-                logger.warning(f"❌ {dep_name} ({desc}): 未安装")
-                if dep_name != 'pandas':  # pandas是可选的
-                    missing_deps.append(dep_name)
+        # 24小时内且解释器和各依赖版本未变化时直接复用上次的导入检查和后端测试结果
+        cache_key = _dep_cache_key()
+        cached = _load_dep_cache("matplotlib", cache_key)
+        if cached is not None:
+            missing_deps = cached["missing"]
+            backend_ok = cached.get("backend_ok", False)
+            logger.info("✅ matplotlib依赖检查（缓存）: %s", cache_key.split("|", 2)[2])
+        else:
+            missing_deps = self._import_dependencies()
+            backend_ok = False
         
         if missing_deps:
             logger.warning(f"🔧 缺少必需依赖: {', '.join(missing_deps)}")
@@ -101,9 +309,30 @@ class MatplotlibRenderTool(BaseRenderTool):
             logger.info("✅ matplotlib渲染工具所有依赖检查通过")
             self._matplotlib_available = True
             
-        # 测试matplotlib后端
+        # 测试matplotlib后端（同一解释器和matplotlib版本测试通过后不再重复）
         if self._matplotlib_available:
-            self._test_matplotlib_backend()
+            if backend_ok:
+                logger.info("✅ matplotlib后端测试（缓存）通过")
+            else:
+                self._test_matplotlib_backend()
+                backend_ok = self._matplotlib_available
+        
+        if cached is None or cached.get("backend_ok") != backend_ok:
+            _save_dep_cache("matplotlib", cache_key, {"missing": missing_deps, "backend_ok": backend_ok})
+    
+    def _import_dependencies(self) -> List[str]:
+        """逐个导入核心依赖并记录版本，返回缺少的必需依赖"""
+        missing_deps = []
+        for dep_name, desc in _CORE_DEPS.items():
+            try:
+                module = __import__(dep_name)
+                version = getattr(module, '__version__', '未知版本')
+                logger.info(f"✅ {dep_name} ({desc}): {version}")
+            except ImportError:
+                logger.warning(f"❌ {dep_name} ({desc}): 未安装")
+                if dep_name != 'pandas':  # pandas是可选的
+                    missing_deps.append(dep_name)
+        return missing_deps
     
     def _test_matplotlib_backend(self):
         """🔧 新增方法：测试matplotlib后端"""
@@ -134,7 +363,17 @@ class MatplotlibRenderTool(BaseRenderTool):
             logger.error(f"❌ matplotlib后端测试失败: {e}")
             self._matplotlib_available = False
     
-    def _render_sync(self, code: str, output_format: str, width: int, height: int) -> Dict[str, Any]:
+    def _render_options(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """只有调用方显式指定dpi时才传给渲染，否则使用默认的 _SAVE_DPI"""
+        dpi = args.get("dpi")
+        if dpi is None:
+            return {}
+        try:
+            return {"dpi": max(_MIN_DPI, min(_MAX_DPI, int(dpi)))}
+        except (TypeError, ValueError):
+            return {}
+    
+    def _render_sync(self, code: str, output_format: str, width: int, height: int, dpi: int = _SAVE_DPI) -> Dict[str, Any]:
         """同步渲染Matplotlib图表"""
         
         if not self._matplotlib_available:
@@ -146,126 +385,140 @@ class MatplotlibRenderTool(BaseRenderTool):
                 "suggestion": "请先安装依赖: pip install matplotlib numpy pandas"
             }
         
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            
-            try:
-                code_file = temp_path / "chart_code.py"
-                output_file = temp_path / f"output.{output_format}"
-                
-                # 预处理代码
-                processed_code = self._preprocess_code(code, output_file, output_format, width, height)
-                code_file.write_text(processed_code, encoding='utf-8')
-                
-                logger.info(f"🚀 执行matplotlib代码渲染...")
-                
-                # 执行Python代码
-                result = subprocess.run(
-                    [sys.executable, str(code_file)],
-                    capture_output=True,
-                    text=True,
-                    timeout=60,
-                    cwd=temp_dir,
-                    encoding='utf-8',
-                    errors='replace'
-                )
-                
-                if result.returncode != 0:
+        try:
+            code = self._clean_code(code)
+        except ValueError as e:
+            return {
+                "success": False,
+                "error": f"渲染过程异常: {e}"
+            }
+        
+        cache_key = _render_cache_key(code, output_format, width, height, dpi)
+        data = self._cache_get(cache_key)
+        if data is not None:
+            return {"success": True, "data": data}
+        
+        logger.info(f"🚀 执行matplotlib代码渲染...")
+        
+        # 自行调用savefig的代码会写文件，仍放到子进程的临时目录中执行
+        if _calls_savefig(code) or _EXEC_MODE not in ("inprocess", "worker"):
+            result = self._exec_in_subprocess(code, output_format, width, height, dpi)
+        elif _EXEC_MODE == "worker":
+            result = self._exec_in_worker(code, output_format, width, height, dpi)
+        else:
+            result = self._exec_user_code(code, output_format, width, height, dpi)
+        
+        if result["success"]:
+            logger.info(f"✅ Matplotlib图表渲染成功，大小: {len(result['data'])} bytes")
+            self._cache_put(cache_key, result)
+        return result
+    
+    def _exec_user_code(self, code: str, output_format: str, width: int, height: int, dpi: int = _SAVE_DPI) -> Dict[str, Any]:
+        """在当前解释器中执行代码，省去启动Python进程和重复导入matplotlib/numpy/pandas的开销"""
+        future = _EXEC_POOL.submit(_render_figure, code, output_format, width, height, dpi)
+        return _wait_result(future, _EXEC_TIMEOUT, _TIMEOUT_ERROR, empty_error="生成的图片文件为空")
+    
+    def _exec_in_worker(self, code: str, output_format: str, width: int, height: int, dpi: int = _SAVE_DPI) -> Dict[str, Any]:
+        """通过常驻工作进程池执行代码，图片字节随结果返回"""
+        return self._workers.run(
+            _render_figure, code, output_format, width, height, dpi,
+            timeout=_EXEC_TIMEOUT, timeout_error=_TIMEOUT_ERROR, empty_error="生成的图片文件为空"
+        )
+    
+    def _exec_in_subprocess(self, code: str, output_format: str, width: int, height: int, dpi: int = _SAVE_DPI) -> Dict[str, Any]:
+        """
+        在新的Python进程中执行代码
+        
+        代码经stdin传入，图片经stdout取回；自行调用savefig的代码会写文件，
+        在临时目录中执行并读取其中的 output.<格式> 文件
+        """
+        script = self._preprocess_code(code, output_format, width, height, dpi)
+        
+        try:
+            if not _calls_savefig(code):
+                result = self._run_script(script, tempfile.gettempdir())
+                if result["success"] and not result["data"]:
+                    # 用户代码在保存前调用了sys.exit(0)等
                     return {
                         "success": False,
-                        "error": f"Python代码执行失败:\n{result.stderr}"
+                        "error": "代码执行完成但未生成图片"
                     }
+                return result
+            
+            with tempfile.TemporaryDirectory() as temp_dir:
+                result = self._run_script(script, temp_dir)
+                if not result["success"] or result["data"]:
+                    return result
                 
+                output_file = Path(temp_dir) / f"output.{output_format}"
                 if not output_file.exists():
                     return {
                         "success": False,
                         "error": "代码执行完成但未生成图片文件"
                     }
-                
-                image_bytes = output_file.read_bytes()
-                
-                if len(image_bytes) == 0:
-                    return {
-                        "success": False,
-                        "error": "生成的图片文件为空"
-                    }
-                
-                logger.info(f"✅ Matplotlib图表渲染成功，大小: {len(image_bytes)} bytes")
-                
-                return {
-                    "success": True,
-                    "data": image_bytes
-                }
-                
-            except subprocess.TimeoutExpired:
-                return {
-                    "success": False,
-                    "error": "代码执行超时（60秒）"
-                }
-            except Exception as e:
-                logger.error(f"Matplotlib渲染异常: {e}", exc_info=True)
-                return {
-                    "success": False,
-                    "error": f"渲染过程异常: {e}"
-                }
+                result["data"] = output_file.read_bytes()
+                return result
+            
+        except subprocess.TimeoutExpired:
+            return {
+                "success": False,
+                "error": _TIMEOUT_ERROR
+            }
+        except Exception as e:
+            logger.error(f"Matplotlib渲染异常: {e}", exc_info=True)
+            return {
+                "success": False,
+                "error": f"渲染过程异常: {e}"
+            }
     
-    def _preprocess_code(self, code: str, output_file: Path, output_format: str, width: int, height: int) -> str:
-        """预处理matplotlib代码"""
-        # 移除代码块标记
-        code = code.strip()
-        if code.startswith("```python"):
-            code = code[9:]
-        elif code.startswith("```"):
-            code = code[3:]
-        if code.endswith("```"):
-            code = code[:-3]
+    def _run_script(self, script: str, cwd: str) -> Dict[str, Any]:
+        """用 python - 执行脚本，成功时 data 为stdout中的图片数据（可能为空）"""
+        result = subprocess.run(
+            [sys.executable, '-'],
+            input=script.encode('utf-8'),
+            capture_output=True,
+            timeout=_EXEC_TIMEOUT,
+            cwd=cwd
+        )
         
-        code = code.strip()
+        if result.returncode != 0:
+            return {
+                "success": False,
+                "error": f"Python代码执行失败:\n{result.stderr.decode('utf-8', errors='replace')}"
+            }
+        return {
+            "success": True,
+            "data": result.stdout
+        }
+    
+    def _clean_code(self, code: str) -> str:
+        """移除代码块标记，代码为空时抛出ValueError"""
+        code = _FENCE_RE.sub('', code.strip()).strip()
         
         if not code:
             raise ValueError("matplotlib代码不能为空")
-        
-        # 计算figsize
-        figwidth = width / 100
-        figheight = height / 100
-        
-        # 检查代码中是否已有savefig调用
-        has_savefig = 'savefig' in code
-        
-        # 构建完整的Python代码
-        full_code = f"""
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-import numpy as np
-import pandas as pd
-import warnings
-warnings.filterwarnings('ignore')
-
-# 设置中文字体支持
-plt.rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei', 'DejaVu Sans']
-plt.rcParams['axes.unicode_minus'] = False
-
-# 设置图表大小
-plt.figure(figsize=({figwidth:.2f}, {figheight:.2f}))
-
-try:
-{self._indent_code(code)}
-    
-    # 自动保存图片
-    if not {has_savefig}:
-        plt.savefig(r"{output_file}", format="{output_format}", dpi=150, bbox_inches='tight')
+        return code
     
-    plt.close('all')
-    print("✅ matplotlib图表渲染完成")
+    def _preprocess_code(self, code: str, output_format: str, width: int, height: int, dpi: int = _SAVE_DPI) -> str:
+        """把已清理的matplotlib代码包装成子进程执行的完整脚本"""
+        script = _SUBPROCESS_HEADER + f"_FIG_W = {width / 100!r}\n_FIG_H = {height / 100!r}\n" + _PREAMBLE_SRC
+        if _uses_pandas(code):
+            script += _PANDAS_IMPORT_SRC
+        script += _SUBPROCESS_HELPERS_SRC % _PLOT_HELPERS_PATH + code
+        
+        # 代码中没有savefig调用时自动保存图片
+        if not _calls_savefig(code):
+            if _DOWNSAMPLE_LINES:
+                script += _SUBPROCESS_DOWNSAMPLE_SRC % (width * 2)
+            script += _SUBPROCESS_SAVE_SRC % (output_format, dpi, _BBOX_INCHES)
+        return script
     
-except Exception as e:
-    print(f"❌ matplotlib渲染失败: {{e}}")
-    raise e
-"""
-        return full_code
+    def close(self):
+        """释放常驻工作进程池"""
+        if getattr(self, '_workers', None) is not None:
+            self._workers.stop()
     
-    def _indent_code(self, code: str) -> str:
-        """为代码添加缩进"""
-        lines = code.split('\n')
-        return '\n'.join(['    ' + line for line in lines]) 
\ No newline at end of file
+    def __del__(self):
+        """析构函数，关闭常驻工作进程池和线程池"""
+        self.close()
+        super().__del__()
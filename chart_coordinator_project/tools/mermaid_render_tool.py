@@ -1,18 +1,100 @@
 # Copyright 2025 Google LLC
 # Mermaid渲染工具 - 流程图与图表专家
 
+import asyncio
+import hashlib
+import json
 import logging
+import os
 import platform
+import re
+import shutil
 import subprocess
 import tempfile
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 from google.genai import types
 from .base_render_tool import BaseRenderTool
+from ._dep_cache import _load_dep_cache, _save_dep_cache
+from ._executors import _exec_thread_pool
 
 logger = logging.getLogger(__name__)
 
+# 渲染方式：
+#   worker（默认）- 交给常驻的Node.js进程渲染（mermaid-cli/Puppeteer只加载一次，Chromium只启动一次）
+#   subprocess    - 每次渲染启动mmdc命令
+_RENDER_MODE = os.getenv('MERMAID_RENDER_MODE', 'worker')
+_RENDER_TIMEOUT = 30
+# 异步渲染时合并请求的等待窗口（秒）和每批最多请求数
+_BATCH_WINDOW = 0.05
+_BATCH_MAX = 8
+_NODE_WORKER_PATH = str(Path(__file__).resolve().with_name("_mermaid_worker.js"))
+
+# 开头的 ```mermaid / ``` 与结尾的 ``` 代码块标记
+_FENCE_RE = re.compile(r'^```(?:mermaid)?|```$')
+
+# mmdc未指定 -w/-H 时使用的页面尺寸
+_MMDC_DEFAULT_VIEWPORT = (800, 600)
+
+# mmdc输入输出文件所在的临时目录：Linux上优先使用内存文件系统 /dev/shm，避免小文件落盘；
+# 不可用时（其他平台或/dev/shm不可写）使用系统默认临时目录
+_TEMP_ROOT = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK | os.X_OK) else None
+
+# Windows上npm全局安装的mmdc的固定位置，存在时优先探测
+_WINDOWS_MMDC_PATH = r"C:\Users\Lenovo\AppData\Roaming\npm\mmdc.cmd"
+
+# 读取常驻进程响应的线程池，用于实现跨平台超时控制
+_IO_POOL = _exec_thread_pool("mermaid-io")
+
+# 每个事件循环的mmdc并发信号量（每个mmdc都会启动一个Chromium，并发数不超过CPU核数）
+_MMDC_SEMAPHORES = weakref.WeakKeyDictionary()
+
+
+def _mmdc_semaphore() -> asyncio.Semaphore:
+    """当前事件循环的mmdc并发信号量"""
+    loop = asyncio.get_running_loop()
+    semaphore = _MMDC_SEMAPHORES.get(loop)
+    if semaphore is None:
+        semaphore = _MMDC_SEMAPHORES[loop] = asyncio.Semaphore(os.cpu_count() or 4)
+    return semaphore
+
+
+def _render_cache_key(code: str, output_format: str, width: int, height: int) -> bytes:
+    """渲染结果缓存键：预处理只依赖代码本身，按原始代码建键"""
+    return hashlib.blake2b(f"{output_format}|{width}x{height}|{code}".encode('utf-8'), digest_size=16).digest()
+
+
+def _dep_cache_key() -> str:
+    """依赖检查缓存键：操作系统、PATH，以及PATH中mmdc的位置和修改时间（安装或升级后自动失效）"""
+    mmdc = shutil.which("mmdc")
+    try:
+        mmdc_mtime = os.path.getmtime(mmdc) if mmdc else 0
+    except OSError:
+        mmdc_mtime = 0
+    return f"{platform.system()}|{os.getenv('PATH', '')}|{mmdc}|{mmdc_mtime}"
+
+
+def _find_mermaid_cli_dir(mmdc_cmd: List[str]) -> Optional[str]:
+    """根据检测到的mmdc命令定位 @mermaid-js/mermaid-cli 包目录，找不到时返回None（npx等情况）"""
+    executable = shutil.which(mmdc_cmd[0])
+    if executable is None:
+        return None
+    # Unix上mmdc是指向包内cli.js的符号链接；Windows上mmdc.cmd与包同在npm全局目录下
+    candidates = list(Path(os.path.realpath(executable)).parents)
+    candidates.append(Path(executable).parent / "node_modules" / "@mermaid-js" / "mermaid-cli")
+    for directory in candidates:
+        package_json = directory / "package.json"
+        try:
+            if json.loads(package_json.read_text(encoding='utf-8')).get("name") == "@mermaid-js/mermaid-cli":
+                return str(directory)
+        except (OSError, ValueError):
+            continue
+    return None
+
 
 class MermaidRenderTool(BaseRenderTool):
     """🌊 Mermaid图表渲染工具"""
@@ -24,7 +106,15 @@ class MermaidRenderTool(BaseRenderTool):
             supported_formats=["png", "svg", "pdf"],
             default_format="png"
         )
-        self._check_dependencies()
+        self._node_worker = None
+        self._node_worker_lock = threading.Lock()
+        # 常驻进程无法加载mermaid-cli或启动浏览器时置为True，之后改用mmdc命令
+        self._node_worker_unavailable = False
+        self._probe_lock = threading.Lock()
+        # 异步渲染时等待合并发送给常驻进程的请求
+        self._batch_pending = []
+        self._batch_timer = None
+        self._batch_tasks = set()
     
     def _get_declaration(self) -> Optional[types.FunctionDeclaration]:
         """🔧 定义Mermaid渲染工具的精确函数声明"""
@@ -71,71 +161,96 @@ class MermaidRenderTool(BaseRenderTool):
         return [base_cmd]
     
     def _check_dependencies(self):
-        """🔧 增强的依赖检查 - 多种方式尝试，友好错误提示"""
-        self._mmdc_available = False
+        """mmdc在首次渲染时才探测（见 _ensure_mmdc），不渲染Mermaid的进程不必启动node/npx"""
+        self._mmdc_available = None
         self._mmdc_cmd = None
+    
+    def _ensure_mmdc(self) -> bool:
+        """首次调用时探测mmdc（双重检查加锁，并发渲染只探测一次），返回是否可用"""
+        if self._mmdc_available is None:
+            with self._probe_lock:
+                if self._mmdc_available is None:
+                    self._resolve_mmdc()
+        return self._mmdc_available
+    
+    def _resolve_mmdc(self):
+        """🔧 增强的依赖检查 - 多种方式尝试，友好错误提示"""
+        # 24小时内且PATH和mmdc未变化时直接复用上次探测到的命令，省去启动node/npx的开销
+        cache_key = _dep_cache_key()
+        cached = _load_dep_cache("mermaid", cache_key)
+        if cached is not None:
+            mmdc_cmd = cached["cmd"]
+            if mmdc_cmd is not None:
+                logger.info(f"✅ mermaid-cli 检测成功（缓存）: {' '.join(mmdc_cmd)}")
+            else:
+                self._show_installation_help()
+        else:
+            mmdc_cmd = self._probe_mmdc()
+            _save_dep_cache("mermaid", cache_key, {"cmd": mmdc_cmd})
         
+        # 最后才设置可用标记，其他线程看到非None时命令已就绪
+        self._mmdc_cmd = mmdc_cmd
+        self._mmdc_available = mmdc_cmd is not None
+    
+    def _probe_mmdc(self) -> Optional[List[str]]:
+        """
+        并行尝试各种mmdc调用方式，返回按优先级第一个可用的命令，全部失败时返回None
+        
+        优先级：Windows明确路径 > 平台命令 > mmdc > npx。各探测同时启动，
+        按优先级依次取结果，高优先级命令可用时不再等待其余探测（npx冷启动可能很慢）
+        """
+        variants = []
         # Windows下的明确路径优先尝试
-        if platform.system() == "Windows":
-            mmdc_explicit_path = r"C:\Users\Lenovo\AppData\Roaming\npm\mmdc.cmd"
-            if Path(mmdc_explicit_path).exists():
-                try:
-                    result = subprocess.run(
-                        [mmdc_explicit_path, "--version"],
-                        capture_output=True, 
-                        text=True,
-                        timeout=10,
-                        encoding='utf-8',
-                        errors='replace'
-                    )
-                    if result.returncode == 0:
-                        version_info = result.stdout.strip()
-                        logger.info(f"✅ mermaid-cli 检测成功 (明确路径)! 版本: {version_info}")
-                        self._mmdc_available = True
-                        self._mmdc_cmd = [mmdc_explicit_path]
-                        return
-                except Exception as e:
-                    logger.debug(f"❌ 明确路径测试失败: {e}")
-        
-        # 获取平台特定的命令候选列表 (回退方案)
-        candidates = self._get_platform_command("mmdc")
-        
-        # 尝试多种方式
-        for cmd_variant in [
-            candidates + ["--version"],
-            ["mmdc", "--version"],
-            ["npx", "@mermaid-js/mermaid-cli", "--version"]
-        ]:
-            try:
-                logger.info(f"🔍 测试命令: {' '.join(cmd_variant)}")
-                
-                result = subprocess.run(
-                    cmd_variant,
-                    capture_output=True, 
-                    text=True,
-                    timeout=15,
-                    encoding='utf-8',
-                    errors='replace'
-                )
-            
-                if result.returncode == 0:
-                    version_info = result.stdout.strip()
-                    logger.info(f"✅ mermaid-cli 检测成功! 版本: {version_info}")
-                    self._mmdc_available = True
-                    self._mmdc_cmd = cmd_variant[:-1]  # 去掉--version
-                    return
-                else:
-                    logger.debug(f"❌ 命令失败 ({result.returncode}): {result.stderr}")
-                
-            except subprocess.TimeoutExpired:
-                logger.debug(f"⏰ 命令超时: {' '.join(cmd_variant)}")
-            except FileNotFoundError:
-                logger.debug(f"📂 命令不存在: {cmd_variant[0]}")
-            except Exception as e:
-                logger.debug(f"❌ 执行异常: {e}")
+        if platform.system() == "Windows" and Path(_WINDOWS_MMDC_PATH).exists():
+            variants.append(([_WINDOWS_MMDC_PATH], 10))
+        # 平台特定的命令及回退方案，去掉与前面重复的命令
+        for cmd in (self._get_platform_command("mmdc"), ["mmdc"], ["npx", "@mermaid-js/mermaid-cli"]):
+            if all(cmd != existing for existing, _ in variants):
+                variants.append((cmd, 15))
+        
+        probe_pool = ThreadPoolExecutor(max_workers=len(variants), thread_name_prefix="mermaid-probe")
+        try:
+            futures = [probe_pool.submit(self._probe_command, cmd, timeout) for cmd, timeout in variants]
+            for (cmd, _), future in zip(variants, futures):
+                if future.result():
+                    return cmd
+        finally:
+            # 不等待仍在运行的低优先级探测，它们会在各自的超时内结束
+            probe_pool.shutdown(wait=False, cancel_futures=True)
         
         # 所有方式都失败，生成友好提示
         self._show_installation_help()
+        return None
+    
+    @staticmethod
+    def _probe_command(cmd: List[str], timeout: int) -> bool:
+        """执行 <cmd> --version，判断该mmdc调用方式是否可用"""
+        cmd_variant = cmd + ["--version"]
+        try:
+            logger.info(f"🔍 测试命令: {' '.join(cmd_variant)}")
+            
+            result = subprocess.run(
+                cmd_variant,
+                capture_output=True, 
+                text=True,
+                timeout=timeout,
+                encoding='utf-8',
+                errors='replace'
+            )
+        
+            if result.returncode == 0:
+                version_info = result.stdout.strip()
+                logger.info(f"✅ mermaid-cli 检测成功! 版本: {version_info}")
+                return True
+            logger.debug(f"❌ 命令失败 ({result.returncode}): {result.stderr}")
+            
+        except subprocess.TimeoutExpired:
+            logger.debug(f"⏰ 命令超时: {' '.join(cmd_variant)}")
+        except FileNotFoundError:
+            logger.debug(f"📂 命令不存在: {cmd_variant[0]}")
+        except Exception as e:
+            logger.debug(f"❌ 执行异常: {e}")
+        return False
     
     def _show_installation_help(self):
         """🔧 显示安装帮助"""
@@ -188,7 +303,7 @@ Windows特殊说明：
     def _render_sync(self, code: str, output_format: str, width: int, height: int, **kwargs) -> Dict[str, Any]:
         """同步渲染Mermaid图表"""
         
-        if not self._mmdc_available:
+        if not self._ensure_mmdc():
             return {
                 "success": False,
                 "error": "mermaid-cli未安装或不可用",
@@ -196,33 +311,90 @@ Windows特殊说明：
                 "suggestion": "请先安装mermaid-cli: npm install -g @mermaid-js/mermaid-cli"
             }
         
-        # 创建临时目录
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            
+        cache_key = _render_cache_key(code, output_format, width, height)
+        data = self._cache_get(cache_key)
+        if data is not None:
+            return {"success": True, "data": data}
+        
+        result = None
+        if _RENDER_MODE == "worker" and not self._node_worker_unavailable:
+            result = self._render_in_worker(code, output_format, width, height)
+        if result is None:
+            result = self._render_with_mmdc(code, output_format, width, height)
+        
+        self._cache_put(cache_key, result)
+        return result
+    
+    async def _render_async(self, 
+                           code: str, 
+                           output_format: str, 
+                           width: int, 
+                           height: int) -> Dict[str, Any]:
+        """
+        异步渲染Mermaid图表
+        
+        使用常驻渲染进程时，短时间内到达的多个请求合并成一批发给常驻进程，在同一浏览器中并发渲染；
+        改用mmdc命令时直接在事件循环中等待mmdc子进程，多个图表并行渲染（并发数不超过CPU核数），
+        不占用基类线程池（只有2个线程）
+        """
+        if self._mmdc_available is None:
+            # 首次渲染的依赖探测会派生子进程，放到线程池中执行，避免阻塞事件循环
+            await asyncio.get_running_loop().run_in_executor(self.executor, self._ensure_mmdc)
+        if not self._mmdc_available:
+            return await super()._render_async(code, output_format, width, height)
+        
+        cache_key = _render_cache_key(code, output_format, width, height)
+        data = self._cache_get(cache_key)
+        if data is not None:
+            return {"success": True, "data": data}
+        
+        if _RENDER_MODE == "worker" and not self._node_worker_unavailable:
+            result = await self._render_in_worker_batched(code, output_format, width, height)
+            if result is not None:
+                self._cache_put(cache_key, result)
+                return result
+        
+        with tempfile.TemporaryDirectory(dir=_TEMP_ROOT) as temp_dir:
             try:
-                # 准备输入和输出文件
-                input_file = temp_path / "diagram.mmd"
-                output_file = temp_path / f"output.{output_format}"
-                
-                # 预处理Mermaid代码
-                processed_code = self._preprocess_mermaid_code(code)
-                
-                # 写入Mermaid代码到文件
-                input_file.write_text(processed_code, encoding='utf-8')
+                input_file, output_file = self._write_mmdc_input(Path(temp_dir), code, output_format)
+                cmd = self._mmdc_command(input_file, output_file, output_format, width, height)
+                logger.info(f"🚀 执行渲染命令: {' '.join(cmd)}")
                 
-                # 构建渲染命令
-                cmd = self._mmdc_cmd + [
-                    "-i", str(input_file),
-                    "-o", str(output_file),
-                    "-t", "default",
-                    "-b", "white",
-                ]
+                async with _mmdc_semaphore():
+                    proc = await asyncio.create_subprocess_exec(
+                        *cmd,
+                        stdout=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.PIPE,
+                        cwd=temp_dir
+                    )
+                    try:
+                        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=_RENDER_TIMEOUT)
+                    except asyncio.TimeoutError:
+                        proc.kill()
+                        await proc.wait()
+                        return {
+                            "success": False,
+                            "error": "渲染超时（30秒），请检查图表代码复杂度"
+                        }
                 
-                # 添加尺寸参数
-                if output_format in ["png", "pdf"]:
-                    cmd.extend(["-w", str(width)])
-                    cmd.extend(["-H", str(height)])
+                result = self._mmdc_result(proc.returncode, stdout, stderr, output_file)
+            except Exception as e:
+                logger.error(f"❌ Mermaid渲染过程中出现异常: {e}", exc_info=True)
+                return {
+                    "success": False,
+                    "error": f"渲染过程异常: {e}"
+                }
+        
+        self._cache_put(cache_key, result)
+        return result
+    
+    def _render_with_mmdc(self, code: str, output_format: str, width: int, height: int) -> Dict[str, Any]:
+        """启动mmdc命令渲染，每次都会启动Node.js和Chromium"""
+        # 创建临时目录
+        with tempfile.TemporaryDirectory(dir=_TEMP_ROOT) as temp_dir:
+            try:
+                input_file, output_file = self._write_mmdc_input(Path(temp_dir), code, output_format)
+                cmd = self._mmdc_command(input_file, output_file, output_format, width, height)
                 
                 logger.info(f"🚀 执行渲染命令: {' '.join(cmd)}")
                 
@@ -230,50 +402,11 @@ Windows特殊说明：
                 result = subprocess.run(
                     cmd,
                     capture_output=True,
-                    text=True,
-                    timeout=30,
-                    cwd=temp_dir,
-                    encoding='utf-8',
-                    errors='replace'
+                    timeout=_RENDER_TIMEOUT,
+                    cwd=temp_dir
                 )
                 
-                logger.info(f"🔍 命令执行结果 - 返回码: {result.returncode}")
-                
-                if result.stdout:
-                    logger.info(f"📤 标准输出: {result.stdout}")
-                if result.stderr:
-                    logger.warning(f"⚠️ 标准错误: {result.stderr}")
-                
-                if result.returncode != 0:
-                    error_msg = f"mermaid-cli渲染失败:\n{result.stderr}"
-                    logger.error(error_msg)
-                    return {
-                        "success": False,
-                        "error": error_msg
-                    }
-                
-                # 检查输出文件是否存在
-                if not output_file.exists():
-                    return {
-                        "success": False,
-                        "error": "渲染完成但未生成输出文件"
-                    }
-                
-                # 读取渲染结果
-                image_bytes = output_file.read_bytes()
-                
-                if len(image_bytes) == 0:
-                    return {
-                        "success": False,
-                        "error": "生成的图片文件为空"
-                    }
-                
-                logger.info(f"✅ Mermaid图表渲染成功，大小: {len(image_bytes)} bytes")
-                
-                return {
-                    "success": True,
-                    "data": image_bytes
-                }
+                return self._mmdc_result(result.returncode, result.stdout, result.stderr, output_file)
                 
             except subprocess.TimeoutExpired:
                 return {
@@ -287,16 +420,260 @@ Windows特殊说明：
                     "error": f"渲染过程异常: {e}"
                 }
     
+    def _write_mmdc_input(self, temp_path: Path, code: str, output_format: str):
+        """把预处理后的Mermaid代码写入临时目录，返回输入和输出文件路径"""
+        input_file = temp_path / "diagram.mmd"
+        output_file = temp_path / f"output.{output_format}"
+        input_file.write_text(self._preprocess_mermaid_code(code), encoding='utf-8')
+        return input_file, output_file
+    
+    def _mmdc_command(self, input_file: Path, output_file: Path, output_format: str, width: int, height: int) -> List[str]:
+        """构建mmdc渲染命令"""
+        cmd = self._mmdc_cmd + [
+            "-i", str(input_file),
+            "-o", str(output_file),
+            "-t", "default",
+            "-b", "white",
+        ]
+        
+        # 添加尺寸参数
+        if output_format in ["png", "pdf"]:
+            cmd.extend(["-w", str(width)])
+            cmd.extend(["-H", str(height)])
+        return cmd
+    
+    @staticmethod
+    def _mmdc_result(returncode: int, stdout: bytes, stderr: bytes, output_file: Path) -> Dict[str, Any]:
+        """
+        根据mmdc的返回码和输出文件生成渲染结果
+        
+        管道以二进制方式读取，只有非空的输出才按UTF-8解码用于日志和错误信息
+        """
+        logger.info(f"🔍 命令执行结果 - 返回码: {returncode}")
+        
+        stdout = stdout.decode('utf-8', errors='replace') if stdout else ""
+        stderr = stderr.decode('utf-8', errors='replace') if stderr else ""
+        if stdout:
+            logger.info(f"📤 标准输出: {stdout}")
+        if stderr:
+            logger.warning(f"⚠️ 标准错误: {stderr}")
+        
+        if returncode != 0:
+            error_msg = f"mermaid-cli渲染失败:\n{stderr}"
+            logger.error(error_msg)
+            return {
+                "success": False,
+                "error": error_msg
+            }
+        
+        # 检查输出文件是否存在
+        if not output_file.exists():
+            return {
+                "success": False,
+                "error": "渲染完成但未生成输出文件"
+            }
+        
+        # 读取渲染结果
+        image_bytes = output_file.read_bytes()
+        
+        if len(image_bytes) == 0:
+            return {
+                "success": False,
+                "error": "生成的图片文件为空"
+            }
+        
+        logger.info(f"✅ Mermaid图表渲染成功，大小: {len(image_bytes)} bytes")
+        
+        return {
+            "success": True,
+            "data": image_bytes
+        }
+    
+    def _ensure_node_worker(self) -> subprocess.Popen:
+        """获取常驻Node.js渲染进程，不存在或已退出时重新启动"""
+        if self._node_worker is None or self._node_worker.poll() is not None:
+            logger.info("🚀 启动Mermaid常驻Node.js渲染进程...")
+            cmd = ["node", _NODE_WORKER_PATH]
+            cli_dir = _find_mermaid_cli_dir(self._mmdc_cmd)
+            if cli_dir:
+                cmd.append(cli_dir)
+            self._node_worker = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE
+            )
+        return self._node_worker
+    
+    def _stop_node_worker(self):
+        """终止常驻Node.js渲染进程，下次渲染时会重新启动"""
+        worker, self._node_worker = self._node_worker, None
+        if worker is None or worker.poll() is not None:
+            return
+        worker.terminate()
+        try:
+            worker.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            worker.kill()
+    
+    @staticmethod
+    def _read_worker_response(worker: subprocess.Popen):
+        """读取一行JSON响应头及随后的图片数据，进程退出时返回 (None, b"")"""
+        line = worker.stdout.readline()
+        if not line:
+            return None, b""
+        header = json.loads(line)
+        if not header.get("ok"):
+            return header, b""
+        length = header.get("length", 0)
+        data = worker.stdout.read(length)
+        if len(data) < length:
+            return None, b""
+        return header, data
+    
+    def _render_in_worker(self, code: str, output_format: str, width: int, height: int) -> Optional[Dict[str, Any]]:
+        """
+        通过常驻Node.js进程渲染，省去每次启动Node.js、Puppeteer和Chromium的开销
+        
+        常驻进程不可用（无法启动node、加载mermaid-cli或启动浏览器）时返回None，由调用方改用mmdc命令
+        """
+        results = self._render_batch_in_worker([(code, output_format, width, height)])
+        return None if results is None else results[0]
+    
+    def _render_batch_in_worker(self, jobs: List[tuple]) -> Optional[List[Dict[str, Any]]]:
+        """
+        一次把多个 (code, output_format, width, height) 请求写给常驻进程，由它在同一浏览器中并发渲染
+        
+        按请求顺序返回结果；常驻进程不可用时返回None
+        """
+        requests = []
+        for code, output_format, width, height in jobs:
+            # 与mmdc命令行一致：只有png/pdf使用指定尺寸
+            if output_format not in ["png", "pdf"]:
+                width, height = _MMDC_DEFAULT_VIEWPORT
+            requests.append(json.dumps({
+                "code": self._preprocess_mermaid_code(code),
+                "format": output_format,
+                "width": width,
+                "height": height,
+                "theme": "default",
+                "background": "white"
+            }, ensure_ascii=False).encode('utf-8') + b"\n")
+        
+        logger.info(f"🚀 执行Mermaid渲染（{len(jobs)}个图表）...")
+        
+        with self._node_worker_lock:
+            try:
+                worker = self._ensure_node_worker()
+                worker.stdin.write(b"".join(requests))
+                worker.stdin.flush()
+            except OSError as e:
+                self._stop_node_worker()
+                self._node_worker_unavailable = True
+                logger.warning(f"⚠️ Mermaid常驻渲染进程不可用，改用mmdc命令: {e}")
+                return None
+            
+            results = []
+            for _ in jobs:
+                # 在线程中读取响应以实现跨平台超时（Windows上select不支持管道）
+                future = _IO_POOL.submit(self._read_worker_response, worker)
+                try:
+                    header, image_bytes = future.result(timeout=_RENDER_TIMEOUT)
+                except FutureTimeoutError:
+                    # 超时后终止渲染进程，阻塞的读取随之返回，尚未返回的请求都按超时处理
+                    self._stop_node_worker()
+                    results.extend([{
+                        "success": False,
+                        "error": f"渲染超时（{_RENDER_TIMEOUT}秒），请检查图表代码复杂度"
+                    }] * (len(jobs) - len(results)))
+                    break
+                
+                if header is None:
+                    self._stop_node_worker()
+                    results.extend([{
+                        "success": False,
+                        "error": "Node.js渲染进程意外退出"
+                    }] * (len(jobs) - len(results)))
+                    break
+                
+                if header.get("fatal"):
+                    self._stop_node_worker()
+                    self._node_worker_unavailable = True
+                    logger.warning(f"⚠️ Mermaid常驻渲染进程不可用，改用mmdc命令:\n{header.get('err', '')}")
+                    return None
+                
+                results.append(self._worker_result(header, image_bytes))
+        
+        return results
+    
+    @staticmethod
+    def _worker_result(header: Dict[str, Any], image_bytes: bytes) -> Dict[str, Any]:
+        """根据常驻进程的响应生成渲染结果"""
+        if not header.get("ok"):
+            return {
+                "success": False,
+                "error": f"mermaid-cli渲染失败:\n{header.get('err', '')}"
+            }
+        
+        if len(image_bytes) == 0:
+            return {
+                "success": False,
+                "error": "生成的图片文件为空"
+            }
+        
+        logger.info(f"✅ Mermaid图表渲染成功，大小: {len(image_bytes)} bytes")
+        
+        return {
+            "success": True,
+            "data": image_bytes
+        }
+    
+    async def _render_in_worker_batched(self, code: str, output_format: str, width: int, height: int) -> Optional[Dict[str, Any]]:
+        """
+        把短时间内到达的渲染请求合并成一批交给常驻进程
+        
+        第一个请求到达后等待 _BATCH_WINDOW 秒，或凑满 _BATCH_MAX 个请求时立即发出；
+        常驻进程不可用时返回None
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._batch_pending.append(((code, output_format, width, height), future))
+        if len(self._batch_pending) >= _BATCH_MAX:
+            self._flush_batch()
+        elif self._batch_timer is None:
+            self._batch_timer = loop.call_later(_BATCH_WINDOW, self._flush_batch)
+        return await future
+    
+    def _flush_batch(self):
+        """发出当前等待中的一批请求"""
+        if self._batch_timer is not None:
+            self._batch_timer.cancel()
+            self._batch_timer = None
+        pending, self._batch_pending = self._batch_pending, []
+        if pending:
+            task = asyncio.ensure_future(self._run_batch(pending))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+    
+    async def _run_batch(self, pending: List[tuple]):
+        """在线程池中执行一批渲染，并把结果分发给各个等待的请求"""
+        jobs = [job for job, _ in pending]
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self.executor, self._render_batch_in_worker, jobs
+            )
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for index, (_, future) in enumerate(pending):
+            if not future.done():
+                future.set_result(None if results is None else results[index])
+    
     def _preprocess_mermaid_code(self, code: str) -> str:
         """预处理Mermaid代码"""
         # 移除代码块标记
-        code = code.strip()
-        if code.startswith("```mermaid"):
-            code = code[10:]
-        elif code.startswith("```"):
-            code = code[3:]
-        if code.endswith("```"):
-            code = code[:-3]
+        code = _FENCE_RE.sub('', code.strip())
         
         # 清理和格式化
         lines = []
@@ -305,4 +682,14 @@ Windows特殊说明：
             if line and not line.startswith('<!--'):
                 lines.append(line)
         
-        return '\n'.join(lines) 
\ No newline at end of file
+        return '\n'.join(lines) 
+    
+    def close(self):
+        """释放常驻Node.js渲染进程"""
+        if getattr(self, '_node_worker', None) is not None:
+            self._stop_node_worker()
+    
+    def __del__(self):
+        """析构函数，关闭常驻渲染进程和线程池"""
+        self.close()
+        super().__del__()
@@ -1,20 +1,327 @@
 # Copyright 2025 Google LLC
 # mplfinance渲染工具 - 金融图表专家
 
+import ast
+import asyncio
+import functools
+import io
 import logging
+import os
 import tempfile
 import subprocess
 import sys
 import platform
-import re
+import traceback
+import warnings
 from pathlib import Path
-from typing import Dict, Any, Optional
+from types import ModuleType
+from typing import Dict, Any, List, Optional
 
 from google.genai import types
 from .base_render_tool import BaseRenderTool
+from ._executors import _WorkerProcessPool, _exec_thread_pool, _pyplot_locked, _trap_exit, _wait_result
 
 logger = logging.getLogger(__name__)
 
+# Python代码执行方式：
+#   inprocess（默认）- 在当前解释器内exec，图片直接写入内存缓冲区，省去启动进程和临时文件的开销；
+#                      超时的代码无法终止，会一直占着执行线程和pyplot锁（与Matplotlib工具的进程内渲染共用）
+#   worker           - 交给常驻的工作进程池执行（mplfinance/pandas/matplotlib只在工作进程启动时导入一次；
+#                      超时或中途退出的代码只终止执行它的工作进程，不影响服务进程）
+#   subprocess       - 每次渲染启动新的解释器
+_EXEC_MODE = os.getenv('MPLFINANCE_EXEC_MODE', 'inprocess')
+_EXEC_TIMEOUT = 90
+_TIMEOUT_ERROR = f"金融图表渲染超时（{_EXEC_TIMEOUT}秒）"
+
+# 进程内执行的线程池，用于实现超时控制
+_EXEC_POOL = _exec_thread_pool("mplfinance-exec")
+
+# 各操作系统的中文字体优先级
+_FONT_PRIORITY = {
+    'Windows': ['Microsoft YaHei', 'SimHei', 'SimSun', 'KaiTi'],
+    'Darwin': ['Arial Unicode MS', 'Hiragino Sans GB', 'STHeiti', 'SimHei'],
+    'Linux': ['WenQuanYi Micro Hei', 'DejaVu Sans', 'SimHei', 'Arial Unicode MS'],
+}
+
+# 当前系统的中文字体候选列表，导入时确定一次；字体列表本身在首次渲染时才扫描（见 _select_chinese_font）
+_FONT_CANDIDATES = _FONT_PRIORITY.get(platform.system(), _FONT_PRIORITY['Linux'])
+
+# 保存时是否按内容裁剪边界（bbox_inches='tight'）。脚本保存前已调用tight_layout，裁剪还要先完整绘制一遍
+# 计算边界再重新绘制；默认直接按图表尺寸输出，设置 MPLFINANCE_TIGHT_BBOX=1 恢复裁剪
+_TIGHT_BBOX = os.getenv('MPLFINANCE_TIGHT_BBOX', '0') == '1'
+
+# 各格式附加的savefig参数：PNG只交给调用方使用而非长期存档，用最低zlib压缩级别换取编码速度；
+# SVG/PDF去掉生成时间（SVG另外固定clip-path等id的哈希盐），相同图表输出相同字节
+_SAVEFIG_OPTIONS = {
+    'png': "pil_kwargs={'compress_level': 1}",
+    'svg': "metadata={'Date': None}",
+    'pdf': "metadata={'CreationDate': None}",
+}
+
+# 设置 MPF_TOOL_SELFTEST=1 时初始化阶段试绘一张K线图验证mplfinance可用（默认跳过，
+# 一次试绘要数百毫秒，且依赖导入成功后首次真实渲染同样会暴露问题）
+_SELFTEST = os.getenv('MPF_TOOL_SELFTEST', '0') != '0'
+
+
+def _worker_init():
+    """工作进程初始化：启动时导入一次matplotlib（Agg后端）、mplfinance、pandas和numpy，并加载字体列表"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot  # noqa: F401
+    import matplotlib.font_manager  # noqa: F401
+    import mplfinance  # noqa: F401
+    import pandas  # noqa: F401
+    import numpy  # noqa: F401
+
+
+def _exec_script(script: str) -> bytes:
+    """
+    执行预处理后的脚本，图片写入内存缓冲区后返回字节
+    
+    进程内执行和工作进程共用；pyplot的当前图表和rcParams是进程级全局状态，
+    与Matplotlib工具共用同一把锁串行执行
+    """
+    import matplotlib
+    import matplotlib.pyplot as plt
+    
+    buffer = io.BytesIO()
+    namespace = ModuleType("__main__").__dict__
+    # 用户代码和字体配置的print输出写入丢弃的缓冲区
+    namespace.update(_image_out=buffer, print=functools.partial(print, file=io.StringIO()))
+    # 用户代码的sys.exit()等转换为普通异常，作为渲染错误返回
+    with _trap_exit(), _pyplot_locked(_EXEC_TIMEOUT):
+        try:
+            # rcParams和警告过滤只在本次渲染内生效，不影响进程中的其他代码和下一次渲染
+            with matplotlib.rc_context(), warnings.catch_warnings():
+                exec(_compile_script(script), namespace)
+        finally:
+            plt.close('all')
+    return buffer.getvalue()
+
+
+def _exec_scripts(scripts: List[str]) -> List[tuple]:
+    """
+    依次执行一批脚本，单个脚本出错（包括调用sys.exit()，已由 _exec_script 转换为普通异常）不影响其余脚本
+    
+    返回与scripts顺序一致的 (True, 图片字节) 或 (False, 错误信息) 列表
+    """
+    results = []
+    for script in scripts:
+        try:
+            results.append((True, _exec_script(script)))
+        except Exception:
+            results.append((False, f"Python代码执行失败:\n{traceback.format_exc()}"))
+    return results
+
+
+# 批量子进程执行的驱动脚本：命令行参数依次为 脚本文件 输出文件 错误文件，
+# 各脚本在独立的命名空间和rc_context中执行，出错时把traceback写入错误文件后继续下一个
+_BATCH_DRIVER_SRC = '''
+import sys
+import traceback
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+_args = sys.argv[1:]
+for _code_file, _output_file, _error_file in zip(_args[0::3], _args[1::3], _args[2::3]):
+    with open(_code_file, encoding='utf-8') as _f:
+        _code = compile(_f.read(), _code_file, 'exec')
+    try:
+        with matplotlib.rc_context():
+            exec(_code, {'__name__': '__main__', '_image_out': _output_file})
+    except (Exception, SystemExit):
+        with open(_error_file, 'w', encoding='utf-8') as _f:
+            _f.write(traceback.format_exc())
+    finally:
+        plt.close('all')
+'''
+
+
+@functools.lru_cache(maxsize=None)
+def _select_chinese_font() -> Optional[str]:
+    """按操作系统的字体优先级选出已安装的中文字体，只在首次渲染时扫描一次字体列表"""
+    import matplotlib.font_manager as fm
+    available_fonts = frozenset(f.name for f in fm.fontManager.ttflist)
+    return next((font for font in _FONT_CANDIDATES if font in available_fonts), None)
+
+
+@functools.lru_cache(maxsize=128)
+def _build_script(code: str, output_format: str, width: int, height: int, dpi: int, selected_font: Optional[str]) -> str:
+    """生成完整的渲染脚本；智能体重试等重复渲染相同图表时直接复用"""
+    # 移除代码块标记
+    code = code.strip()
+    if code.startswith("```python"):
+        code = code[9:]
+    elif code.startswith("```"):
+        code = code[3:]
+    if code.endswith("```"):
+        code = code[:-3]
+
+    # 自动修正mpf.plot(ax=..., title=...)用法，避免AttributeError
+    code = _fix_ax_title(code)
+    
+    # 确保必要的导入
+    imports = [
+        "import matplotlib",
+        "matplotlib.use('Agg')  # 非交互式后端",
+        "import matplotlib.pyplot as plt",
+        "import mplfinance as mpf",
+        "import pandas as pd",
+        "import numpy as np",
+        "import warnings",
+        "warnings.filterwarnings('ignore')"
+    ]
+
+    # 中文字体配置（解决mplfinance字体问题）：字体在首次渲染时检测一次，以字面量写入脚本
+    font_config = [
+        "# 强化中文字体配置 - 专门针对mplfinance",
+        "import matplotlib.font_manager as fm",
+        "from matplotlib import rcParams",
+        f"selected_font = {selected_font!r}",
+    ]
+    if selected_font:
+        font_config += [
+            "rcParams['font.sans-serif'] = [selected_font, 'DejaVu Sans']",
+            "rcParams['axes.unicode_minus'] = False",
+            "rcParams['font.family'] = 'sans-serif'",
+            "chinese_font_prop = fm.FontProperties(family=selected_font)",
+            ""
+        ]
+    else:
+        font_config += [
+            "rcParams['font.sans-serif'] = ['DejaVu Sans', 'Arial', 'Liberation Sans']",
+            "chinese_font_prop = None",
+            ""
+        ]
+
+    # 设置图片参数
+    setup_code = [
+        f"# 设置图片尺寸和DPI",
+        f"plt.rcParams['figure.figsize'] = [{width/100:.1f}, {height/100:.1f}]",
+        f"plt.rcParams['figure.dpi'] = {dpi}",
+        f"plt.rcParams['savefig.dpi'] = {dpi}",
+        f"",
+    ]
+
+    # 字体已在用户代码之前写入rcParams，新建的文字直接使用中文字体；但mplfinance的样式会在绘图时
+    # 用自己的rc覆盖字体设置，因此只对图中可能含中文的标题、轴标签、图例和图形文字补设一次字体
+    # （按子图数量计，不遍历整棵artist树）
+    font_fix_code = []
+    if selected_font:
+        font_fix_code = [
+            "",
+            "# 字体兜底：把mplfinance样式覆盖掉的中文字体改回来",
+            "def _fix_chinese_font(fig):",
+            "    texts = list(fig.texts)",
+            "    if fig._suptitle is not None:",
+            "        texts.append(fig._suptitle)",
+            "    for ax in fig.get_axes():",
+            "        texts += [ax.title, ax._left_title, ax._right_title, ax.xaxis.label, ax.yaxis.label]",
+            "        legend = ax.get_legend()",
+            "        if legend is not None:",
+            "            texts += legend.get_texts()",
+            "            texts.append(legend.get_title())",
+            "    for text in texts:",
+            "        if text.get_text():",
+            "            text.set_fontfamily(selected_font)",
+            "",
+            "_fix_chinese_font(plt.gcf())",
+            ""
+        ]
+
+    # 构建完整代码
+    full_code_lines = (
+        imports + 
+        [""] + 
+        font_config +
+        setup_code +
+        ["# 用户代码开始"] + 
+        _indent_code(code).split('\n') + 
+        font_fix_code +
+        ["# 保存图片"] +
+        [f"plt.tight_layout()"] +
+        [_savefig_line(output_format, dpi)] +
+        ["plt.close('all')"]
+    )
+
+    return '\n'.join(full_code_lines)
+
+
+def _savefig_line(output_format: str, dpi: int) -> str:
+    """生成保存图片的savefig语句"""
+    prefix = "plt.rcParams['svg.hashsalt'] = 'mplfinance'\n" if output_format == 'svg' else ""
+    options = [f"format='{output_format}'", f"dpi={dpi}"]
+    if _TIGHT_BBOX:
+        options.append("bbox_inches='tight'")
+    if output_format in _SAVEFIG_OPTIONS:
+        options.append(_SAVEFIG_OPTIONS[output_format])
+    return f"{prefix}plt.savefig(_image_out, {', '.join(options)})"
+
+
+def _is_mpf_plot_call(node: ast.AST) -> bool:
+    """是否为 mpf.plot(...) 调用"""
+    return (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == 'plot'
+            and isinstance(node.func.value, ast.Name) and node.func.value.id == 'mpf')
+
+
+def _fix_ax_title(code: str) -> str:
+    """
+    把 mpf.plot(..., ax=X, title=T) 改写为 mpf.plot(..., ax=X) 加上随后的 X.set_title(T)
+    
+    mplfinance使用外部Axes时不支持title参数。按语法树改写，跨多行的调用和任意标题表达式都能处理，
+    字符串或注释中的 title= 不会误改；没有需要修正的调用（或代码有语法错误）时原样返回
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return code
+    
+    changed = False
+    for node in ast.walk(tree):
+        for field in ('body', 'orelse', 'finalbody'):
+            statements = getattr(node, field, None)
+            if not isinstance(statements, list) or not statements or not isinstance(statements[0], ast.stmt):
+                continue
+            fixed = []
+            for stmt in statements:
+                fixed.append(stmt)
+                # 只处理简单语句，复合语句的内部语句在遍历到它们时处理
+                if not isinstance(stmt, (ast.Expr, ast.Assign, ast.AnnAssign, ast.AugAssign)):
+                    continue
+                for call in ast.walk(stmt):
+                    if not _is_mpf_plot_call(call):
+                        continue
+                    keywords = {kw.arg: kw for kw in call.keywords}
+                    ax, title = keywords.get('ax'), keywords.get('title')
+                    # ax只接受变量、属性或下标，重复求值没有副作用
+                    if ax is None or title is None or not isinstance(ax.value, (ast.Name, ast.Attribute, ast.Subscript)):
+                        continue
+                    call.keywords.remove(title)
+                    fixed.append(ast.Expr(ast.Call(
+                        func=ast.Attribute(value=ax.value, attr='set_title', ctx=ast.Load()),
+                        args=[title.value],
+                        keywords=[]
+                    )))
+                    changed = True
+            statements[:] = fixed
+    
+    if not changed:
+        return code
+    return ast.unparse(ast.fix_missing_locations(tree))
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_script(script: str):
+    """编译渲染脚本，相同脚本重复渲染时跳过编译"""
+    return compile(script, "<mplfinance_code>", "exec")
+
+
+def _indent_code(code: str) -> str:
+    """为用户代码添加适当的缩进"""
+    lines = code.split('\n')
+    return '\n'.join(line for line in lines if line.strip())
+
 
 class MplfinanceRenderTool(BaseRenderTool):
     """📈 Python mplfinance金融图表渲染工具"""
@@ -26,6 +333,7 @@ class MplfinanceRenderTool(BaseRenderTool):
             supported_formats=["png", "svg", "pdf"],
             default_format="png"
         )
+        self._workers = _WorkerProcessPool("mplfinance", _worker_init)
         self._check_dependencies()
     
     def _get_declaration(self) -> Optional[types.FunctionDeclaration]:
@@ -129,7 +437,8 @@ class MplfinanceRenderTool(BaseRenderTool):
             logger.info(self._get_installation_guide())
         else:
             logger.info("✅ mplfinance渲染工具依赖检查通过")
-            self._test_mplfinance_functionality()
+            if _SELFTEST:
+                self._test_mplfinance_functionality()
     
     def _get_installation_guide(self) -> str:
         """获取安装指南"""
@@ -209,14 +518,117 @@ class MplfinanceRenderTool(BaseRenderTool):
         """同步渲染mplfinance金融图表"""
         
         if not self._mplfinance_available:
-            missing_deps = ["mplfinance", "pandas", "matplotlib", "numpy"]
+            return self._unavailable_result()
+        
+        # 获取额外参数
+        dpi = kwargs.get('dpi', 150)
+        
+        logger.info(f"🚀 执行mplfinance金融图表渲染...")
+        
+        if _EXEC_MODE == "inprocess":
+            result = self._exec_user_code(code, output_format, width, height, dpi)
+        elif _EXEC_MODE == "worker":
+            result = self._exec_in_worker(code, output_format, width, height, dpi)
+        else:
+            result = self._exec_in_subprocess(code, output_format, width, height, dpi)
+        
+        if result["success"]:
+            logger.info(f"✅ mplfinance金融图表渲染成功，大小: {len(result['data'])} bytes")
+        return result
+    
+    def _unavailable_result(self) -> Dict[str, Any]:
+        """依赖不可用时的渲染结果"""
+        return {
+            "success": False,
+            "error": "mplfinance依赖不可用",
+            "installation_guide": self._get_installation_guide(),
+            "suggestion": "请先安装依赖: pip install mplfinance pandas matplotlib numpy"
+        }
+    
+    async def render_batch(self, specs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        批量渲染多张相互独立的金融图表
+        
+        整批只提交一次执行任务：工作进程模式下只有一次进程间往返，子进程模式下只启动一个解释器，
+        mplfinance/pandas只导入一次，各图表之间仍关闭图表并恢复rcParams
+        
+        Args:
+            specs: 渲染参数列表，每项包含 code，可选 output_format/width/height/dpi
+            
+        Returns:
+            与specs顺序一致的渲染结果列表
+        """
+        if not specs:
+            return []
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._render_batch_sync, specs)
+    
+    def _render_batch_sync(self, specs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """同步批量渲染，单张图表失败不影响其余图表"""
+        if not self._mplfinance_available:
+            return [self._unavailable_result() for _ in specs]
+        
+        formats = [spec.get("output_format", "png") for spec in specs]
+        scripts = [
+            self._preprocess_code(
+                spec["code"],
+                output_format,
+                spec.get("width", 1200),
+                spec.get("height", 800),
+                spec.get("dpi", 150)
+            )
+            for spec, output_format in zip(specs, formats)
+        ]
+        
+        logger.info(f"🚀 批量执行mplfinance金融图表渲染: {len(scripts)} 张")
+        
+        timeout = _EXEC_TIMEOUT * len(scripts)
+        timeout_error = f"金融图表批量渲染超时（{timeout}秒）"
+        if _EXEC_MODE == "inprocess":
+            result = _wait_result(_EXEC_POOL.submit(_exec_scripts, scripts), timeout, timeout_error)
+        elif _EXEC_MODE == "worker":
+            result = self._workers.run(_exec_scripts, scripts, timeout=timeout, timeout_error=timeout_error)
+        else:
+            return self._exec_batch_in_subprocess(scripts, formats)
+        
+        if not result["success"]:
+            # 整批失败时每张图表返回相同的错误
+            return [dict(result) for _ in scripts]
+        return [
+            self._bytes_result(payload) if ok else {"success": False, "error": payload}
+            for ok, payload in result["data"]
+        ]
+    
+    def _exec_user_code(self, code: str, output_format: str, width: int, height: int, dpi: int) -> Dict[str, Any]:
+        """在当前解释器中执行代码，省去启动Python进程、重复导入mplfinance/pandas和读写临时文件的开销"""
+        script = self._preprocess_code(code, output_format, width, height, dpi)
+        future = _EXEC_POOL.submit(_exec_script, script)
+        return _wait_result(future, _EXEC_TIMEOUT, _TIMEOUT_ERROR, empty_error="生成的图表文件为空")
+    
+    def _exec_in_worker(self, code: str, output_format: str, width: int, height: int, dpi: int) -> Dict[str, Any]:
+        """通过常驻工作进程池执行代码，图片字节随结果返回，不经过临时文件"""
+        script = self._preprocess_code(code, output_format, width, height, dpi)
+        return self._workers.run(
+            _exec_script, script,
+            timeout=_EXEC_TIMEOUT, timeout_error=_TIMEOUT_ERROR, empty_error="生成的图表文件为空"
+        )
+    
+    @staticmethod
+    def _bytes_result(chart_bytes: bytes) -> Dict[str, Any]:
+        """图片字节转换为渲染结果"""
+        if not chart_bytes:
             return {
                 "success": False,
-                "error": "mplfinance依赖不可用",
-                "installation_guide": self._get_installation_guide(),
-                "suggestion": "请先安装依赖: pip install mplfinance pandas matplotlib numpy"
+                "error": "生成的图表文件为空"
             }
-        
+        return {
+            "success": True,
+            "data": chart_bytes
+        }
+    
+    def _exec_in_subprocess(self, code: str, output_format: str, width: int, height: int, dpi: int) -> Dict[str, Any]:
+        """在新的Python进程中执行代码，图片写入临时目录后读回"""
         with tempfile.TemporaryDirectory() as temp_dir:
             temp_path = Path(temp_dir)
             
@@ -224,21 +636,16 @@ class MplfinanceRenderTool(BaseRenderTool):
                 code_file = temp_path / "finance_code.py"
                 output_file = temp_path / f"output.{output_format}"
                 
-                # 获取额外参数
-                dpi = kwargs.get('dpi', 150)
-                
-                # 预处理代码
-                processed_code = self._preprocess_code(code, output_file, output_format, width, height, dpi)
-                code_file.write_text(processed_code, encoding='utf-8')
-                
-                logger.info(f"🚀 执行mplfinance金融图表渲染...")
+                # 预处理代码，图片保存到 _image_out 指向的文件
+                processed_code = self._preprocess_code(code, output_format, width, height, dpi)
+                code_file.write_text(f"_image_out = r'{output_file}'\n" + processed_code, encoding='utf-8')
                 
                 # 执行Python代码
                 result = subprocess.run(
                     [sys.executable, str(code_file)],
                     capture_output=True,
                     text=True,
-                    timeout=90,
+                    timeout=_EXEC_TIMEOUT,
                     cwd=temp_dir,
                     encoding='utf-8',
                     errors='replace'
@@ -264,8 +671,6 @@ class MplfinanceRenderTool(BaseRenderTool):
                         "error": "生成的图表文件为空"
                     }
                 
-                logger.info(f"✅ mplfinance金融图表渲染成功，大小: {len(chart_bytes)} bytes")
-                
                 return {
                     "success": True,
                     "data": chart_bytes
@@ -274,7 +679,7 @@ class MplfinanceRenderTool(BaseRenderTool):
             except subprocess.TimeoutExpired:
                 return {
                     "success": False,
-                    "error": "金融图表渲染超时（90秒）"
+                    "error": _TIMEOUT_ERROR
                 }
             except Exception as e:
                 return {
@@ -282,196 +687,71 @@ class MplfinanceRenderTool(BaseRenderTool):
                     "error": f"渲染过程发生错误: {str(e)}"
                 }
     
-    def _preprocess_code(self, code: str, output_file: Path, output_format: str, width: int, height: int, dpi: int) -> str:
-        """预处理mplfinance代码，自动修正ax+title用法，添加完整的中文支持"""
-        # 移除代码块标记
-        code = code.strip()
-        if code.startswith("```python"):
-            code = code[9:]
-        elif code.startswith("```"):
-            code = code[3:]
-        if code.endswith("```"):
-            code = code[:-3]
-
-        # 自动修正mpf.plot(ax=..., title=...)用法，避免AttributeError
-        def fix_ax_title(code):
-            # 匹配mpf.plot( ... ax=..., title=... )
-            pattern = re.compile(r"mpf\.plot\(([^\)]*?)ax\s*=\s*([\w\d_]+)[^\)]*?title\s*=\s*['\"]([^'\"]+)['\"][^\)]*?\)")
-            def replacer(match):
-                args = match.group(1)
-                ax_var = match.group(2)
-                title = match.group(3)
-                # 移除title参数
-                args_no_title = re.sub(r",?\s*title\s*=\s*['\"][^'\"]+['\"]", "", args)
-                # 构造替换代码
-                return f"mpf.plot({args_no_title}ax={ax_var})\n{ax_var}.set_title('{title}')  # 自动修正: title参数已移至set_title"
-            return pattern.sub(replacer, code)
-        code = fix_ax_title(code)
-        
-        # 确保必要的导入
-        imports = [
-            "import matplotlib",
-            "matplotlib.use('Agg')  # 非交互式后端",
-            "import matplotlib.pyplot as plt",
-            "import mplfinance as mpf",
-            "import pandas as pd",
-            "import numpy as np",
-            "import warnings",
-            "warnings.filterwarnings('ignore')"
-        ]
-        
-        # 强化的中文字体配置（解决mplfinance字体问题）
-        font_config = [
-            "# 强化中文字体配置 - 专门针对mplfinance",
-            "import platform",
-            "import matplotlib.font_manager as fm",
-            "from matplotlib import rcParams",
-            "",
-            "# 根据操作系统选择最佳中文字体",
-            "def setup_chinese_fonts_for_mplfinance():",
-            "    import matplotlib.font_manager as fm  # 在函数内部重新导入",
-            "    system = platform.system()",
-            "    available_fonts = [f.name for f in fm.fontManager.ttflist]",
-            "    ",
-            "    # Windows系统字体优先级",
-            "    if system == 'Windows':",
-            "        font_priority = ['Microsoft YaHei', 'SimHei', 'SimSun', 'KaiTi']",
-            "    elif system == 'Darwin':  # macOS",
-            "        font_priority = ['Arial Unicode MS', 'Hiragino Sans GB', 'STHeiti', 'SimHei']",
-            "    else:  # Linux",
-            "        font_priority = ['WenQuanYi Micro Hei', 'DejaVu Sans', 'SimHei', 'Arial Unicode MS']",
-            "    ",
-            "    # 查找可用的中文字体",
-            "    chinese_font = None",
-            "    for font in font_priority:",
-            "        if font in available_fonts:",
-            "            chinese_font = font",
-            "            break",
-            "    ",
-            "    # 强制设置字体（多种方法确保生效）",
-            "    if chinese_font:",
-            "        # 方法1: 设置rcParams",
-            "        rcParams['font.sans-serif'] = [chinese_font, 'DejaVu Sans']",
-            "        rcParams['axes.unicode_minus'] = False",
-            "        rcParams['font.family'] = 'sans-serif'",
-            "        ",
-            "        # 方法2: 设置plt参数",
-            "        plt.rcParams['font.sans-serif'] = [chinese_font, 'DejaVu Sans']",
-            "        plt.rcParams['axes.unicode_minus'] = False",
-            "        plt.rcParams['font.family'] = 'sans-serif'",
-            "        ",
-            "        # 方法3: 创建字体属性对象",
-            "        global chinese_font_prop",
-            "        chinese_font_prop = fm.FontProperties(family=chinese_font)",
-            "        ",
-            "        print(f'✅ 强制设置中文字体: {chinese_font}')",
-            "        return chinese_font",
-            "    else:",
-            "        rcParams['font.sans-serif'] = ['DejaVu Sans', 'Arial', 'Liberation Sans']",
-            "        plt.rcParams['font.sans-serif'] = ['DejaVu Sans', 'Arial', 'Liberation Sans']",
-            "        chinese_font_prop = None",
-            "        print('⚠️ 未找到中文字体，使用默认字体')",
-            "        return None",
-            "",
-            "# 应用字体配置",
-            "selected_font = setup_chinese_fonts_for_mplfinance()",
-            ""
-        ]
-        
-        # 设置图片参数
-        setup_code = [
-            f"# 设置图片尺寸和DPI",
-            f"plt.rcParams['figure.figsize'] = [{width/100:.1f}, {height/100:.1f}]",
-            f"plt.rcParams['figure.dpi'] = {dpi}",
-            f"plt.rcParams['savefig.dpi'] = {dpi}",
-            f"",
-        ]
-        
-        # 在用户代码后添加增强的字体修复代码
-        font_fix_code = [
-            "",
-            "# 增强字体修复：全面修复图表中的中文字体显示",
-            "def fix_chinese_font_comprehensive():",
-            "    \"\"\"全面修复图表中的中文字体显示，包括所有文本元素\"\"\"",
-            "    current_fig = plt.gcf()",
-            "    if current_fig and selected_font:",
-            "        print(f'🔧 开始全面修复中文字体: {selected_font}')",
-            "        ",
-            "        # 1. 修复图形级别的suptitle（最重要！）",
-            "        if hasattr(current_fig, '_suptitle') and current_fig._suptitle:",
-            "            suptitle_text = current_fig._suptitle.get_text()",
-            "            if suptitle_text:",
-            "                current_fig.suptitle(suptitle_text, fontfamily=selected_font, ",
-            "                                   fontsize=current_fig._suptitle.get_fontsize())",
-            "                print(f'  ✅ 修复suptitle: {suptitle_text[:20]}...')",
-            "        ",
-            "        # 2. 修复所有子图的字体",
-            "        for i, ax in enumerate(current_fig.get_axes()):",
-            "            print(f'  🔧 修复子图 {i+1}')",
-            "            ",
-            "            # 修复子图标题",
-            "            if ax.get_title():",
-            "                title_text = ax.get_title()",
-            "                ax.set_title(title_text, fontfamily=selected_font, ",
-            "                           fontsize=ax.title.get_fontsize())",
-            "                print(f'    ✅ 修复title: {title_text[:20]}...')",
-            "            ",
-            "            # 修复x轴标签",
-            "            if ax.get_xlabel():",
-            "                xlabel_text = ax.get_xlabel()",
-            "                ax.set_xlabel(xlabel_text, fontfamily=selected_font, ",
-            "                            fontsize=ax.xaxis.label.get_fontsize())",
-            "                print(f'    ✅ 修复xlabel: {xlabel_text}')",
-            "            ",
-            "            # 修复y轴标签", 
-            "            if ax.get_ylabel():",
-            "                ylabel_text = ax.get_ylabel()",
-            "                ax.set_ylabel(ylabel_text, fontfamily=selected_font, ",
-            "                            fontsize=ax.yaxis.label.get_fontsize())",
-            "                print(f'    ✅ 修复ylabel: {ylabel_text}')",
-            "            ",
-            "            # 修复刻度标签",
-            "            for label in ax.get_xticklabels():",
-            "                if hasattr(label, 'set_fontfamily'):",
-            "                    label.set_fontfamily(selected_font)",
-            "            for label in ax.get_yticklabels():",
-            "                if hasattr(label, 'set_fontfamily'):",
-            "                    label.set_fontfamily(selected_font)",
-            "        ",
-            "        # 3. 查找和修复所有Text对象（兜底策略）",
-            "        for text_obj in current_fig.findobj(lambda obj: hasattr(obj, 'set_fontfamily')):",
-            "            try:",
-            "                text_obj.set_fontfamily(selected_font)",
-            "            except:",
-            "                pass  # 忽略无法设置的对象",
-            "        ",
-            "        print(f'✅ 中文字体修复完成: {selected_font}')",
-            "    else:",
-            "        print('⚠️ 无法修复字体：图表或字体不可用')",
-            "",
-            "# 应用增强的字体修复",
-            "fix_chinese_font_comprehensive()",
-            ""
-        ]
-        
-        # 构建完整代码
-        full_code_lines = (
-            imports + 
-            [""] + 
-            font_config +
-            setup_code +
-            ["# 用户代码开始"] + 
-            self._indent_code(code).split('\n') + 
-            font_fix_code +
-            ["# 保存图片"] +
-            [f"plt.tight_layout()"] +
-            [f"plt.savefig(r'{output_file}', format='{output_format}', dpi={dpi}, bbox_inches='tight')"] +
-            ["plt.close('all')"]
-        )
+    def _exec_batch_in_subprocess(self, scripts: List[str], formats: List[str]) -> List[Dict[str, Any]]:
+        """在同一个新的Python进程中依次执行一批脚本，超时前已完成的图表仍正常返回"""
+        timeout = _EXEC_TIMEOUT * len(scripts)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            driver_file = temp_path / "batch_driver.py"
+            driver_file.write_text(_BATCH_DRIVER_SRC, encoding='utf-8')
+            
+            files = []
+            for i, (script, output_format) in enumerate(zip(scripts, formats)):
+                code_file = temp_path / f"finance_code_{i}.py"
+                code_file.write_text(script, encoding='utf-8')
+                files.append((code_file, temp_path / f"output_{i}.{output_format}", temp_path / f"error_{i}.txt"))
+            
+            stderr = ""
+            timed_out = False
+            try:
+                result = subprocess.run(
+                    [sys.executable, str(driver_file)] + [str(f) for job_files in files for f in job_files],
+                    capture_output=True,
+                    text=True,
+                    timeout=timeout,
+                    cwd=temp_dir,
+                    encoding='utf-8',
+                    errors='replace'
+                )
+                if result.returncode != 0:
+                    stderr = result.stderr
+            except subprocess.TimeoutExpired:
+                timed_out = True
+            except Exception as e:
+                error = {"success": False, "error": f"渲染过程发生错误: {str(e)}"}
+                return [dict(error) for _ in scripts]
+            
+            results = []
+            for _, output_file, error_file in files:
+                if error_file.exists():
+                    results.append({
+                        "success": False,
+                        "error": f"Python代码执行失败:\n{error_file.read_text(encoding='utf-8', errors='replace')}"
+                    })
+                elif output_file.exists():
+                    results.append(self._bytes_result(output_file.read_bytes()))
+                elif timed_out:
+                    results.append({"success": False, "error": f"金融图表批量渲染超时（{timeout}秒）"})
+                elif stderr:
+                    results.append({"success": False, "error": f"Python代码执行失败:\n{stderr}"})
+                else:
+                    results.append({"success": False, "error": "代码执行完成但未生成图表文件"})
+            return results
+    
+    def _preprocess_code(self, code: str, output_format: str, width: int, height: int, dpi: int) -> str:
+        """
+        预处理mplfinance代码，自动修正ax+title用法，添加完整的中文支持
         
-        return '\n'.join(full_code_lines)
+        生成的脚本把图片保存到 _image_out（文件路径或内存缓冲区），由执行方在运行前提供
+        """
+        return _build_script(code, output_format, width, height, dpi, _select_chinese_font())
+    
+    def close(self):
+        """释放常驻工作进程池"""
+        if getattr(self, '_workers', None) is not None:
+            self._workers.stop()
     
-    def _indent_code(self, code: str) -> str:
-        """为用户代码添加适当的缩进"""
-        lines = code.split('\n')
-        return '\n'.join(line for line in lines if line.strip()) 
\ No newline at end of file
+    def __del__(self):
+        """析构函数，关闭常驻工作进程池和线程池"""
+        self.close()
+        super().__del__()
@@ -5,6 +5,7 @@ import logging
 import tempfile
 import subprocess
 import sys
+import textwrap
 from pathlib import Path
 from typing import Dict, Any, Optional
 
@@ -195,8 +196,8 @@ except Exception as e:
 """
         
         # 组合最终代码 - 修复缩进问题
-        indented_user_code = '\n'.join('    ' + line for line in user_code.split('\n'))
-        indented_save_code = '\n'.join('    ' + line for line in save_code.split('\n'))
+        indented_user_code = textwrap.indent(user_code, '    ')
+        indented_save_code = textwrap.indent(save_code, '    ')
         
         final_code = f"""{imports}
 try: